@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+# Kontrol hanesi doğrulanan GTIN uzunlukları: EAN-8, UPC-A, EAN-13, GTIN-14
+GTIN_UZUNLUKLARI = (8, 12, 13, 14)
+
+# Mağaza içi değişken ölçülü EAN-13 kodları (GS1 2x önekleri).
+# Yerleşim: 2 hane önek + 5 hane ürün kodu + 5 hane değer + kontrol hanesi.
+# Değer "agirlik" için gram, "fiyat" için kuruş cinsindendir. Tartının
+# etiket ayarına göre bu tablo değiştirilebilir.
+DEGISKEN_OLCULU = {
+    "24": "fiyat",
+    "25": "fiyat",
+    "26": "fiyat",
+    "27": "agirlik",
+    "28": "agirlik",
+    "29": "agirlik",
+}
+
+# barkod: katalogda aranacak kod, tur: standart/agirlik/fiyat,
+# deger: kg cinsinden ağırlık veya TL cinsinden fiyat (standart kodda None)
+OkunanBarkod = namedtuple("OkunanBarkod", ["barkod", "tur", "deger"])
+
+
+class GecersizBarkod(ValueError):
+    """Kontrol hanesi tutmayan (hatalı okunmuş) barkod"""
+
+
+def kontrol_hanesi(govde):
+    """GTIN gövdesinin (kontrol hanesi hariç) kontrol hanesini hesaplar"""
+    toplam = 0
+    # Sağdan başlayarak ağırlıklar 3, 1, 3, 1 ...
+    for i, rakam in enumerate(reversed(govde)):
+        toplam += int(rakam) * (3 if i % 2 == 0 else 1)
+    return str((10 - toplam % 10) % 10)
+
+
+def gecerli_mi(kod):
+    """Kod GTIN biçimindeyse kontrol hanesini doğrular; diğer kodlar için True döner"""
+    if not (kod.isdigit() and len(kod) in GTIN_UZUNLUKLARI):
+        return True
+    return kontrol_hanesi(kod[:-1]) == kod[-1]
+
+
+def ayristir(kod):
+    """Okunan kodu doğrular ve değişken ölçülü kodları çözer.
+
+    Kontrol hanesi tutmayan GTIN kodlarında GecersizBarkod yükseltir.
+    Ağırlık/fiyat gömülü EAN-13 kodları, değer alanı sıfırlanmış ürün
+    koduna (katalogdaki kayıt) ve ölçülen değere ayrılır. Sayısal olmayan
+    veya GTIN uzunluğunda olmayan iç kodlar olduğu gibi döner.
+    """
+    kod = kod.strip()
+    if not gecerli_mi(kod):
+        raise GecersizBarkod(f"Kontrol hanesi hatalı: {kod}")
+
+    tur = DEGISKEN_OLCULU.get(kod[:2]) if len(kod) == 13 and kod.isdigit() else None
+    if tur is None:
+        return OkunanBarkod(kod, "standart", None)
+
+    deger = int(kod[7:12])
+    govde = kod[:7] + "00000"
+    urun_kodu = govde + kontrol_hanesi(govde)
+    if tur == "agirlik":
+        return OkunanBarkod(urun_kodu, tur, deger / 1000)
+    return OkunanBarkod(urun_kodu, tur, deger / 100)
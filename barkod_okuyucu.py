@@ -0,0 +1,133 @@
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QEvent, QTimer, Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+# Okuyucular karakterleri birkaç ms arayla gönderir, insan yazarken aralık
+# genelde 50 ms'nin üzerindedir
+VARSAYILAN_ESIK_MS = 30
+# Bundan kısa hızlı girişler okutma sayılmaz (ör. tuşa yanlışlıkla iki kez basmak)
+VARSAYILAN_MIN_UZUNLUK = 4
+
+_BITIS_TUSLARI = (Qt.Key.Key_Return, Qt.Key.Key_Enter)
+
+
+class BarkodOkuyucu(QObject):
+    """Klavye gibi davranan barkod okuyucunun tuşlarını uygulama seviyesinde yakalar.
+
+    Pencere aktifken tuşlar tampona alınır. Tuşlar arası süre (olay zaman
+    damgasından) eşiğin altında kalıp Enter ile biten giriş bir okutma
+    sayılır ve tamamlanmış kod kuyruğa eklenir; kuyruk olay döngüsünde sırayla
+    `okundu` sinyaliyle boşaltılır. Hızlı olmayan giriş insan yazısıdır ve
+    hedef kutuya (`hedef`) aktarılır. GUI meşgulken biriken tuşlar da zaman
+    damgalarıyla ayrıldığından art arda okutmalar kaybolmaz ve birleşmez.
+    """
+
+    okundu = pyqtSignal(str)
+
+    def __init__(self, pencere, hedef, esik_ms=VARSAYILAN_ESIK_MS,
+                 min_uzunluk=VARSAYILAN_MIN_UZUNLUK):
+        super().__init__(pencere)
+        self.pencere = pencere
+        self.hedef = hedef
+        self.esik_ms = esik_ms
+        self.min_uzunluk = min_uzunluk
+        self._tampon = []
+        self._son_tus = None     # Son karakterin olay zaman damgası (ms)
+        self._aktarilan = ""     # Son aralıktan beri hedefe aktarılan metin
+        self._kuyruk = deque()
+        self._bosaltma_bekliyor = False
+        # Eşik dolunca tampondaki yavaş girişi hedefe aktar
+        self._aktar_timer = QTimer(self)
+        self._aktar_timer.setSingleShot(True)
+        self._aktar_timer.timeout.connect(self._aktar)
+
+    def start(self):
+        QApplication.instance().installEventFilter(self)
+
+    def stop(self):
+        QApplication.instance().removeEventFilter(self)
+        self._aktar_timer.stop()
+        self._aktar()
+        self._bosalt()
+
+    def pending(self):
+        """Henüz işlenmemiş tamamlanmış okutma sayısı"""
+        return len(self._kuyruk)
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Type.KeyPress or QApplication.activeWindow() is not self.pencere:
+            return False
+
+        metin = event.text()
+        # Zaman damgası vermeyen platformlarda (ve sentetik olaylarda) saate düş
+        ts = event.timestamp() or int(time.monotonic() * 1000)
+        hizli = self._son_tus is not None and ts - self._son_tus <= self.esik_ms
+
+        if event.key() in _BITIS_TUSLARI:
+            if self._tampon and hizli and len(self._tampon) >= self.min_uzunluk:
+                self._kuyruga_ekle("".join(self._tampon))
+                return True
+            # Elle yazılan kodun Enter'ı kutuya gitsin
+            self._aktar()
+            self._akisi_kes()
+            return False
+
+        duz_karakter = (len(metin) == 1 and metin.isprintable() and not event.modifiers()
+                        & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.AltModifier))
+        if not duz_karakter:
+            if metin:
+                # Backspace, Ctrl kısayolları vb. öncesinde bekleyen yazıyı yerine koy
+                self._aktar()
+                self._akisi_kes()
+            # Shift gibi metinsiz tuşlar okuyucunun büyük harf gönderimidir, akışı bozmaz
+            return False
+
+        if self._tampon and not hizli:
+            # Zamanlayıcı GUI meşgulken gecikti; önceki yavaş giriş insan yazısıdır
+            self._aktar()
+        elif not self._tampon and hizli and self._aktarilan:
+            # Okutmanın başı erken aktarılmış; kutudan geri alıp tampona döndür
+            self._geri_al()
+        if not hizli:
+            self._aktarilan = ""
+
+        self._tampon.append(metin)
+        self._son_tus = ts
+        self._aktar_timer.start(self.esik_ms + 20)
+        return True
+
+    def _akisi_kes(self):
+        self._son_tus = None
+        self._aktarilan = ""
+        self._aktar_timer.stop()
+
+    def _kuyruga_ekle(self, kod):
+        self._tampon.clear()
+        self._akisi_kes()
+        self._kuyruk.append(kod)
+        if not self._bosaltma_bekliyor:
+            self._bosaltma_bekliyor = True
+            QTimer.singleShot(0, self._bosalt)
+
+    def _bosalt(self):
+        self._bosaltma_bekliyor = False
+        while self._kuyruk:
+            self.okundu.emit(self._kuyruk.popleft())
+
+    def _aktar(self):
+        if not self._tampon:
+            return
+        metin = "".join(self._tampon)
+        self._tampon.clear()
+        self.hedef.insert(metin)
+        self.hedef.setFocus()
+        self._aktarilan += metin
+
+    def _geri_al(self):
+        mevcut = self.hedef.text()
+        if mevcut.endswith(self._aktarilan):
+            self.hedef.setText(mevcut[:-len(self._aktarilan)])
+            self._tampon.extend(self._aktarilan)
+        self._aktarilan = ""
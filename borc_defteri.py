@@ -8,6 +8,10 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
 
 from styles import Styles
+from sepet import adet_metni
+import veritabani
+import veresiye
+import degisiklik_yayini
 from market_ai import MarketAI
 
 class BorcDefteri(QMainWindow):
@@ -91,11 +95,16 @@ class BorcDefteri(QMainWindow):
         
         # Borç detay tablosu
         self.debt_table = QTableWidget()
-        self.debt_table.setColumnCount(5)
-        self.debt_table.setHorizontalHeaderLabels(["Tarih", "Ürün", "Alış Fiyatı", "Güncel Fiyat", "Durum"])
+        self.debt_table.setColumnCount(7)
+        self.debt_table.setHorizontalHeaderLabels(
+            ["Tarih", "Ürün", "Alış Fiyatı", "O Günkü Fiyat", "Güncel Fiyat", "Güncel Tutar", "Durum"])
         self.debt_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.debt_table.setFont(QFont("Arial", 12))
         
+        # Ödenmemiş borç ve bugünkü fiyatlarla yeniden fiyatlanmış hali
+        self.ozet_label = QLabel("")
+        self.ozet_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        
         # Ödeme butonu
         self.odeme_button = QPushButton("Seçili Borcu Öde")
         self.odeme_button.setObjectName("SuccessButton")
@@ -103,6 +112,7 @@ class BorcDefteri(QMainWindow):
         
         # Sağ layout'a ekle
         right_layout.addWidget(self.debt_table)
+        right_layout.addWidget(self.ozet_label)
         right_layout.addWidget(self.odeme_button)
         
         # İçerik layout'a ekle
@@ -113,42 +123,23 @@ class BorcDefteri(QMainWindow):
         pass
         
         # Müşterileri yükle
+        self.secili_musteri_id = None
         self.load_customers()
+        
+        # Kasadan gelen veresiye satışlar, ödemeler ve fiyat değişiklikleri
+        # sadece ilgili müşterinin satırını ve açık borç listesini günceller
+        self.yayin = degisiklik_yayini.yayin()
+        self.yayin.borc_degisti.connect(self.on_debts_changed)
+        self.yayin.musteri_eklendi.connect(self.on_customers_added)
+        self.yayin.fiyat_degisti.connect(self.on_prices_changed)
     
     def connect_db(self):
-        """Veritabanı bağlantısını oluşturur"""
-        self.db = sqlite3.connect('market_urunler.db')
+        """Ortak bağlantıyı alır; tablolar süreç başına bir kez oluşturulur"""
+        self.db = veritabani.baglanti()
         self.cursor = self.db.cursor()
-        
-        # Gerekli tabloları oluştur
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS musteriler (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                musteri_adi TEXT NOT NULL,
-                telefon TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS borclar (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                musteri_id INTEGER,
-                urun_id INTEGER,
-                alis_fiyati REAL NOT NULL,
-                odendi INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (musteri_id) REFERENCES musteriler (id),
-                FOREIGN KEY (urun_id) REFERENCES urunler (id)
-            )
-        """)
-        
-        self.db.commit()
+        veritabani.sema_hazirla(veresiye.ensure_schema)
     
     def add_customer(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         musteri_adi = self.musteri_input.text().strip()
         telefon = self.telefon_input.text().strip()
         
@@ -157,118 +148,150 @@ class BorcDefteri(QMainWindow):
             return
         
         try:
-            self.cursor.execute("""
-                INSERT INTO musteriler (musteri_adi, telefon)
-                VALUES (?, ?)
-            """, (musteri_adi, telefon))
-            
+            veresiye.musteri_ekle(self.cursor, musteri_adi, telefon)
             self.db.commit()
             QMessageBox.information(self, "Başarılı", "Müşteri başarıyla eklendi!")
             
-            # Formu temizle ve tabloyu güncelle
+            # Formu temizle; yeni satır değişiklik yayınıyla tabloya eklenir
             self.musteri_input.clear()
             self.telefon_input.clear()
-            self.load_customers()
+            self.yayin.kontrol_et()
             
         except sqlite3.Error as e:
+            # Ortak bağlantıda yarım işlem diğer pencerelere taşınmasın
+            self.db.rollback()
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
     
     def load_customers(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         try:
             # Müşterileri ve toplam borçlarını getir
-            self.cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.musteri_adi,
-                    m.telefon,
-                    COALESCE(SUM(CASE WHEN b.odendi = 0 THEN b.alis_fiyati ELSE 0 END), 0) as toplam_borc
-                FROM musteriler m
-                LEFT JOIN borclar b ON m.id = b.musteri_id
-                GROUP BY m.id
-                ORDER BY m.musteri_adi
-            """)
-            
-            customers = self.cursor.fetchall()
+            customers = veresiye.musteri_ozetleri(self.cursor)
             
             self.customer_table.setRowCount(len(customers))
             for row, customer in enumerate(customers):
-                customer_id = customer[0]
-                
-                # AI Analizi
-                ai_sozcuk, ai_renk = self.ai.analyze_customer_reliability(customer_id)
-                
-                for col, value in enumerate(customer):
-                    item = QTableWidgetItem(str(value))
-                    if col == 3:  # Toplam borç kolonuysa
-                        item = QTableWidgetItem(f"{float(value):.2f} TL")
-                    self.customer_table.setItem(row, col, item)
-                
-                # AI Analiz Kolonu (4. index)
-                ai_item = QTableWidgetItem(ai_sozcuk)
-                ai_item.setForeground(QColor(ai_renk))
-                ai_item.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                self.customer_table.setItem(row, 4, ai_item)
+                self.set_customer_row(row, customer)
                     
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
     
+    def set_customer_row(self, row, customer):
+        customer_id = customer[0]
+        
+        # AI Analizi
+        ai_sozcuk, ai_renk = self.ai.analyze_customer_reliability(customer_id)
+        
+        for col, value in enumerate(customer):
+            item = QTableWidgetItem(str(value))
+            if col == 3:  # Toplam borç kolonuysa
+                item = QTableWidgetItem(f"{float(value):.2f} TL")
+            self.customer_table.setItem(row, col, item)
+        
+        # AI Analiz Kolonu (4. index)
+        ai_item = QTableWidgetItem(ai_sozcuk)
+        ai_item.setForeground(QColor(ai_renk))
+        ai_item.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        self.customer_table.setItem(row, 4, ai_item)
+    
+    def customer_rows(self):
+        """Tablodaki müşteri id -> satır eşlemesi"""
+        return {
+            int(self.customer_table.item(row, 0).text()): row
+            for row in range(self.customer_table.rowCount())
+        }
+    
+    def on_debts_changed(self, borc_idler):
+        try:
+            musteri_idler = veresiye.borc_musterileri(self.cursor, borc_idler)
+            if not musteri_idler:
+                return
+            satirlar = self.customer_rows()
+            for customer in veresiye.musteri_ozetleri(self.cursor, musteri_idler):
+                if customer[0] in satirlar:
+                    self.set_customer_row(satirlar[customer[0]], customer)
+            if self.secili_musteri_id in musteri_idler:
+                self.show_customer_debts(self.secili_musteri_id)
+        except sqlite3.Error:
+            # Geçici hata: satırlar bir sonraki yüklemede düzelir
+            pass
+    
+    def on_customers_added(self, musteri_idler):
+        try:
+            yeni = veresiye.musteri_ozetleri(self.cursor, musteri_idler)
+        except sqlite3.Error:
+            return
+        satirlar = self.customer_rows()
+        for customer in yeni:
+            if customer[0] in satirlar:
+                continue
+            # Tablo ada göre sıralı; yeni müşteri yerine eklenir
+            row = 0
+            while row < self.customer_table.rowCount() and self.customer_table.item(row, 1).text() <= customer[1]:
+                row += 1
+            self.customer_table.insertRow(row)
+            self.set_customer_row(row, customer)
+    
+    def on_prices_changed(self, urun_idler):
+        # Açık borç listesindeki "Güncel Fiyat" kolonu
+        if self.secili_musteri_id is None:
+            return
+        try:
+            if veresiye.urunlerden_borcu_var_mi(self.cursor, self.secili_musteri_id, urun_idler):
+                self.show_customer_debts(self.secili_musteri_id)
+        except sqlite3.Error:
+            pass
+    
     def load_customer_debts(self, item):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         row = item.row()
-        musteri_id = int(self.customer_table.item(row, 0).text())
-        
+        self.show_customer_debts(int(self.customer_table.item(row, 0).text()))
+    
+    def show_customer_debts(self, musteri_id):
+        self.secili_musteri_id = musteri_id
         try:
             # Müşterinin borçlarını getir
-            self.cursor.execute("""
-                SELECT 
-                    b.created_at,
-                    u.urun_adi,
-                    b.alis_fiyati,
-                    u.fiyat,
-                    b.odendi,
-                    b.id
-                FROM borclar b
-                JOIN urunler u ON b.urun_id = u.id
-                WHERE b.musteri_id = ?
-                ORDER BY b.created_at DESC
-            """, (musteri_id,))
-            
-            debts = self.cursor.fetchall()
+            debts = veresiye.musteri_borclari(self.cursor, musteri_id)
             
             self.debt_table.setRowCount(len(debts))
+            odenmemis = 0
+            guncel_odenmemis = 0
             for row, debt in enumerate(debts):
                 # Tarih
                 tarih = datetime.strptime(debt[0], "%Y-%m-%d %H:%M:%S").strftime("%d.%m.%Y %H:%M")
                 self.debt_table.setItem(row, 0, QTableWidgetItem(tarih))
                 
-                # Ürün adı
-                self.debt_table.setItem(row, 1, QTableWidgetItem(debt[1]))
+                # Ürün adı (kasadan gelen satırlarda adet de yazılır)
+                urun = debt[1] if debt[6] == 1 else f"{debt[1]} x{adet_metni(debt[6])}"
+                self.debt_table.setItem(row, 1, QTableWidgetItem(urun))
                 
                 # Alış fiyatı
                 self.debt_table.setItem(row, 2, QTableWidgetItem(f"{float(debt[2]):.2f} TL"))
                 
+                # Borç günündeki liste fiyatı (fiyat geçmişinden)
+                o_gun = "-" if debt[7] is None else f"{float(debt[7]):.2f} TL"
+                self.debt_table.setItem(row, 3, QTableWidgetItem(o_gun))
+                
                 # Güncel fiyat
-                self.debt_table.setItem(row, 3, QTableWidgetItem(f"{float(debt[3]):.2f} TL"))
+                self.debt_table.setItem(row, 4, QTableWidgetItem(f"{float(debt[3]):.2f} TL"))
+                
+                # Borç satırının bugünkü fiyatlarla tutarı
+                self.debt_table.setItem(row, 5, QTableWidgetItem(f"{float(debt[8]):.2f} TL"))
                 
                 # Durum
                 durum = "Ödendi" if debt[4] else "Ödenmedi"
-                self.debt_table.setItem(row, 4, QTableWidgetItem(durum))
+                self.debt_table.setItem(row, 6, QTableWidgetItem(durum))
+                if not debt[4]:
+                    odenmemis += debt[2] * debt[6]
+                    guncel_odenmemis += debt[8]
                 
                 # Borç ID'sini gizli veri olarak sakla
                 self.debt_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, debt[5])
+            
+            self.ozet_label.setText(
+                f"Ödenmemiş: {odenmemis:.2f} TL  |  Bugünkü fiyatlarla: {guncel_odenmemis:.2f} TL")
                 
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
     
     def pay_debt(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         current_row = self.debt_table.currentRow()
         if current_row < 0:
             QMessageBox.warning(self, "Uyarı", "Lütfen ödenecek borcu seçin!")
@@ -278,30 +301,26 @@ class BorcDefteri(QMainWindow):
         borc_id = self.debt_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
         
         # Borç durumunu kontrol et
-        durum = self.debt_table.item(current_row, 4).text()
+        durum = self.debt_table.item(current_row, 6).text()
         if durum == "Ödendi":
             QMessageBox.warning(self, "Uyarı", "Bu borç zaten ödenmiş!")
             return
         
         try:
             # Borcu ödenmiş olarak işaretle
-            self.cursor.execute("""
-                UPDATE borclar
-                SET odendi = 1
-                WHERE id = ?
-            """, (borc_id,))
-            
+            veresiye.borc_ode(self.cursor, borc_id)
             self.db.commit()
             
-            # Tabloları güncelle
-            self.load_customers()
-            self.debt_table.item(current_row, 4).setText("Ödendi")
+            # Müşterinin toplamı ve borç listesi değişiklik yayınıyla güncellenir
+            self.debt_table.item(current_row, 6).setText("Ödendi")
+            self.yayin.kontrol_et()
             
             QMessageBox.information(self, "Başarılı", "Borç başarıyla ödendi!")
             
         except sqlite3.Error as e:
+            self.db.rollback()
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
     
     def closeEvent(self, event):
-        self.db.close()
+        # Ortak bağlantı diğer pencerelerle paylaşıldığı için kapatılmaz
         event.accept() 
\ No newline at end of file
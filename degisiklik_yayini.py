@@ -0,0 +1,181 @@
+import os
+import sqlite3
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+import urun_indeksi
+import veritabani
+
+# Açık pencerelerin değişiklik günlüğüne bakma aralığı (ms)
+YOKLAMA_ARALIGI = 500
+
+# Günlükte tutulacak gün sayısı ve eskilerin silinme aralığı (ms). Okuyucular
+# günlüğü yarım saniyede bir okuduğu için günler önceki satırı bekleyen olmaz.
+SAKLAMA_GUNU = 7
+BUDAMA_ARALIGI = 60 * 60 * 1000
+
+# degisiklikler tablosundaki bir satır
+Degisiklik = namedtuple("Degisiklik", ["id", "tablo", "kayit_id", "islem"])
+
+
+def ensure_schema(cursor):
+    """Ürün günlüğüne ek olarak fiş, borç ve müşteri olaylarını yazan tetikleyicileri oluşturur"""
+    urun_indeksi.ensure_schema(cursor)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS fisler_degisiklik_ekle
+        AFTER INSERT ON fisler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('fisler', new.id, 'INSERT');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS borclar_degisiklik_ekle
+        AFTER INSERT ON borclar
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('borclar', new.id, 'INSERT');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS borclar_degisiklik_odendi
+        AFTER UPDATE OF odendi ON borclar
+        WHEN new.odendi = 1 AND old.odendi IS NOT 1
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('borclar', new.id, 'ODENDI');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS musteriler_degisiklik_ekle
+        AFTER INSERT ON musteriler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('musteriler', new.id, 'INSERT');
+        END
+    """)
+
+
+def degisiklikler_sonra(cursor, son_id):
+    """`son_id`'den sonraki günlük satırlarını Degisiklik listesi olarak id sırasıyla döndürür"""
+    cursor.execute("""
+        SELECT id, tablo, kayit_id, islem FROM degisiklikler
+        WHERE id > ? ORDER BY id
+    """, (son_id,))
+    return [Degisiklik(*row) for row in cursor.fetchall()]
+
+
+def _tekil(idler):
+    # Aynı kayıt bir yoklamada birkaç kez değişmiş olabilir; sırayı koruyarak bir kez gönder
+    return list(dict.fromkeys(idler))
+
+
+def eski_degisiklikleri_sil(db, gun=SAKLAMA_GUNU, en_son_id=None):
+    """`gun` günden eski günlük satırlarını siler ve commit eder, silinen satır sayısını döndürür.
+
+    Id'ler zamanla arttığı için silinen kısım birincil anahtarın başından
+    bir aralıktır; AUTOINCREMENT silinen id'lerin yeniden verilmesini
+    önler. `en_son_id` verilirse okuyucunun henüz görmediği satırlar silinmez.
+    """
+    cursor = db.cursor()
+    cursor.execute("""
+        SELECT id FROM degisiklikler WHERE tarih >= datetime('now', ?) ORDER BY id LIMIT 1
+    """, (f"-{gun} days",))
+    sinir = cursor.fetchone()
+    kosullar, parametreler = [], []
+    if sinir is not None:
+        kosullar.append("id < ?")
+        parametreler.append(sinir[0])
+    if en_son_id is not None:
+        kosullar.append("id <= ?")
+        parametreler.append(en_son_id)
+    sorgu = "DELETE FROM degisiklikler"
+    if kosullar:
+        sorgu += " WHERE " + " AND ".join(kosullar)
+    cursor.execute(sorgu, parametreler)
+    db.commit()
+    return cursor.rowcount
+
+
+class DegisiklikYayini(QObject):
+    """Değişiklik günlüğünü yoklayıp açık pencerelere sadece değişen kayıtları bildirir.
+
+    Günlüğe tetikleyiciler yazdığı için hangi bağlantıdan ya da kasadan
+    gelirse gelsin her değişiklik görülür. Her yoklama, son görülen
+    id'den sonrasını okuyan tek bir birincil anahtar aralığıdır; sinyaller
+    olay türüne göre toplu id listeleri taşır.
+    """
+
+    urun_degisti = pyqtSignal(list)     # eklenen, güncellenen ya da silinen ürün id'leri
+    fiyat_degisti = pyqtSignal(list)    # fiyatı değişen ürün id'leri (urun_degisti'nin alt kümesi)
+    fis_eklendi = pyqtSignal(list)      # yeni fiş id'leri
+    borc_degisti = pyqtSignal(list)     # eklenen ya da ödenen borç satırı id'leri
+    musteri_eklendi = pyqtSignal(list)  # yeni müşteri id'leri
+
+    def __init__(self, db_path=veritabani.DB_PATH, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        cursor = veritabani.baglanti(db_path).cursor()
+        veritabani.sema_hazirla(ensure_schema, db_path)
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM degisiklikler")
+        # Açılıştan önceki değişiklikler pencerelerin ilk yüklemesinde zaten okunur
+        self.son_id = cursor.fetchone()[0]
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.kontrol_et)
+        self.timer.start(YOKLAMA_ARALIGI)
+        # Günlük sınırsız büyümesin; açılışta ve sonra saatte bir eskiler silinir
+        self.budama_timer = QTimer(self)
+        self.budama_timer.timeout.connect(self.buda)
+        self.budama_timer.start(BUDAMA_ARALIGI)
+        self.buda()
+
+    def buda(self):
+        """Eski günlük satırlarını siler; veritabanı meşgulse bir sonraki sefere bırakır"""
+        try:
+            return eski_degisiklikleri_sil(veritabani.baglanti(self.db_path), en_son_id=self.son_id)
+        except sqlite3.Error as e:
+            if not veritabani.kilit_hatasi_mi(e):
+                raise
+            veritabani.baglanti(self.db_path).rollback()
+            return 0
+
+    def kontrol_et(self):
+        """Yeni günlük satırlarını okuyup sinyalleri yayar, işlenen satır sayısını döndürür"""
+        cursor = veritabani.baglanti(self.db_path).cursor()
+        degisiklikler = degisiklikler_sonra(cursor, self.son_id)
+        if not degisiklikler:
+            return 0
+        self.son_id = degisiklikler[-1].id
+
+        urunler, fiyatlar, fisler, borclar, musteriler = [], [], [], [], []
+        for d in degisiklikler:
+            if d.tablo == "urunler":
+                urunler.append(d.kayit_id)
+                if d.islem == "FIYAT":
+                    fiyatlar.append(d.kayit_id)
+            elif d.tablo == "fisler":
+                fisler.append(d.kayit_id)
+            elif d.tablo == "borclar":
+                borclar.append(d.kayit_id)
+            elif d.tablo == "musteriler":
+                musteriler.append(d.kayit_id)
+
+        if urunler:
+            self.urun_degisti.emit(_tekil(urunler))
+        if fiyatlar:
+            self.fiyat_degisti.emit(_tekil(fiyatlar))
+        if fisler:
+            self.fis_eklendi.emit(_tekil(fisler))
+        if borclar:
+            self.borc_degisti.emit(_tekil(borclar))
+        if musteriler:
+            self.musteri_eklendi.emit(_tekil(musteriler))
+        return len(degisiklikler)
+
+
+_yayinlar = {}
+
+
+def yayin(db_path=veritabani.DB_PATH):
+    """Bu veritabanının süreçteki ortak yayınını döndürür, yoksa oluşturur (GUI iş parçacığından çağrılır)"""
+    anahtar = os.path.abspath(db_path)
+    if anahtar not in _yayinlar:
+        _yayinlar[anahtar] = DegisiklikYayini(db_path)
+    return _yayinlar[anahtar]
@@ -15,6 +15,8 @@ import os
 import tempfile
 
 from styles import Styles
+import veritabani
+import urunler
 
 class EtiketYazdir(QMainWindow):
     def __init__(self):
@@ -69,19 +71,14 @@ class EtiketYazdir(QMainWindow):
         pass
 
     def connect_db(self):
-        """Veritabanı bağlantısını oluşturur"""
-        self.db = sqlite3.connect('market_urunler.db')
+        """Ortak bağlantıyı alır"""
+        self.db = veritabani.baglanti()
         self.cursor = self.db.cursor()
 
     def get_product_info(self, barkod):
         """Barkoda göre ürün bilgilerini getirir"""
         try:
-            self.cursor.execute("""
-                SELECT urun_adi, fiyat
-                FROM urunler
-                WHERE barkod = ?
-            """, (barkod,))
-            return self.cursor.fetchone()
+            return urunler.etiket_bilgisi(self.cursor, barkod)
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
             return None
@@ -256,7 +253,7 @@ class EtiketYazdir(QMainWindow):
                 pass
 
     def closeEvent(self, event):
-        self.db.close()
+        # Ortak bağlantı diğer pencerelerle paylaşıldığı için kapatılmaz
         event.accept()
 
 if __name__ == "__main__":
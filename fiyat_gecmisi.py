@@ -0,0 +1,91 @@
+# Aralıklar, karşılaştırıldıkları borç ve satış tarihleriyle aynı (saniye)
+# çözünürlükte tutulur. Aynı saniyedeki değişikliklerden sonuncusu id
+# sırasıyla bulunur; o saniyedeki satış o son fiyatı görür.
+_SIMDI = "CURRENT_TIMESTAMP"
+
+
+def ensure_schema(cursor):
+    """Fiyat geçmişi tablosunu, as-of indeksini ve onu besleyen tetikleyicileri oluşturur.
+
+    Her satır bir fiyatın geçerli olduğu [baslangic, bitis) aralığıdır;
+    güncel fiyatın bitişi NULL'dır.
+    """
+    cursor.execute("""
+        SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'fiyat_gecmisi'
+    """)
+    yeni_tablo = cursor.fetchone()[0] == 0
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fiyat_gecmisi (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_id INTEGER NOT NULL REFERENCES urunler (id),
+            fiyat REAL NOT NULL,
+            baslangic TEXT NOT NULL,
+            bitis TEXT
+        )
+    """)
+    # "Ürün X, T anında kaça?" sorusu tek bir indeks aralığıdır
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fiyat_gecmisi_urun_baslangic
+        ON fiyat_gecmisi (urun_id, baslangic)
+    """)
+    if yeni_tablo:
+        # Geçmiş bilinmiyor; bugünkü fiyat ürünün eklendiği andan beri geçerli sayılır
+        cursor.execute("PRAGMA table_info(urunler)")
+        eklenme = "tarih" if "tarih" in [row[1] for row in cursor.fetchall()] else "NULL"
+        cursor.execute(f"""
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            SELECT id, fiyat, COALESCE({eklenme}, '0001-01-01 00:00:00') FROM urunler
+            WHERE fiyat IS NOT NULL
+        """)
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_ekle
+        AFTER INSERT ON urunler
+        WHEN new.fiyat IS NOT NULL
+        BEGIN
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic) VALUES (new.id, new.fiyat, {_SIMDI});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_degisti
+        AFTER UPDATE OF fiyat ON urunler
+        WHEN old.fiyat IS NOT new.fiyat
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = {_SIMDI}
+            WHERE urun_id = new.id AND bitis IS NULL;
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic) VALUES (new.id, new.fiyat, {_SIMDI});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = {_SIMDI}
+            WHERE urun_id = old.id AND bitis IS NULL;
+        END
+    """)
+
+
+def tarihteki_fiyat(urun_id, tarih):
+    """Ürünün `tarih` anındaki fiyatını veren SQL alt sorgusu (o an satışta değilse NULL).
+
+    `urun_id` ve `tarih` dış sorgunun kolonlarıdır; her satır için
+    idx_fiyat_gecmisi_urun_baslangic üzerinde tek bir aralık araması yapılır.
+    """
+    return f"""(
+        SELECT CASE WHEN g.bitis IS NULL OR g.bitis > {tarih} THEN g.fiyat END
+        FROM fiyat_gecmisi g
+        WHERE g.urun_id = {urun_id} AND g.baslangic <= {tarih}
+        ORDER BY g.baslangic DESC, g.id DESC
+        LIMIT 1
+    )"""
+
+
+def gecmis(cursor, urun_id):
+    """Ürünün fiyat aralıklarını (fiyat, başlangıç, bitiş) yeniden eskiye döndürür"""
+    cursor.execute("""
+        SELECT fiyat, baslangic, bitis FROM fiyat_gecmisi
+        WHERE urun_id = ?
+        ORDER BY baslangic DESC, id DESC
+    """, (urun_id,))
+    return cursor.fetchall()
@@ -0,0 +1,78 @@
+from PyQt6.QtCore import QEvent, QPropertyAnimation, Qt, pyqtProperty
+from PyQt6.QtGui import QColor, QPainter, QPen, QRegion
+from PyQt6.QtWidgets import QWidget
+
+
+class FlasCercevesi(QWidget):
+    """Ebeveyn widget'ın kenarlarında renkli çerçeve yakıp söndüren saydam katman.
+
+    Stil sayfası değiştirilmediği için alttaki widget'lar yeniden
+    cilalanmaz/yerleşmez; her karede sadece çerçeve şeridi boyanır.
+    """
+
+    KADEME = 3
+
+    def __init__(self, parent, kalinlik=5):
+        super().__init__(parent)
+        self.kalinlik = kalinlik
+        self._renk = QColor(0, 0, 0, 0)
+        self._opaklik = 0.0
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+        self._animasyon = QPropertyAnimation(self, b"opaklik", self)
+
+        # Ebeveyn boyutu değiştikçe onu tamamen kapla. Katman hep görünür
+        # kalır; gizleyip göstermek tüm pencerenin yeniden boyanması demektir.
+        parent.installEventFilter(self)
+        self.setGeometry(parent.rect())
+        self.raise_()
+
+    def get_opaklik(self):
+        return self._opaklik
+
+    def set_opaklik(self, deger):
+        # Sönme birkaç kademede yapılır; değişmeyen karede boyama yok
+        deger = round(deger * self.KADEME) / self.KADEME
+        if deger != self._opaklik:
+            self._opaklik = deger
+            self._seridi_boya()
+
+    opaklik = pyqtProperty(float, fget=get_opaklik, fset=set_opaklik)
+
+    def flash(self, renk, sure_ms):
+        """Çerçeveyi verilen renkte yakar; sürenin son kısmında söner"""
+        self._renk = QColor(renk)
+        self._animasyon.stop()
+        self._animasyon.setDuration(sure_ms)
+        self._animasyon.setKeyValueAt(0.0, 1.0)
+        self._animasyon.setKeyValueAt(0.7, 1.0)
+        self._animasyon.setKeyValueAt(1.0, 0.0)
+        self._animasyon.start()
+        # Renk değişip opaklık aynı kaldıysa da çerçeveyi yenile
+        self._seridi_boya()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QEvent.Type.Resize:
+            self.setGeometry(obj.rect())
+        return False
+
+    def _seridi_boya(self):
+        # Ortadaki alan saydam; yalnızca kenar şeridini geçersiz kıl
+        dis = self.rect()
+        k = self.kalinlik
+        self.update(QRegion(dis).subtracted(QRegion(dis.adjusted(k, k, -k, -k))))
+
+    def paintEvent(self, event):
+        if self._opaklik <= 0:
+            return
+        renk = QColor(self._renk)
+        renk.setAlphaF(self._opaklik)
+        painter = QPainter(self)
+        kalem = QPen(renk, self.kalinlik)
+        kalem.setJoinStyle(Qt.PenJoinStyle.MiterJoin)
+        painter.setPen(kalem)
+        yarim = self.kalinlik / 2
+        painter.drawRect(self.rect().toRectF().adjusted(yarim, yarim, -yarim, -yarim))
+        painter.end()
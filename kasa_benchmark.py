@@ -0,0 +1,144 @@
+"""Çoklu kasa yazma çekişmesi ölçümü.
+
+Aynı veritabanına N kasa sürecinden paralel olarak fiş yazar; toplam ve kasa
+başına sürdürülebilir satış/saniye ile yazma kilidi için beklenen süreyi
+raporlar. Kasalar uygulamadaki bağlantı ayarlarını (WAL, busy timeout) ve
+yeniden deneme politikasını aynen kullanır.
+
+Örnek:
+    python kasa_benchmark.py --kasa 4 --sure 20 --sepet 40 --cikti kasa.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+import satis_kayit
+import veritabani
+from pos_benchmark import katalog_olustur, yuzdelikler
+
+SatisSatiri = namedtuple("SatisSatiri", ["urun_id", "adet", "fiyat"])
+
+
+def kasa_sureci(db_path, kasa_no, sure, sepet_boyutu, baslat, sonuc_kuyrugu):
+    """Bir kasayı taklit eder: süre dolana kadar art arda fiş yazar"""
+    rng = random.Random(kasa_no)
+    db = veritabani.connect(db_path)
+    urunler = db.execute("SELECT id, fiyat FROM urunler").fetchall()
+    cursor = db.cursor()
+
+    bekleme_ns, fis_ns = [], []
+    yeniden_deneme = hata = 0
+
+    baslat.wait()
+    bitis = time.perf_counter() + sure
+    while time.perf_counter() < bitis:
+        satirlar = [SatisSatiri(urun_id, rng.randint(1, 3), fiyat)
+                    for urun_id, fiyat in rng.sample(urunler, sepet_boyutu)]
+        t0 = time.perf_counter_ns()
+        t_kilit = None
+        for deneme in range(1, veritabani.DENEME_SAYISI + 1):
+            try:
+                # Kilit bekleme süresi = BEGIN IMMEDIATE'in yazma kilidini alması
+                cursor.execute("BEGIN IMMEDIATE")
+                t_kilit = time.perf_counter_ns()
+                satis_kayit.fis_yaz(cursor, satirlar, "Nakit", kasa_no)
+                db.commit()
+                break
+            except sqlite3.Error as e:
+                if db.in_transaction:
+                    db.rollback()
+                if not veritabani.kilit_hatasi_mi(e) or deneme == veritabani.DENEME_SAYISI:
+                    hata += 1
+                    t_kilit = None
+                    break
+                yeniden_deneme += 1
+                time.sleep(veritabani.BEKLEME * (2 ** (deneme - 1)))
+        t1 = time.perf_counter_ns()
+        if t_kilit is not None:
+            bekleme_ns.append(t_kilit - t0)
+            fis_ns.append(t1 - t0)
+
+    db.close()
+    sonuc_kuyrugu.put({
+        "kasa_no": kasa_no,
+        "fis": len(fis_ns),
+        "satis_saniye": len(fis_ns) / sure,
+        "kilit_bekleme_toplam_s": sum(bekleme_ns) / 1e9,
+        "kilit_bekleme_ms": yuzdelikler(bekleme_ns, birim=1_000_000),
+        "fis_ms": yuzdelikler(fis_ns, birim=1_000_000),
+        "yeniden_deneme": yeniden_deneme,
+        "hata": hata,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çoklu kasa yazma çekişmesi ölçümü")
+    parser.add_argument("--kasa", type=int, default=4, help="Paralel kasa (süreç) sayısı")
+    parser.add_argument("--sure", type=float, default=10.0, help="Ölçüm süresi (saniye)")
+    parser.add_argument("--sepet", type=int, default=40, help="Fiş başına satır sayısı")
+    parser.add_argument("--katalog", type=int, default=6_000, help="Sentetik katalog büyüklüğü")
+    parser.add_argument("--db", help="Sentetik katalog yerine kullanılacak veritabanının kopyası")
+    parser.add_argument("--cikti", help="Sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="kasa_benchmark_") as gecici:
+        db_path = os.path.join(gecici, "market_urunler.db")
+        if args.db:
+            kaynak = sqlite3.connect(args.db)
+            hedef = sqlite3.connect(db_path)
+            kaynak.backup(hedef)
+            kaynak.close()
+            hedef.close()
+        else:
+            katalog_olustur(db_path, args.katalog)
+
+        db = veritabani.connect(db_path)
+        satis_kayit.ensure_schema(db.cursor())
+        db.commit()
+        db.close()
+
+        baslat = multiprocessing.Event()
+        sonuc_kuyrugu = multiprocessing.Queue()
+        surecler = [
+            multiprocessing.Process(target=kasa_sureci,
+                                    args=(db_path, kasa_no, args.sure, args.sepet, baslat, sonuc_kuyrugu))
+            for kasa_no in range(1, args.kasa + 1)
+        ]
+        for surec in surecler:
+            surec.start()
+        time.sleep(0.5)  # Süreçler bağlanıp ürünleri yüklesin
+        baslat.set()
+
+        kasalar = sorted((sonuc_kuyrugu.get() for _ in surecler), key=lambda k: k["kasa_no"])
+        for surec in surecler:
+            surec.join()
+
+    rapor = {
+        "kasa": args.kasa,
+        "sure_s": args.sure,
+        "sepet": args.sepet,
+        "toplam_satis_saniye": sum(k["satis_saniye"] for k in kasalar),
+        "kasalar": kasalar,
+    }
+    for k in kasalar:
+        print(f"Kasa {k['kasa_no']}: {k['satis_saniye']:.1f} fiş/sn, "
+              f"kilit bekleme p95/p99 {k['kilit_bekleme_ms']['p95']:.2f}/{k['kilit_bekleme_ms']['p99']:.2f} ms "
+              f"(toplam {k['kilit_bekleme_toplam_s']:.2f} s), "
+              f"yeniden deneme {k['yeniden_deneme']}, hata {k['hata']}")
+    print(f"Toplam: {rapor['toplam_satis_saniye']:.1f} fiş/sn")
+
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(rapor, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+import codecs
+import csv
+import io
+import os
+import threading
+import unicodedata
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import veritabani
+from barkod_ayristirici import gecerli_mi
+
+PARTI_BOYUTU = 5000
+
+# Sadece ilk hatalar saklanır; milyonluk hatalı dosyada bellek sabit kalsın
+EN_FAZLA_HATA = 100
+
+# Başlıktaki (katlanmış) ad -> alan
+KOLON_ADLARI = {
+    "barkod": "barkod",
+    "barcode": "barkod",
+    "ean": "barkod",
+    "urun adi": "urun_adi",
+    "urun_adi": "urun_adi",
+    "urun": "urun_adi",
+    "ad": "urun_adi",
+    "aciklama": "urun_adi",
+    "marka": "marka",
+    "fiyat": "fiyat",
+    "satis fiyati": "fiyat",
+    "stok": "stok",
+}
+
+ZORUNLU_ALANLAR = ("barkod", "urun_adi", "fiyat")
+
+# CSV için sırayla denenen kodlamalar; Türkçe Windows/Excel çıktıları cp1254'tür
+KODLAMALAR = ("utf-8-sig", "cp1254")
+
+# eklenen/guncellenen/degismeyen/reddedilen: satır sayıları,
+# hatalar: ilk EN_FAZLA_HATA adet (satır no, sebep), iptal: yarıda kesildi mi
+AktarimSonucu = namedtuple(
+    "AktarimSonucu",
+    ["eklenen", "guncellenen", "degismeyen", "reddedilen", "hatalar", "iptal"],
+)
+
+
+class AktarimHatasi(ValueError):
+    """Dosya okunamıyor veya zorunlu kolonlar yok"""
+
+
+def _katla(metin):
+    metin = str(metin).strip().lower().replace("ı", "i")
+    return "".join(c for c in unicodedata.normalize("NFKD", metin) if not unicodedata.combining(c))
+
+
+def _kolon_sirasi(baslik):
+    """Başlık satırından alan -> kolon numarası eşlemesi çıkarır"""
+    sira = {}
+    for i, ad in enumerate(baslik):
+        alan = KOLON_ADLARI.get(_katla(ad)) if ad is not None else None
+        if alan and alan not in sira:
+            sira[alan] = i
+    eksik = [alan for alan in ZORUNLU_ALANLAR if alan not in sira]
+    if eksik:
+        raise AktarimHatasi(f"Dosyada zorunlu kolon yok: {', '.join(eksik)}")
+    return sira
+
+
+def _kodlama(yol):
+    """Dosyanın baştan sona hatasız çözüldüğü ilk kodlamayı bulur.
+
+    Dosya, bir şey yazılmadan önce parça parça bir kez taranır; böylece
+    aktarım yarıda bir kodlama hatasıyla kesilip eksik kalmaz.
+    """
+    for kodlama in KODLAMALAR:
+        cozucu = codecs.getincrementaldecoder(kodlama)()
+        with open(yol, "rb") as ham:
+            try:
+                for parca in iter(lambda: ham.read(1024 * 1024), b""):
+                    cozucu.decode(parca)
+                cozucu.decode(b"", final=True)
+            except UnicodeDecodeError:
+                continue
+        return kodlama
+    raise AktarimHatasi(
+        "Dosyanın karakter kodlaması tanınmadı; UTF-8 ya da Windows-1254 (Türkçe) olarak kaydedin")
+
+
+def _csv_satirlari(yol):
+    """(satır no, değerler, okunan oran) üretir; dosya parça parça okunur"""
+    kodlama = _kodlama(yol)
+    boyut = os.path.getsize(yol) or 1
+    with open(yol, "rb") as ham:
+        metin = io.TextIOWrapper(ham, encoding=kodlama, newline="")
+        ornek = metin.read(4096)
+        metin.seek(0)
+        try:
+            # Türkçe Excel ayırıcı olarak ; kullanır
+            lehce = csv.Sniffer().sniff(ornek, delimiters=";,\t")
+        except csv.Error:
+            lehce = csv.excel
+        for satir_no, degerler in enumerate(csv.reader(metin, lehce), 1):
+            yield satir_no, degerler, ham.tell() / boyut
+
+
+def _xlsx_satirlari(yol):
+    try:
+        import openpyxl
+    except ImportError:
+        raise AktarimHatasi("Excel dosyaları için openpyxl kurulu olmalı (pip install openpyxl)")
+    kitap = openpyxl.load_workbook(yol, read_only=True, data_only=True)
+    try:
+        sayfa = kitap.active
+        toplam = sayfa.max_row or 0
+        for satir_no, degerler in enumerate(sayfa.iter_rows(values_only=True), 1):
+            yield satir_no, degerler, satir_no / toplam if toplam else 0.0
+    finally:
+        kitap.close()
+
+
+def satirlari_oku(yol):
+    """Dosya türüne göre satır üreteci döndürür"""
+    if yol.lower().endswith((".xlsx", ".xlsm")):
+        return _xlsx_satirlari(yol)
+    return _csv_satirlari(yol)
+
+
+def _metin(deger):
+    if deger is None:
+        return ""
+    if isinstance(deger, float) and deger.is_integer():
+        # Excel sayı olarak sakladığı barkodları 8.69e+12 biçiminde verir
+        deger = int(deger)
+    return str(deger).strip()
+
+
+def _sayi(deger):
+    if isinstance(deger, (int, float)):
+        return float(deger)
+    return float(_metin(deger).replace(" ", "").replace(",", "."))
+
+
+def dogrula(degerler, sira):
+    """Satırı (barkod, ad, marka, fiyat, stok) demetine çevirir, geçersizse ValueError yükseltir"""
+    def al(alan):
+        i = sira.get(alan)
+        return degerler[i] if i is not None and i < len(degerler) else None
+
+    barkod = _metin(al("barkod"))
+    if not barkod:
+        raise ValueError("Barkod boş")
+    if not gecerli_mi(barkod):
+        raise ValueError(f"Kontrol hanesi hatalı: {barkod}")
+    urun_adi = _metin(al("urun_adi"))
+    if not urun_adi:
+        raise ValueError("Ürün adı boş")
+    try:
+        fiyat = _sayi(al("fiyat"))
+    except ValueError:
+        raise ValueError(f"Geçersiz fiyat: {_metin(al('fiyat'))}")
+    if fiyat < 0:
+        raise ValueError(f"Negatif fiyat: {fiyat}")
+    marka = _metin(al("marka")) or None
+    stok_miktari = None
+    if "stok" in sira and _metin(al("stok")):
+        try:
+            stok_miktari = _sayi(al("stok"))
+        except ValueError:
+            raise ValueError(f"Geçersiz stok: {_metin(al('stok'))}")
+    return barkod, urun_adi, marka, round(fiyat, 2), stok_miktari
+
+
+def _hazirla(cursor):
+    # Her parti önce bu geçici tabloya yazılır, urunler'e iki küme işlemiyle geçer.
+    # Aynı barkod dosyada birden fazla geçerse son satır geçerlidir.
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS katalog_aktarim (
+            barkod TEXT PRIMARY KEY,
+            urun_adi TEXT NOT NULL,
+            marka TEXT,
+            fiyat REAL NOT NULL,
+            stok REAL
+        ) WITHOUT ROWID
+    """)
+
+
+def _parti_yaz(db, parti):
+    """Partiyi tek işlemde urunler'e işler, (eklenen, güncellenen, değişmeyen) döndürür"""
+    cursor = db.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("DELETE FROM katalog_aktarim")
+        cursor.executemany("""
+            INSERT OR REPLACE INTO katalog_aktarim (barkod, urun_adi, marka, fiyat, stok)
+            VALUES (?, ?, ?, ?, ?)
+        """, parti)
+        cursor.execute("SELECT COUNT(*) FROM katalog_aktarim")
+        farkli = cursor.fetchone()[0]
+
+        # Sadece gerçekten değişen satırlar yazılır; aynı listeyi tekrar
+        # yüklemek arama indeksini ve fiyat geçmişini gereksiz yere oynatmaz
+        cursor.execute("""
+            UPDATE urunler
+            SET urun_adi = a.urun_adi,
+                marka = COALESCE(a.marka, urunler.marka),
+                fiyat = a.fiyat,
+                stok = COALESCE(a.stok, urunler.stok)
+            FROM katalog_aktarim a
+            WHERE urunler.barkod = a.barkod
+              -- IN, planı urunler'i taramak yerine parti üzerinden barkod indeksine yöneltir
+              AND urunler.barkod IN (SELECT barkod FROM katalog_aktarim)
+              AND (urunler.urun_adi IS NOT a.urun_adi
+                   OR urunler.fiyat IS NOT a.fiyat
+                   OR (a.marka IS NOT NULL AND urunler.marka IS NOT a.marka)
+                   OR (a.stok IS NOT NULL AND urunler.stok IS NOT a.stok))
+        """)
+        guncellenen = cursor.rowcount
+        cursor.execute("""
+            INSERT INTO urunler (barkod, urun_adi, marka, fiyat, stok, kritik_stok)
+            SELECT barkod, urun_adi, COALESCE(marka, 'Belirtilmemiş'), fiyat, COALESCE(stok, 0), 0
+            FROM katalog_aktarim a
+            WHERE NOT EXISTS (SELECT 1 FROM urunler u WHERE u.barkod = a.barkod)
+        """)
+        eklenen = cursor.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return eklenen, guncellenen, farkli - eklenen - guncellenen
+
+
+def aktar(db, yol, parti_boyutu=PARTI_BOYUTU, ilerleme=None, iptal=None):
+    """CSV/XLSX fiyat listesini barkoda göre urunler'e ekler veya günceller.
+
+    Dosya satır satır okunur ve `parti_boyutu` satırlık işlemlerle yazılır;
+    bellek kullanımı dosya boyutundan bağımsızdır. `ilerleme(oran)` her
+    partiden sonra çağrılır, `iptal()` True dönerse sıradaki partiye
+    geçilmez (yazılmış partiler kalır). AktarimSonucu döndürür.
+    """
+    _hazirla(db.cursor())
+    eklenen = guncellenen = degismeyen = reddedilen = 0
+    hatalar = []
+    sira = None
+    parti = []
+    oran = 0.0
+
+    def yaz():
+        nonlocal eklenen, guncellenen, degismeyen
+        e, g, d = _parti_yaz(db, parti)
+        eklenen += e
+        guncellenen += g
+        degismeyen += d
+        parti.clear()
+        if ilerleme is not None:
+            ilerleme(oran)
+
+    for satir_no, degerler, oran in satirlari_oku(yol):
+        if sira is None:
+            sira = _kolon_sirasi(degerler)
+            continue
+        if not any(_metin(d) for d in degerler):
+            continue
+        try:
+            parti.append(dogrula(degerler, sira))
+        except ValueError as e:
+            reddedilen += 1
+            if len(hatalar) < EN_FAZLA_HATA:
+                hatalar.append((satir_no, str(e)))
+            continue
+        if len(parti) >= parti_boyutu:
+            yaz()
+            if iptal is not None and iptal():
+                return AktarimSonucu(eklenen, guncellenen, degismeyen, reddedilen, hatalar, True)
+
+    if sira is None:
+        raise AktarimHatasi("Dosya boş")
+    if parti:
+        yaz()
+    return AktarimSonucu(eklenen, guncellenen, degismeyen, reddedilen, hatalar, False)
+
+
+class KatalogAktarici(QObject):
+    """Fiyat listesini arka planda, kendi bağlantısıyla içe aktarır.
+
+    GUI iş parçacığı sadece sinyalleri alır; ilerleme yüzde olarak,
+    sonuç AktarimSonucu olarak kuyruklu bağlantıyla gelir.
+    """
+
+    ilerledi = pyqtSignal(int)       # yüzde
+    bitti = pyqtSignal(object)       # AktarimSonucu
+    basarisiz = pyqtSignal(str)      # hata
+
+    def __init__(self, yol, db_path=veritabani.DB_PATH, parti_boyutu=PARTI_BOYUTU, parent=None):
+        super().__init__(parent)
+        self.yol = yol
+        self.db_path = db_path
+        self.parti_boyutu = parti_boyutu
+        self._iptal = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="KatalogAktarici", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Yazılmakta olan parti bitince durur"""
+        self._iptal.set()
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        db = veritabani.connect(self.db_path)
+        try:
+            sonuc = aktar(
+                db, self.yol, self.parti_boyutu,
+                ilerleme=lambda oran: self.ilerledi.emit(int(oran * 100)),
+                iptal=self._iptal.is_set,
+            )
+        except Exception as e:
+            self.basarisiz.emit(str(e))
+        else:
+            self.bitti.emit(sonuc)
+        finally:
+            db.close()
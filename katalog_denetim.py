@@ -0,0 +1,200 @@
+import argparse
+from collections import Counter, namedtuple
+
+import fiyat_gecmisi
+import veritabani
+from barkod_ayristirici import gecerli_mi
+
+# Veri girişinde "yok" yerine yazılmış değerler (küçük harfle karşılaştırılır)
+YER_TUTUCULAR = ("bilinmiyor", "yok", "-", "0", "")
+
+# Uygulamanın markasız ürün için kullandığı değer
+MARKASIZ = "Belirtilmemiş"
+
+SORUNLAR = {
+    "yinelenen_barkod": "Aynı barkod birden fazla üründe",
+    "yer_tutucu_barkod": "Barkod yerine yer tutucu",
+    "kontrol_hanesi": "Kontrol hanesi hatalı barkod",
+    "yer_tutucu_marka": "Marka yerine yer tutucu",
+    "gecersiz_fiyat": "Sıfır, negatif ya da boş fiyat",
+}
+
+# sorunlar: satırdaki SORUNLAR anahtarları
+DenetimSatiri = namedtuple("DenetimSatiri", ["urun_id", "barkod", "urun_adi", "marka", "fiyat", "sorunlar"])
+
+
+def _yer_tutucu(kolon):
+    liste = ", ".join(f"'{deger}'" for deger in YER_TUTUCULAR)
+    return f"LOWER(TRIM({kolon})) IN ({liste})"
+
+
+def _fonksiyonlari_kaydet(db):
+    # Kontrol hanesi SQL'in içinden hesaplanır; satırlar Python'a tek tek taşınmaz
+    db.create_function(
+        "gtin_gecerli", 1,
+        lambda kod: 1 if kod is None or gecerli_mi(kod.strip()) else 0,
+        deterministic=True,
+    )
+
+
+def denetle(db):
+    """Kataloğu tek bir taramada denetler, sorunlu ürünlerin DenetimSatiri listesini döndürür.
+
+    Yinelenen barkodlar pencere fonksiyonuyla, diğer sorunlar aynı
+    satırdaki ifadelerle bulunur.
+    """
+    _fonksiyonlari_kaydet(db)
+    cursor = db.execute(f"""
+        SELECT * FROM (
+            SELECT
+                id, barkod, urun_adi, marka, fiyat,
+                barkod IS NOT NULL AND NOT {_yer_tutucu('barkod')}
+                    AND COUNT(*) OVER (PARTITION BY barkod) > 1 AS yinelenen_barkod,
+                COALESCE({_yer_tutucu('barkod')}, 0) AS yer_tutucu_barkod,
+                barkod IS NOT NULL AND NOT gtin_gecerli(barkod) AS kontrol_hanesi,
+                COALESCE({_yer_tutucu('marka')}, 0) AS yer_tutucu_marka,
+                fiyat IS NULL OR fiyat <= 0 AS gecersiz_fiyat
+            FROM urunler
+        )
+        WHERE yinelenen_barkod OR yer_tutucu_barkod OR kontrol_hanesi
+           OR yer_tutucu_marka OR gecersiz_fiyat
+        ORDER BY id
+    """)
+    sonuc = []
+    for urun_id, barkod, urun_adi, marka, fiyat, *bayraklar in cursor:
+        sorunlar = tuple(kod for kod, var in zip(SORUNLAR, bayraklar) if var)
+        sonuc.append(DenetimSatiri(urun_id, barkod, urun_adi, marka, fiyat, sorunlar))
+    return sonuc
+
+
+def ozet(satirlar):
+    """Sorun türü başına ürün sayısı"""
+    sayac = Counter(kod for satir in satirlar for kod in satir.sorunlar)
+    return {kod: sayac.get(kod, 0) for kod in SORUNLAR}
+
+
+def ensure_schema(cursor):
+    """Onarımların eski değerlerini saklayan günlük tablosunu oluşturur"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS katalog_onarimlari (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_id INTEGER NOT NULL,
+            onarim TEXT NOT NULL,
+            eski_barkod TEXT,
+            eski_marka TEXT,
+            eski_fiyat REAL,
+            urun_adi TEXT,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+# Onarım: (kod, açıklama, etkilenen ürünleri seçen WHERE, uygulanan SQL).
+# Sıra önemlidir: barkod temizliği silme adımından önce çalışır.
+_BOS_BARKOD = f"(barkod IS NULL OR {_yer_tutucu('barkod')})"
+ONARIMLAR = [
+    ("yer_tutucu_barkod", "Yer tutucu barkodları boşalt",
+     _yer_tutucu("barkod"),
+     "UPDATE urunler SET barkod = NULL WHERE {kosul}"),
+    ("yinelenen_barkod", "Yinelenen barkodu en yeni üründe bırak, diğerlerinden kaldır",
+     """barkod IS NOT NULL AND id NOT IN (
+            SELECT MAX(id) FROM urunler WHERE barkod IS NOT NULL GROUP BY barkod
+        )""",
+     "UPDATE urunler SET barkod = NULL WHERE {kosul}"),
+    ("kontrol_hanesi", "Kontrol hanesi hatalı barkodları boşalt",
+     "barkod IS NOT NULL AND NOT gtin_gecerli(barkod)",
+     "UPDATE urunler SET barkod = NULL WHERE {kosul}"),
+    ("yer_tutucu_marka", f"Yer tutucu markaları '{MARKASIZ}' yap",
+     _yer_tutucu("marka"),
+     f"UPDATE urunler SET marka = '{MARKASIZ}' WHERE {{kosul}}"),
+    ("gecmis_fiyat", "Sıfır/negatif fiyatlara fiyat geçmişindeki son geçerli fiyatı geri yükle",
+     """(fiyat IS NULL OR fiyat <= 0) AND EXISTS (
+            SELECT 1 FROM fiyat_gecmisi g WHERE g.urun_id = urunler.id AND g.fiyat > 0
+        )""",
+     """UPDATE urunler SET fiyat = (
+            SELECT g.fiyat FROM fiyat_gecmisi g
+            WHERE g.urun_id = urunler.id AND g.fiyat > 0
+            ORDER BY g.baslangic DESC, g.id DESC LIMIT 1
+        ) WHERE {kosul}"""),
+    ("bos_kayitlari_sil", "Barkodu da fiyatı da olmayan, hiç satılmamış ürünleri sil",
+     f"""{_BOS_BARKOD} AND (fiyat IS NULL OR fiyat <= 0)
+        AND NOT EXISTS (SELECT 1 FROM satislar s WHERE s.urun_id = urunler.id)
+        AND NOT EXISTS (SELECT 1 FROM borclar b WHERE b.urun_id = urunler.id)""",
+     "DELETE FROM urunler WHERE {kosul}"),
+]
+
+ONARIM_ACIKLAMALARI = {kod: aciklama for kod, aciklama, _, _ in ONARIMLAR}
+
+
+def onarim_sayilari(db):
+    """Her onarımın şu an kaç ürünü etkileyeceğini döndürür (onarımlar tek tek uygulanırsa)"""
+    _fonksiyonlari_kaydet(db)
+    return {
+        kod: db.execute(f"SELECT COUNT(*) FROM urunler WHERE {kosul}").fetchone()[0]
+        for kod, _, kosul, _ in ONARIMLAR
+    }
+
+
+def onar(db, secilenler):
+    """Seçilen onarımları sırayla, tek bir işlemde uygular; onarım başına etkilenen ürün sayısını döndürür.
+
+    Her onarımdan önce etkilenen ürünlerin eski barkod/marka/fiyatı
+    katalog_onarimlari tablosuna yazılır. Herhangi bir adım hata verirse
+    hiçbiri uygulanmaz.
+    """
+    _fonksiyonlari_kaydet(db)
+    sonuc = {}
+    cursor = db.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        for kod, _, kosul, islem in ONARIMLAR:
+            if kod not in secilenler:
+                continue
+            cursor.execute(f"""
+                INSERT INTO katalog_onarimlari (urun_id, onarim, eski_barkod, eski_marka, eski_fiyat, urun_adi)
+                SELECT id, ?, barkod, marka, fiyat, urun_adi FROM urunler WHERE {kosul}
+            """, (kod,))
+            cursor.execute(islem.format(kosul=kosul))
+            sonuc[kod] = cursor.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return sonuc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ürün kataloğunu denetler ve toplu onarım uygular")
+    parser.add_argument("--db", default=veritabani.DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument("--onar", nargs="+", choices=list(ONARIM_ACIKLAMALARI), metavar="ONARIM",
+                        help="Uygulanacak onarımlar: " + ", ".join(ONARIM_ACIKLAMALARI))
+    parser.add_argument("--hepsi", action="store_true", help="Tüm onarımları uygula")
+    parser.add_argument("--ornek", type=int, default=10, help="Sorun türü başına gösterilecek örnek ürün")
+    args = parser.parse_args()
+
+    db = veritabani.baglanti(args.db)
+    veritabani.sema_hazirla(ensure_schema, args.db)
+    veritabani.sema_hazirla(fiyat_gecmisi.ensure_schema, args.db)
+
+    satirlar = denetle(db)
+    print(f"{len(satirlar)} üründe sorun var")
+    for kod, sayi in ozet(satirlar).items():
+        print(f"  {SORUNLAR[kod]}: {sayi}")
+        ornekler = [s for s in satirlar if kod in s.sorunlar][:args.ornek if sayi else 0]
+        for s in ornekler:
+            print(f"      #{s.urun_id} {s.barkod!s:<16} {s.fiyat!s:>8}  {s.urun_adi}")
+
+    secilenler = list(ONARIM_ACIKLAMALARI) if args.hepsi else (args.onar or [])
+    if not secilenler:
+        print("\nOlası onarımlar (--onar ile seçin):")
+        for kod, sayi in onarim_sayilari(db).items():
+            print(f"  {kod:<20} {sayi:>6} ürün  {ONARIM_ACIKLAMALARI[kod]}")
+        return
+
+    for kod, sayi in onar(db, secilenler).items():
+        print(f"{ONARIM_ACIKLAMALARI[kod]}: {sayi} ürün")
+    print(f"Onarım sonrası sorunlu ürün: {len(denetle(db))}")
+
+
+if __name__ == "__main__":
+    main()
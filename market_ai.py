@@ -1,32 +1,27 @@
 
-import sqlite3
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
 from datetime import datetime, timedelta
 
+import veritabani
+import veresiye
+import satis_kayit
+import satis_ozetleri
+import urunler
+
 class MarketAI:
-    def __init__(self, db_path='market_urunler.db'):
+    def __init__(self, db_path=veritabani.DB_PATH):
         self.db_path = db_path
         self.model = None
         self.poly = PolynomialFeatures(degree=2) # 2. derece polinom daha iyi trend yakalar
 
     def get_sales_data(self):
-        """Veritabanından satış verilerini çeker ve günlük olarak gruplar."""
+        """Günlük ciroyu satış özet tablosundan çeker (ham satışlar taranmaz)."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            # Tarih formatı timestamp olduğu için (YYYY-MM-DD HH:MM:SS), gün bazında grupluyoruz
-            query = """
-                SELECT 
-                    date(tarih) as gun, 
-                    SUM(toplam_fiyat) as ciro 
-                FROM satislar 
-                GROUP BY gun 
-                ORDER BY gun ASC
-            """
-            df = pd.read_sql_query(query, conn)
-            conn.close()
+            cursor = veritabani.baglanti(self.db_path).cursor()
+            df = pd.DataFrame(satis_ozetleri.gunluk_ciro(cursor), columns=['gun', 'ciro'])
             
             if df.empty:
                 return pd.DataFrame()
@@ -116,26 +111,24 @@ class MarketAI:
 
     def generate_dummy_data_if_empty(self):
         """Demo amaçlı sahte veri oluşturur (Eğer hiç veri yoksa)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = veritabani.baglanti(self.db_path)
         cursor = conn.cursor()
         
-        # Kontrol et
-        cursor.execute("SELECT count(*) FROM satislar")
-        count = cursor.fetchone()[0]
+        # Kontrol et (satır sayısı özetten okunur, satislar taranmaz)
+        count = satis_ozetleri.satir_sayisi(cursor)
         
         if count < 10:
             print("AI: Yetersiz veri tespit edildi, demo verileri oluşturuluyor...")
             import random
             
             # Rastgele ürün ID'leri bul
-            cursor.execute("SELECT id, fiyat FROM urunler")
-            products = cursor.fetchall()
+            products = urunler.fiyat_listesi(cursor)
             if not products:
                 # Ürün bile yoksa yapacak bir şey yok
-                conn.close()
                 return
             
             # Son 30 gün için veri üret
+            satirlar = []
             for i in range(30):
                 date = datetime.now() - timedelta(days=30-i)
                 date_str = date.strftime("%Y-%m-%d %H:%M:%S")
@@ -150,33 +143,17 @@ class MarketAI:
                     adet = random.randint(1, 5)
                     total = p_price * adet
                     
-                    cursor.execute("""
-                        INSERT INTO satislar (urun_id, adet, fiyat, toplam_fiyat, odeme_turu, tarih)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (p_id, adet, p_price, total, "Nakit", date_str))
+                    satirlar.append((p_id, adet, p_price, total, "Nakit", date_str))
             
+            satis_kayit.fissiz_satislar_yaz(cursor, satirlar)
             conn.commit()
             print("AI: Demo verileri eklendi.")
-            
-        conn.close()
 
     def analyze_customer_reliability(self, customer_id):
         """Müşterinin borç ödeme alışkanlığına göre güvenilirlik analizi yapar."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Toplam borç ve ödenen miktar
-            cursor.execute("""
-                SELECT 
-                    SUM(alis_fiyati) as toplam_borc,
-                    SUM(CASE WHEN odendi = 1 THEN alis_fiyati ELSE 0 END) as odenen
-                FROM borclar 
-                WHERE musteri_id = ?
-            """, (customer_id,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            result = veresiye.odeme_ozeti(veritabani.baglanti(self.db_path).cursor(), customer_id)
             
             if not result or result[0] is None:
                 return "Veri Yok", "#95a5a6" # Gri
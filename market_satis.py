@@ -1,28 +1,54 @@
+import os
 import sys
-import sqlite3
+import queue
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QMessageBox,
-                            QInputDialog, QFrame, QGridLayout, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, QSizeF
+                            QTableView, QHeaderView, QDialog, QMessageBox,
+                            QInputDialog, QFrame, QGridLayout, QSizePolicy,
+                            QListWidget, QListWidgetItem)
+from PyQt6.QtCore import Qt, QTimer, QSizeF, QEvent
 from PyQt6.QtGui import QFont, QColor, QDoubleValidator, QPainter, QPageSize
 from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 
 from styles import Styles
+import veritabani
+from urun_indeksi import BarkodIndeksi
+import degisiklik_yayini
+from sepet import SepetModeli, adet_metni
+import urunler
+import satis_kayit
+import veresiye
+from satis_yazici import SatisYazici
+import barkod_ayristirici
+from barkod_okuyucu import BarkodOkuyucu
+from flas_cercevesi import FlasCercevesi
 
 class MarketSatis(QMainWindow):
-    def __init__(self):
+    def __init__(self, kasa_no=None):
         super().__init__()
-        self.setWindowTitle("Market Satış Sistemi (POS)")
+        # Aynı veritabanını paylaşan her kasanın kendi numarası olur
+        self.kasa_no = kasa_no or int(os.environ.get("MARKET_KASA_NO", "1"))
+        self.setWindowTitle(f"Market Satış Sistemi (POS) - Kasa {self.kasa_no}")
         self.setGeometry(0, 0, 1400, 900)
         
         # Veritabanı bağlantısı
         self.connect_db()
         
-        # Ürün listesi
-        self.urunler = self.get_sorted_products()
-        self.urun_adetleri = {}
-        self.toplam_tutar = 0.0
+        # Barkod indeksi (katalog bir kez yüklenir, okutmalar SQL çalıştırmaz).
+        # Yayın yüklemeden önce alınır ki arada değişen ürün kaçmasın
+        self.yayin = degisiklik_yayini.yayin()
+        self.indeks = BarkodIndeksi(self.db)
+        self.indeks.load()
+        
+        # Sepet
+        self.sepet = SepetModeli(self)
+        
+        # Satışlar arka planda yazılır, kasa yazmayı beklemez
+        self.satis_yazici = SatisYazici(kasa_no=self.kasa_no, parent=self)
+        self.satis_yazici.kaydedildi.connect(self.on_sale_saved)
+        self.satis_yazici.yeniden_deneniyor.connect(self.on_sale_retry)
+        self.satis_yazici.kaydedilemedi.connect(self.on_sale_failed)
+        self.satis_yazici.start()
         
         # Ana widget ve layout
         main_widget = QWidget()
@@ -43,9 +69,8 @@ class MarketSatis(QMainWindow):
         left_panel.addWidget(info_label)
         
         # Ürün tablosu
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["ÜRÜN ADI", "BİRİM", "ADET", "TOPLAM"])
+        self.table = QTableView()
+        self.table.setModel(self.sepet)
         
         # Tablo ayarları
         header = self.table.horizontalHeader()
@@ -56,7 +81,7 @@ class MarketSatis(QMainWindow):
         
         self.table.verticalHeader().setVisible(False) # Satır numaralarını gizle
         self.table.setFocusPolicy(Qt.FocusPolicy.NoFocus) # Tabloya fokuslanmasın (Barkod okuyucu için)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
         left_panel.addWidget(self.table)
         
@@ -146,17 +171,20 @@ class MarketSatis(QMainWindow):
         main_layout.addLayout(left_panel, 65) # %65 Genişlik
         main_layout.addWidget(right_panel_widget)
         
-        # Değişkenler
-        self.toplam_tutar = 0.0
-        self.urun_adetleri = {}
+        # Okutma geri bildirimi için kenar çerçevesi (stil sayfasına dokunmaz)
+        self.flas = FlasCercevesi(main_widget)
         
         # Fokuslama
         self.barkod_input.setFocus()
         
-        # Timer
-        self.focus_timer = QTimer()
-        self.focus_timer.timeout.connect(lambda: self.barkod_input.setFocus() if not self.barkod_input.hasFocus() else None)
-        self.focus_timer.start(1000)
+        # Okuyucu tuşları hangi widget odaktaysa oradan yakalanır, odağı
+        # sürekli barkod kutusuna çekmeye gerek kalmaz
+        self.okuyucu = BarkodOkuyucu(self, self.barkod_input)
+        self.okuyucu.okundu.connect(self.process_scan)
+        self.okuyucu.start()
+        
+        # Diğer pencerelerde ve kasalarda değişen ürünleri indekse tek tek yansıt
+        self.yayin.urun_degisti.connect(self.on_products_changed)
 
     def append_numpad(self, key):
         self.barkod_input.setText(self.barkod_input.text() + key)
@@ -164,7 +192,7 @@ class MarketSatis(QMainWindow):
 
     def process_payment_dialog(self):
         """Merkezi ödeme diyaloğu"""
-        if not self.urun_adetleri:
+        if not self.sepet.rowCount():
              self.visual_error("Sepet Boş!")
              return
 
@@ -175,7 +203,7 @@ class MarketSatis(QMainWindow):
         
         d_layout = QVBoxLayout(dialog)
         
-        lbl_info = QLabel(f"TOPLAM: {self.toplam_tutar:.2f} TL")
+        lbl_info = QLabel(f"TOPLAM: {self.sepet.toplam:.2f} TL")
         lbl_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
         lbl_info.setFont(QFont("Roboto Mono", 32, QFont.Weight.Bold))
         lbl_info.setStyleSheet(f"color: {Styles.COLOR_SUCCESS};")
@@ -202,158 +230,109 @@ class MarketSatis(QMainWindow):
         dialog.exec()
 
     def connect_db(self):
-        self.db = sqlite3.connect('market_urunler.db')
+        self.db = veritabani.baglanti()
         self.cursor = self.db.cursor()
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS urunler (id INTEGER PRIMARY KEY AUTOINCREMENT, urun_adi TEXT NOT NULL, fiyat REAL NOT NULL, marka TEXT, barkod TEXT UNIQUE)")
-        self.db.commit()
+        veritabani.sema_hazirla(urunler.ensure_schema)
+        veritabani.sema_hazirla(satis_kayit.ensure_schema)
 
-    def get_sorted_products(self):
-        self.connect_db()
-        self.cursor.execute("SELECT barkod, urun_adi, fiyat FROM urunler ORDER BY barkod")
-        return self.cursor.fetchall()
+    def on_products_changed(self, urun_idler):
+        self.indeks.apply_changes(urun_idler)
 
-    def binary_search(self, barkod):
-        self.urunler = self.get_sorted_products()
-        left = 0
-        right = len(self.urunler) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            current_barkod = self.urunler[mid][0]
-            if current_barkod == barkod:
-                return self.urunler[mid]
-            elif current_barkod < barkod:
-                left = mid + 1
-            else:
-                right = mid - 1
-        return None
+    def find_product(self, barkod):
+        urun = self.indeks.lookup(barkod)
+        if urun is None and self.yayin.kontrol_et():
+            # Ürün az önce eklenmiş olabilir, günlükte yeni kayıt varsa indeks
+            # sinyalle güncellendi; bir kez daha bak
+            urun = self.indeks.lookup(barkod)
+        return urun
 
     def visual_feedback(self):
         """Başarılı işlemde ekran kenarları mavi yanıp söner"""
-        original_style = self.centralWidget().styleSheet()
-        self.centralWidget().setStyleSheet(f"border: 5px solid {Styles.COLOR_PRIMARY};")
-        QTimer.singleShot(200, lambda: self.centralWidget().setStyleSheet(original_style))
+        self.flas.flash(Styles.COLOR_PRIMARY, 200)
 
     def visual_error(self, message=None):
         """Hata durumunda ekran kenarları kırmızı yanıp söner"""
-        original_style = self.centralWidget().styleSheet()
-        self.centralWidget().setStyleSheet(f"border: 5px solid {Styles.COLOR_ERROR};")
-        QTimer.singleShot(300, lambda: self.centralWidget().setStyleSheet(original_style))
+        self.flas.flash(Styles.COLOR_ERROR, 300)
         if message:
             # Hata mesajını barkod kutusunda gösterip silebiliriz veya status bar kullanabiliriz
             # Şimdilik barkod kutusunu kullanalım
             self.barkod_input.setPlaceholderText(message)
             QTimer.singleShot(2000, lambda: self.barkod_input.setPlaceholderText("Okutun veya Yazın..."))
 
+    def resolve_scan(self, barkod):
+        """Okunan kodu (ürün, adet) çiftine çevirir, ürün bulunamazsa (None, 0) döner.
+
+        Kontrol hanesi tutmayan kodlarda GecersizBarkod yükseltir; tartılı
+        ürün etiketlerinde adet, etikete gömülü ağırlık ya da fiyattan gelir.
+        """
+        # Katalogda bu haliyle kayıtlı kod her zaman önceliklidir
+        urun = self.indeks.lookup(barkod)
+        if urun:
+            return urun, 1
+        
+        okunan = barkod_ayristirici.ayristir(barkod)
+        urun = self.find_product(okunan.barkod)
+        if urun is None and len(okunan.barkod) == 12:
+            # UPC-A kodu katalogda başına 0 eklenmiş EAN-13 olarak kayıtlı olabilir
+            urun = self.find_product("0" + okunan.barkod)
+        if urun is None:
+            return None, 0
+        
+        if okunan.tur == "agirlik":
+            adet = okunan.deger
+        elif okunan.tur == "fiyat":
+            # Etiketteki tutar satır toplamıdır; miktar yuvarlanmaz ki adet x fiyat
+            # kuruşu kuruşuna etiketi tutsun (ekranda adet_metni 3 ondalık gösterir).
+            # Birim (kg) fiyatı tanımsız ürünün miktarı hesaplanamaz
+            adet = okunan.deger / urun.fiyat if urun.fiyat > 0 else 0
+        else:
+            adet = 1
+        return (urun, adet) if adet > 0 else (None, 0)
+
     def process_barcode(self):
+        """Barkod kutusuna elle yazılıp Enter'a basılan kodu işler"""
         barkod = self.barkod_input.text().strip()
+        self.barkod_input.clear()
+        if barkod:
+            self.process_scan(barkod)
+
+    def process_scan(self, barkod):
+        """Okuyucudan gelen (veya elle girilen) tek bir kodu sepete işler"""
+        barkod = barkod.strip()
         if not barkod:
             return
         
-        urun = self.binary_search(barkod)
-        if urun:
-            self.add_product_to_table(urun)
-            self.visual_feedback() # Görsel geri bildirim
+        try:
+            urun, adet = self.resolve_scan(barkod)
+        except barkod_ayristirici.GecersizBarkod:
+            # Hatalı okuma: veritabanına hiç gitmeden reddet
+            self.visual_error("HATALI OKUMA! TEKRAR OKUTUN")
+            print('\a')
         else:
-            self.visual_error("ÜRÜN BULUNAMADI!")
-            # Sesli uyarı eklenebilir (print('\a'))
-            print('\a') 
-        
-        self.barkod_input.clear()
+            if urun:
+                self.add_product_to_table(urun, adet)
+                self.visual_feedback() # Görsel geri bildirim
+            else:
+                self.visual_error("ÜRÜN BULUNAMADI!")
+                # Sesli uyarı eklenebilir (print('\a'))
+                print('\a') 
 
-    def add_product_to_table(self, urun):
-        barkod, urun_adi, fiyat = urun
-        
-        if barkod in self.urun_adetleri:
-            row = self.urun_adetleri[barkod]["row"]
-            adet = self.urun_adetleri[barkod]["adet"] + 1
-            toplam = adet * fiyat
-            
-            self.table.item(row, 2).setText(str(adet))
-            self.table.item(row, 3).setText(f"{toplam:.2f}")
-            self.urun_adetleri[barkod]["adet"] = adet
-            
-            # Güncellenen satırı seç
-            self.table.selectRow(row)
-        else:
-            # En tepeye ekle (Listenin 0. indisine insert)
-            # Ancak QTableWidget insertRow(0) ile üste eklersek indeksler kayar.
-            # Basit olması için alta ekleyip scrollToBottom yapabiliriz VEYA
-            # İstenen özellik: "Okunan son ürün listenin en tepesinde"
-            
-            # Mevcut mantığı koruyarak sona ekleyelim ama "vurgu" yapalım.
-            # İsteğe tam uymak için insertRow(0) kullanmak lazım ama dictionary row indexlerini güncellemek gerek.
-            # Performans için sona ekleyip scroll etmek daha güvenli olabilir.
-            # Kullanıcı "Tepede olsun" dedi. O zaman insertRow(0) yapalım ve tüm row indexleri shift edelim.
-            
-            # Row indexleri güncelleme maliyetli olabilir. Şimdilik sona ekleyip en son satırı seçili hale getirelim.
-            # "Okunan son ürün... diğerlerinden daha büyük fontla... vurgulanmalı."
-            
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            item_ad = QTableWidgetItem(urun_adi)
-            item_fiyat = QTableWidgetItem(f"{fiyat:.2f}")
-            item_adet = QTableWidgetItem("1")
-            item_toplam = QTableWidgetItem(f"{fiyat:.2f}")
-            
-            # Sayıları sağa yasla
-            item_fiyat.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            item_adet.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item_toplam.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            
-            self.table.setItem(row, 0, item_ad)
-            self.table.setItem(row, 1, item_fiyat)
-            self.table.setItem(row, 2, item_adet)
-            self.table.setItem(row, 3, item_toplam)
-            
-            self.urun_adetleri[barkod] = {
-                "row": row,
-                "adet": 1,
-                "fiyat": fiyat
-            }
-            
-            # Otomatik scrol
-            self.table.scrollToBottom()
-            self.table.selectRow(row)
+    def add_product_to_table(self, urun, adet=1):
+        row = self.sepet.add_product(urun, adet)
         
-        self.toplam_tutar += fiyat
-        self.toplam_display.setText(f"{self.toplam_tutar:.2f} TL")
+        # Okunan son ürünü seç ve görünür yap
+        self.table.selectRow(row)
+        self.table.scrollTo(self.sepet.index(row, 0))
+        self.toplam_display.setText(f"{self.sepet.toplam:.2f} TL")
 
     def remove_selected_item(self):
-        current_rows = self.table.selectedItems()
-        if current_rows:
-            current_row = self.table.currentRow()
-            # Barkodu bul (Tersine arama biraz zor, bu yüzden row bilgisini dict'ten bulmak daha iyi)
-            # Ama basitçe tablodan alamıyoruz çünkü barkod kolonu yok (Görsel gürültü olmasın diye kaldırdık mı? Hayır kaldırmadık ama tablo yapısını değiştirdik)
-            # Tablo: Ad, Birim, Adet, Toplam. Barkod nerede? Görünür değil.
-            # O zaman barkodu UserRole ile saklayalım veya dictionary'i row'a göre loop edelim.
-            # En temizi barkodu UserRole data olarak saklamaktı.
-            
-            # Hızlı çözüm: Dictionary'i tara
-            target_barkod = None
-            for barkod, data in self.urun_adetleri.items():
-                if data["row"] == current_row:
-                    target_barkod = barkod
-                    break
-            
-            if target_barkod:
-                fiyat = self.urun_adetleri[target_barkod]["fiyat"]
-                adet = self.urun_adetleri[target_barkod]["adet"]
-                self.toplam_tutar -= (fiyat * adet)
-                self.toplam_display.setText(f"{self.toplam_tutar:.2f} TL")
-                
-                del self.urun_adetleri[target_barkod]
-                self.table.removeRow(current_row)
-                
-                # Silinen satırdan sonraki satırların row indekslerini güncelle
-                for b, data in self.urun_adetleri.items():
-                    if data["row"] > current_row:
-                        data["row"] -= 1
+        selected = self.table.selectionModel().selectedRows()
+        if selected:
+            self.sepet.remove_row(selected[0].row())
+            self.toplam_display.setText(f"{self.sepet.toplam:.2f} TL")
 
     def clear_sale(self):
-        self.table.setRowCount(0)
-        self.urun_adetleri.clear()
-        self.toplam_tutar = 0.0
+        self.sepet.clear()
         self.toplam_display.setText("0.00 TL")
 
     def complete_sale(self):
@@ -369,63 +348,156 @@ class MarketSatis(QMainWindow):
             y = 50
             painter.drawText(0, y, printer.width(), 50, Qt.AlignmentFlag.AlignHCenter, isletme_adi or "MARKET")
             y += 50
-            for barkod, bilgi in self.urun_adetleri.items():
-                # Ürün adını bulmak lazım yine dict'ten row'a gidip tablodan alabiliriz
-                row = bilgi["row"]
-                urun_adi = self.table.item(row, 0).text()
-                adet = bilgi["adet"]
-                toplam = self.table.item(row, 3).text()
-                painter.drawText(20, y, f"{urun_adi}")
+            for satir in self.sepet.lines():
+                painter.drawText(20, y, f"{satir.urun_adi}")
                 y += 20
-                painter.drawText(20, y, f"{adet} x {bilgi['fiyat']:.2f} = {toplam}")
+                painter.drawText(20, y, f"{adet_metni(satir.adet)} x {satir.fiyat:.2f} = {satir.toplam:.2f}")
                 y += 40
             
-            painter.drawText(20, y + 20, f"TOPLAM: {self.toplam_tutar:.2f} TL")
+            painter.drawText(20, y + 20, f"TOPLAM: {self.sepet.toplam:.2f} TL")
             painter.end()
             self.clear_sale()
 
     def process_cash_payment(self):
-        # Sadece basit bir onay mekanizması, detaylı para üstü diyaloğu yerine hızlıca bitirelim veya
-        # Eski karmaşık diyaloğu temizleyip kullanalım. Şimdilik hızlıca kaydedelim.
-        # DB kayıt işlemleri...
-        try:
-            self.save_sale_to_db("Nakit")
-            QMessageBox.information(self, "Bilgi", "Nakit Satış Tamamlandı")
-            self.clear_sale()
-        except Exception as e:
-            self.visual_error()
-            QMessageBox.critical(self, "Hata", str(e))
+        self.submit_sale("Nakit", "Nakit Satış Tamamlandı")
 
     def process_credit_payment(self):
+        self.submit_sale("Kredi Kartı", "Kartlı Satış Tamamlandı")
+
+    def submit_sale(self, odeme_turu, mesaj, musteri_id=None):
+        """Sepeti yazma kuyruğuna bırakır ve kasayı hemen yeni müşteriye hazırlar"""
         try:
-            self.save_sale_to_db("Kredi Kartı")
-            QMessageBox.information(self, "Bilgi", "Kartlı Satış Tamamlandı")
-            self.clear_sale()
-        except Exception as e:
+            self.satis_yazici.submit(self.sepet.lines(), odeme_turu, musteri_id)
+        except queue.Full:
+            # Sepet silinmez, kasiyer biraz sonra tekrar deneyebilir
             self.visual_error()
-            QMessageBox.critical(self, "Hata", str(e))
+            QMessageBox.critical(self, "Hata", "Kayıt kuyruğu dolu, veritabanı yanıt vermiyor. Lütfen tekrar deneyin.")
+            return
+        self.statusBar().showMessage(mesaj, 3000)
+        self.clear_sale()
+        self.barkod_input.setFocus()
+
+    def on_sale_saved(self, satis_no, fis_id):
+        self.statusBar().showMessage(f"Fiş #{fis_id} kaydedildi", 3000)
+
+    def on_sale_retry(self, satis_no, deneme, hata):
+        self.statusBar().showMessage(
+            f"Satış kaydı tekrar deneniyor ({deneme}/{self.satis_yazici.deneme_sayisi}): {hata}", 3000)
+
+    def on_sale_failed(self, satis_no, hata):
+        if satis_no not in self.satis_yazici.failed_sales():
+            return  # Bu arada (örn. pencere kapatılırken) yeniden denenip yazıldı
+        self.visual_error("SATIŞ KAYDEDİLEMEDİ!")
+        reply = QMessageBox.question(
+            self,
+            "Kayıt Hatası",
+            f"Satış veritabanına yazılamadı:\n{hata}\n\nTekrar denensin mi?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.satis_yazici.retry_failed()
 
     def process_debt_payment(self):
-        # Borç için müşteri seçimi gerekiyor, eski koddaki gibi bir dialog açılabilir
-        # Şimdilik basitçe uyarı verelim, tam entegrasyon için eski kodu kopyalamak lazım
-        QMessageBox.information(self, "Bilgi", "Veresiye modülü bu ekranda henüz aktif değil.")
+        musteri = self.select_customer()
+        if musteri is None:
+            return
+        musteri_id, musteri_adi = musteri
+        # Satış ve borç satırları yazıcıda tek işlemde kaydedilir
+        self.submit_sale("Borç", f"Veresiye: {musteri_adi} hesabına yazıldı", musteri_id)
+
+    def select_customer(self):
+        """Ad veya telefonla müşteri seçtirir, (id, ad) ya da iptalde None döndürür"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("VERESİYE - MÜŞTERİ SEÇİN")
+        dialog.resize(600, 500)
+        
+        d_layout = QVBoxLayout(dialog)
+        
+        lbl_info = QLabel(f"TOPLAM: {self.sepet.toplam:.2f} TL")
+        lbl_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        lbl_info.setFont(QFont("Roboto Mono", 24, QFont.Weight.Bold))
+        lbl_info.setStyleSheet(f"color: {Styles.COLOR_WARNING};")
+        d_layout.addWidget(lbl_info)
+        
+        arama_input = QLineEdit()
+        arama_input.setPlaceholderText("Müşteri adı veya telefon...")
+        arama_input.setMinimumHeight(50)
+        d_layout.addWidget(arama_input)
+        
+        liste = QListWidget()
+        liste.setFont(QFont("Arial", 14))
+        d_layout.addWidget(liste)
+        
+        btn_sec = QPushButton("BORCA YAZ")
+        btn_sec.setObjectName("DeleteButton")
+        btn_sec.setMinimumHeight(60)
+        d_layout.addWidget(btn_sec)
+        
+        def listele(metin):
+            liste.clear()
+            for musteri_id, musteri_adi, telefon in veresiye.musteri_ara(self.cursor, metin):
+                item = QListWidgetItem(f"{musteri_adi}  {telefon or ''}".rstrip())
+                item.setData(Qt.ItemDataRole.UserRole, (musteri_id, musteri_adi))
+                liste.addItem(item)
+            if liste.count():
+                liste.setCurrentRow(0)
+        
+        def sec():
+            if liste.currentItem() is not None:
+                dialog.accept()
+        
+        arama_input.textChanged.connect(listele)
+        arama_input.returnPressed.connect(sec)
+        liste.itemActivated.connect(sec)
+        btn_sec.clicked.connect(sec)
+        
+        listele("")
+        arama_input.setFocus()
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return None
+        return liste.currentItem().data(Qt.ItemDataRole.UserRole)
 
     def save_sale_to_db(self, odeme_turu):
-         for barkod, detay in self.urun_adetleri.items():
-            self.cursor.execute("SELECT id FROM urunler WHERE barkod = ?", (barkod,))
-            res = self.cursor.fetchone()
-            if res:
-                urun_id = res[0]
-                self.cursor.execute("""
-                    INSERT INTO satislar (urun_id, adet, fiyat, toplam_fiyat, odeme_turu)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (urun_id, detay["adet"], detay["fiyat"], detay["adet"] * detay["fiyat"], odeme_turu))
-         self.db.commit()
+        """Sepeti tek işlemde fiş + satış satırları olarak kaydeder, fiş id'sini döndürür"""
+        return satis_kayit.fis_kaydet(self.db, self.sepet.lines(), odeme_turu, self.kasa_no)
+
+    def showEvent(self, event):
+        # Pencere kapatılıp yeniden açıldıysa bağlantıyı ve okuyucuyu geri getir;
+        # indeks kapalıyken de değişiklik yayınını dinlediği için güncel kalır
+        if self.db is None:
+            self.connect_db()
+            self.indeks.db = self.db
+            self.okuyucu.start()
+        super().showEvent(event)
+
+    def changeEvent(self, event):
+        # Pencere öne geldiğinde elle giriş için odak barkod kutusunda olsun
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self.barkod_input.setFocus()
+        super().changeEvent(event)
 
     def closeEvent(self, event):
-        try:
-            if self.db: self.db.close()
-        except: pass
+        # Kuyrukta bekleyen satışları yazmadan kapatma
+        self.satis_yazici.stop()
+        while self.satis_yazici.failed_sales():
+            adet = len(self.satis_yazici.failed_sales())
+            reply = QMessageBox.question(
+                self,
+                "Kaydedilmemiş Satış",
+                f"{adet} satış veritabanına yazılamadı. Tekrar denensin mi?\n"
+                "(Hayır derseniz pencere açık kalır.)",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                self.satis_yazici.start()
+                event.ignore()
+                return
+            self.satis_yazici.retry_failed()
+            self.satis_yazici.stop()
+        
+        self.okuyucu.stop()
+        # Ortak bağlantı kapatılmaz, sadece bırakılır; yeniden açılışta showEvent alır
+        self.db = None
         event.accept()
 
 if __name__ == "__main__":
@@ -0,0 +1,298 @@
+"""POS tarama ve ödeme performans ölçümü.
+
+MarketSatis'i Qt'nin ekransız (offscreen) platformunda kurar, sentetik ya da
+kaydedilmiş barkod akışlarını farklı katalog büyüklüklerine karşı oynatır ve
+sonuçları JSON olarak yazar. Her (katalog, tarama) çifti ayrı bir süreçte
+çalışır; böylece tepe bellek (RSS) ölçümleri birbirini etkilemez.
+
+Örnek:
+    python pos_benchmark.py --katalog 6000 100000 --tarama 1000 10000 --cikti sonuc.json
+    python pos_benchmark.py --karsilastir onceki.json --cikti sonuc.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+VARSAYILAN_KATALOGLAR = [6_000, 100_000, 1_000_000]
+VARSAYILAN_TARAMALAR = [1_000, 10_000, 100_000]
+
+
+def ean13(govde):
+    """12 haneli gövdeye EAN-13 kontrol hanesini ekler"""
+    toplam = sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(govde))
+    return govde + str((10 - toplam % 10) % 10)
+
+
+def katalog_olustur(db_path, urun_sayisi, seed=0):
+    """Sentetik ürün kataloğu içeren bir veritabanı oluşturur"""
+    rng = random.Random(seed)
+    db = sqlite3.connect(db_path)
+    db.execute("""
+        CREATE TABLE urunler
+             (id INTEGER PRIMARY KEY AUTOINCREMENT,
+              urun_adi TEXT,
+              marka TEXT,
+              fiyat REAL,
+              barkod TEXT,
+              tarih DATETIME)
+    """)
+    markalar = [f"Marka {i}" for i in range(200)]
+    db.executemany(
+        "INSERT INTO urunler (urun_adi, marka, fiyat, barkod) VALUES (?, ?, ?, ?)",
+        ((f"Ürün {i}", rng.choice(markalar), round(rng.uniform(1, 500), 2), ean13(f"869{i:09d}"))
+         for i in range(urun_sayisi))
+    )
+    db.commit()
+    db.close()
+
+
+def barkod_akisi(db_path, tarama_sayisi, iskalama_orani, barkod_dosyasi=None, seed=0):
+    """Oynatılacak barkod listesini döndürür (dosyadan veya sentetik)"""
+    if barkod_dosyasi:
+        with open(barkod_dosyasi, encoding="utf-8") as f:
+            kayit = [satir.strip() for satir in f if satir.strip()]
+        # Kayıt kısaysa başa sararak istenen uzunluğa tamamla
+        return [kayit[i % len(kayit)] for i in range(tarama_sayisi)]
+
+    rng = random.Random(seed)
+    db = sqlite3.connect(db_path)
+    urun_sayisi = db.execute("SELECT COUNT(*) FROM urunler").fetchone()[0]
+    db.close()
+    akis = []
+    for _ in range(tarama_sayisi):
+        if rng.random() < iskalama_orani:
+            akis.append(ean13(f"868{rng.randrange(10**9):09d}"))  # Katalogda olmayan ürün
+        else:
+            akis.append(ean13(f"869{rng.randrange(urun_sayisi):09d}"))
+    return akis
+
+
+def yuzdelikler(olcumler_ns, birim=1_000):
+    """p50/p95/p99 ve ortalamayı verilen birimde (varsayılan µs) döndürür"""
+    if len(olcumler_ns) < 2:
+        deger = olcumler_ns[0] / birim if olcumler_ns else 0.0
+        return {"adet": len(olcumler_ns), "p50": deger, "p95": deger, "p99": deger, "ortalama": deger}
+    kesimler = statistics.quantiles(olcumler_ns, n=100, method="inclusive")
+    return {
+        "adet": len(olcumler_ns),
+        "p50": kesimler[49] / birim,
+        "p95": kesimler[94] / birim,
+        "p99": kesimler[98] / birim,
+        "ortalama": statistics.fmean(olcumler_ns) / birim,
+    }
+
+
+def tepe_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt döner
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def geri_bildirim_olc(app, pos, flas_sayisi, sure_ms=250):
+    """Okutma başına görsel geri bildirimin maliyetini ölçer.
+
+    Çağrının kendisi (duvar saati) ve flaşın yanıp sönmesi bitene kadar
+    yapılan tüm stil/yerleşim/boyama işi (süreç CPU süresi) ayrı raporlanır.
+    Olay döngüsünün boşta harcadığı CPU, flaşsız aynı döngüyle ölçülüp düşülür.
+    """
+    def dongu():
+        bitis = time.perf_counter() + sure_ms / 1000
+        while time.perf_counter() < bitis:
+            app.processEvents()
+            time.sleep(0.001)
+
+    pos.show()
+    app.processEvents()
+    bos_ns = []
+    for _ in range(max(flas_sayisi // 5, 2)):
+        c0 = time.process_time_ns()
+        dongu()
+        bos_ns.append(time.process_time_ns() - c0)
+    bos = statistics.median(bos_ns)
+
+    cagri_ns, flas_cpu_ns = [], []
+    for i in range(flas_sayisi):
+        c0 = time.process_time_ns()
+        t0 = time.perf_counter_ns()
+        if i % 2:
+            pos.visual_error()
+        else:
+            pos.visual_feedback()
+        cagri_ns.append(time.perf_counter_ns() - t0)
+        dongu()
+        flas_cpu_ns.append(max(time.process_time_ns() - c0 - bos, 0))
+    pos.hide()
+    return {"cagri_us": yuzdelikler(cagri_ns), "flas_cpu_us": yuzdelikler(flas_cpu_ns)}
+
+
+def tek_calistirma(db_dir, tarama_sayisi, sepet_boyutu, iskalama_orani, barkod_dosyasi, flas_sayisi=0):
+    """Tek bir katalog/tarama çiftini bu süreçte ölçer ve sonucu döndürür"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.chdir(db_dir)  # MarketSatis veritabanını çalışma dizininde arar
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from market_satis import MarketSatis
+
+    akis = barkod_akisi("market_urunler.db", tarama_sayisi, iskalama_orani, barkod_dosyasi)
+
+    baslangic = time.perf_counter_ns()
+    pos = MarketSatis()
+    acilis_ns = time.perf_counter_ns() - baslangic
+
+    tarama_ns, ekleme_ns, odeme_ns = [], [], []
+    bulunamayan = 0
+
+    # add_product_to_table'ı aynı çağrı yolunda ayrıca ölçmek için sar
+    orijinal_ekleme = pos.add_product_to_table
+
+    def olculu_ekleme(urun, adet=1):
+        t0 = time.perf_counter_ns()
+        orijinal_ekleme(urun, adet)
+        ekleme_ns.append(time.perf_counter_ns() - t0)
+
+    pos.add_product_to_table = olculu_ekleme
+
+    for i, barkod in enumerate(akis, 1):
+        onceki_ekleme = len(ekleme_ns)
+        pos.barkod_input.setText(barkod)
+        t0 = time.perf_counter_ns()
+        pos.process_barcode()
+        tarama_ns.append(time.perf_counter_ns() - t0)
+        if len(ekleme_ns) == onceki_ekleme:
+            bulunamayan += 1
+
+        if i % sepet_boyutu == 0 and pos.sepet.rowCount():
+            t0 = time.perf_counter_ns()
+            pos.save_sale_to_db("Nakit")
+            odeme_ns.append(time.perf_counter_ns() - t0)
+            pos.clear_sale()
+
+        if i % 100 == 0:
+            # Bekleyen zamanlayıcı/boyama olaylarını ölçüm dışında işle
+            app.processEvents()
+
+    geri_bildirim = geri_bildirim_olc(app, pos, flas_sayisi) if flas_sayisi else None
+
+    pos.close()
+    app.processEvents()
+
+    return {
+        "katalog": None,  # Ana süreç doldurur
+        "tarama_sayisi": tarama_sayisi,
+        "bulunamayan": bulunamayan,
+        "acilis_ms": acilis_ns / 1e6,
+        "tarama_us": yuzdelikler(tarama_ns),
+        "sepete_ekleme_us": yuzdelikler(ekleme_ns),
+        "odeme_ms": yuzdelikler(odeme_ns, birim=1_000_000),
+        "geri_bildirim": geri_bildirim,
+        "tepe_rss_mb": tepe_rss_mb(),
+    }
+
+
+def karsilastir(onceki, simdiki, esik):
+    """p95 değerlerini önceki sonuçlarla karşılaştırır, gerilemeleri döndürür"""
+    anahtar = lambda s: (s["katalog"], s["tarama_sayisi"])
+    eskiler = {anahtar(s): s for s in onceki["sonuclar"]}
+    gerilemeler = []
+    for sonuc in simdiki["sonuclar"]:
+        eski = eskiler.get(anahtar(sonuc))
+        if not eski:
+            continue
+        for olcu in ("tarama_us", "sepete_ekleme_us", "odeme_ms"):
+            once, simdi = eski[olcu]["p95"], sonuc[olcu]["p95"]
+            if once > 0 and simdi > once * (1 + esik):
+                gerilemeler.append(
+                    f"{sonuc['katalog']} ürün / {sonuc['tarama_sayisi']} tarama - {olcu} p95: "
+                    f"{once:.1f} -> {simdi:.1f} (%{(simdi / once - 1) * 100:.0f})"
+                )
+    return gerilemeler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="POS tarama ve ödeme performans ölçümü")
+    parser.add_argument("--katalog", type=int, nargs="+", default=VARSAYILAN_KATALOGLAR,
+                        help="Ölçülecek katalog büyüklükleri (ürün sayısı)")
+    parser.add_argument("--tarama", type=int, nargs="+", default=VARSAYILAN_TARAMALAR,
+                        help="Oynatılacak tarama sayıları")
+    parser.add_argument("--sepet", type=int, default=40, help="Kaç taramada bir ödeme alınacağı")
+    parser.add_argument("--iskalama", type=float, default=0.01,
+                        help="Sentetik akışta katalogda olmayan barkod oranı")
+    parser.add_argument("--barkod-dosyasi", help="Kaydedilmiş barkod akışı (satır başına bir barkod)")
+    parser.add_argument("--cikti", default="pos_benchmark.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--karsilastir", help="Gerileme kontrolü için önceki sonuç dosyası")
+    parser.add_argument("--esik", type=float, default=0.10, help="Gerileme sayılacak p95 artış oranı")
+    parser.add_argument("--flas", type=int, default=50,
+                        help="Görsel geri bildirim maliyeti için ölçülecek flaş sayısı (0: ölçme)")
+    parser.add_argument("--_calistir", nargs=2, metavar=("DB_DIR", "TARAMA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._calistir:
+        db_dir, tarama_sayisi = args._calistir
+        sonuc = tek_calistirma(db_dir, int(tarama_sayisi), args.sepet, args.iskalama, args.barkod_dosyasi,
+                               args.flas)
+        print(json.dumps(sonuc))
+        return 0
+
+    barkod_dosyasi = os.path.abspath(args.barkod_dosyasi) if args.barkod_dosyasi else None
+    sonuclar = []
+    with tempfile.TemporaryDirectory(prefix="pos_benchmark_") as gecici:
+        for urun_sayisi in args.katalog:
+            db_dir = os.path.join(gecici, str(urun_sayisi))
+            os.makedirs(db_dir)
+            print(f"Katalog oluşturuluyor: {urun_sayisi} ürün", file=sys.stderr)
+            katalog_olustur(os.path.join(db_dir, "market_urunler.db"), urun_sayisi)
+
+            for tarama_sayisi in args.tarama:
+                print(f"  {tarama_sayisi} tarama oynatılıyor...", file=sys.stderr)
+                komut = [sys.executable, os.path.abspath(__file__), "--_calistir", db_dir, str(tarama_sayisi),
+                         "--sepet", str(args.sepet), "--iskalama", str(args.iskalama),
+                         "--flas", str(args.flas)]
+                if barkod_dosyasi:
+                    komut += ["--barkod-dosyasi", barkod_dosyasi]
+                cikti = subprocess.run(komut, check=True, capture_output=True, text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+                sonuc = json.loads(cikti.strip().splitlines()[-1])
+                sonuc["katalog"] = urun_sayisi
+                sonuclar.append(sonuc)
+                print(f"    tarama p95 {sonuc['tarama_us']['p95']:.1f} µs, "
+                      f"ödeme p95 {sonuc['odeme_ms']['p95']:.2f} ms, "
+                      f"tepe RSS {sonuc['tepe_rss_mb']:.0f} MB", file=sys.stderr)
+                if sonuc["geri_bildirim"]:
+                    print(f"    geri bildirim çağrı p95 {sonuc['geri_bildirim']['cagri_us']['p95']:.1f} µs, "
+                          f"flaş başına CPU p50 {sonuc['geri_bildirim']['flas_cpu_us']['p50']:.0f} µs",
+                          file=sys.stderr)
+
+    rapor = {
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "sepet_boyutu": args.sepet,
+        "sonuclar": sonuclar,
+    }
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {args.cikti}", file=sys.stderr)
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding="utf-8") as f:
+            gerilemeler = karsilastir(json.load(f), rapor, args.esik)
+        for satir in gerilemeler:
+            print(f"GERİLEME: {satir}", file=sys.stderr)
+        return 1 if gerilemeler else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+import argparse
+import csv
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import satis_ozetleri
+import veritabani
+
+# Her seferde veritabanından çekilen satır sayısı; bellek bu kadar satırla sınırlı kalır
+PARCA_BOYUTU = 5000
+
+BASLIKLAR = ["Satış No", "Fiş No", "Tarih", "Barkod", "Ürün", "Adet", "Birim Fiyat", "Toplam", "Ödeme Türü"]
+
+# satir: yazılan satış satırı sayısı, sha256: dosyanın özeti (iptalde None),
+# iptal: yarıda kesildi mi (kesilen dosya bırakılmaz)
+DisaAktarimSonucu = namedtuple("DisaAktarimSonucu", ["yol", "satir", "sha256", "iptal"])
+
+
+class DisaAktarimHatasi(Exception):
+    """Dışa aktarma dosyası yazılamadı"""
+
+
+class _Iptal(Exception):
+    pass
+
+
+def _satirlar(cursor, baslangic, bitis, parca_boyutu):
+    # Tek sorgu, imleçten parça parça okunur; sonuç kümesi belleğe alınmaz.
+    # Ürünü sonradan silinmiş satışlar da muhasebeye gider (LEFT JOIN).
+    cursor.execute("""
+        SELECT s.id, s.fis_id, s.tarih, u.barkod, u.urun_adi, s.adet, s.fiyat, s.toplam_fiyat, s.odeme_turu
+        FROM satislar s
+        LEFT JOIN urunler u ON u.id = s.urun_id
+        WHERE s.tarih >= ? AND s.tarih < ?
+        ORDER BY s.tarih, s.id
+    """, (str(baslangic), str(bitis)))
+    while True:
+        parca = cursor.fetchmany(parca_boyutu)
+        if not parca:
+            break
+        yield parca
+
+
+def _ondalik(deger, basamak, sifirsiz=False):
+    # Türkçe Excel noktayı binlik ayracı sayar; ondalıklar virgülle yazılır
+    if deger is None:
+        return ""
+    metin = f"{deger:.{basamak}f}"
+    if sifirsiz:
+        metin = metin.rstrip("0").rstrip(".")
+    return metin.replace(".", ",")
+
+
+def _csv_satiri(satir):
+    satis_id, fis_id, tarih, barkod, urun_adi, adet, fiyat, toplam_fiyat, odeme_turu = satir
+    return (satis_id, fis_id, tarih, barkod, urun_adi,
+            # Tartılı ürünlerin adedi gerektiği kadar basamakla yazılır (1 / 0,75 / 1,235)
+            _ondalik(adet, 3, sifirsiz=True), _ondalik(fiyat, 2), _ondalik(toplam_fiyat, 2), odeme_turu)
+
+
+def _csv_yaz(yol, parcalar):
+    # Excel'in Türkçe ayarları noktalı virgülü, ondalık virgülü ve BOM'lu UTF-8'i doğru açar
+    with open(yol, "w", newline="", encoding="utf-8-sig") as dosya:
+        yazici = csv.writer(dosya, delimiter=";")
+        yazici.writerow(BASLIKLAR)
+        for parca in parcalar:
+            yazici.writerows(_csv_satiri(satir) for satir in parca)
+
+
+def _xlsx_yaz(yol, parcalar):
+    try:
+        import openpyxl
+    except ImportError:
+        raise DisaAktarimHatasi("Excel dosyaları için openpyxl kurulu olmalı (pip install openpyxl)")
+    # write_only kitap satırları hemen diske akıtır, bellekte tutmaz
+    kitap = openpyxl.Workbook(write_only=True)
+    sayfa = kitap.create_sheet("Satışlar")
+    sayfa.append(BASLIKLAR)
+    try:
+        for parca in parcalar:
+            for satir in parca:
+                sayfa.append(satir)
+    except Exception:
+        # Yarım kalan sayfa akışı kapatılmazsa çöp toplanırken kapalı dosyaya yazmaya çalışır
+        sayfa.close()
+        raise
+    kitap.save(yol)
+
+
+def _sha256(yol):
+    ozet = hashlib.sha256()
+    with open(yol, "rb") as dosya:
+        for blok in iter(lambda: dosya.read(1024 * 1024), b""):
+            ozet.update(blok)
+    return ozet.hexdigest()
+
+
+def disa_aktar(db, yol, baslangic, bitis, parca_boyutu=PARCA_BOYUTU, ilerleme=None, iptal=None):
+    """[baslangic, bitis) günlerindeki satış satırlarını CSV ya da XLSX dosyasına akıtır.
+
+    Biçim uzantıdan seçilir. Dosya önce geçici adla yazılır, tamamlanınca
+    yerine taşınır ve yanına `sha256sum` biçiminde `.sha256` dosyası konur.
+    `ilerleme(oran)` her parçadan sonra çağrılır; `iptal()` True dönerse
+    yazım bırakılır ve yarım dosya silinir. DisaAktarimSonucu döndürür.
+    """
+    xlsx = yol.lower().endswith(".xlsx")
+    gecici_yol = yol + ".tmp"
+    cursor = db.cursor()
+    sayac = [0]
+
+    # Toplam ve satırlar aynı anın görüntüsünden okunsun
+    cursor.execute("BEGIN")
+    try:
+        toplam = sum(sayi for _, _, sayi in satis_ozetleri.aralik_ozeti(cursor, baslangic, bitis))
+
+        def parcalar():
+            for parca in _satirlar(db.cursor(), baslangic, bitis, parca_boyutu):
+                if iptal is not None and iptal():
+                    raise _Iptal()
+                yield parca
+                sayac[0] += len(parca)
+                if ilerleme is not None and toplam:
+                    ilerleme(min(sayac[0] / toplam, 1.0))
+
+        try:
+            if xlsx:
+                _xlsx_yaz(gecici_yol, parcalar())
+            else:
+                _csv_yaz(gecici_yol, parcalar())
+        except _Iptal:
+            # openpyxl dosyayı ancak save() sırasında açar; iptalde hiç oluşmamış olabilir
+            if os.path.exists(gecici_yol):
+                os.remove(gecici_yol)
+            return DisaAktarimSonucu(yol, sayac[0], None, True)
+        except Exception:
+            if os.path.exists(gecici_yol):
+                os.remove(gecici_yol)
+            raise
+    finally:
+        db.rollback()
+
+    ozet = _sha256(gecici_yol)
+    os.replace(gecici_yol, yol)
+    with open(yol + ".sha256", "w", encoding="utf-8") as dosya:
+        dosya.write(f"{ozet}  {os.path.basename(yol)}\n")
+    return DisaAktarimSonucu(yol, sayac[0], ozet, False)
+
+
+class SatisDisaAktarici(QObject):
+    """Satışları arka planda, kendi bağlantısıyla dosyaya aktarır; GUI sadece sinyalleri dinler"""
+
+    ilerledi = pyqtSignal(int)       # yüzde
+    bitti = pyqtSignal(object)       # DisaAktarimSonucu
+    basarisiz = pyqtSignal(str)      # hata
+
+    def __init__(self, yol, baslangic, bitis, db_path=veritabani.DB_PATH, parent=None):
+        super().__init__(parent)
+        self.yol = yol
+        self.baslangic = baslangic
+        self.bitis = bitis
+        self.db_path = db_path
+        # Özet tablolarını getiren göçler iş parçacığı başlamadan uygulanmış olsun
+        veritabani.baglanti(db_path)
+        self._iptal = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="SatisDisaAktarici", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Yazılan parça bitince durur, yarım dosyayı siler"""
+        self._iptal.set()
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        db = veritabani.connect(self.db_path)
+        try:
+            sonuc = disa_aktar(
+                db, self.yol, self.baslangic, self.bitis,
+                ilerleme=lambda oran: self.ilerledi.emit(int(oran * 100)),
+                iptal=self._iptal.is_set,
+            )
+        except Exception as e:
+            self.basarisiz.emit(str(e))
+        else:
+            self.bitti.emit(sonuc)
+        finally:
+            db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Satış satırlarını muhasebe için CSV/XLSX dosyasına aktarır")
+    parser.add_argument("--db", default=veritabani.DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument("--baslangic", required=True, type=date.fromisoformat, help="İlk gün (YYYY-AA-GG)")
+    parser.add_argument("--bitis", required=True, type=date.fromisoformat, help="Son gün, dahil (YYYY-AA-GG)")
+    parser.add_argument("--cikti", required=True, help="Çıktı dosyası (.csv ya da .xlsx)")
+    parser.add_argument("--parca", type=int, default=PARCA_BOYUTU, help="Veritabanından bir seferde okunan satır")
+    args = parser.parse_args()
+
+    db = veritabani.baglanti(args.db)
+    son_yuzde = [-1]
+
+    def ilerleme(oran):
+        yuzde = int(oran * 100)
+        if yuzde != son_yuzde[0]:
+            son_yuzde[0] = yuzde
+            print(f"\r%{yuzde}", end="", flush=True)
+
+    sonuc = disa_aktar(db, args.cikti, args.baslangic, args.bitis + timedelta(days=1), args.parca, ilerleme)
+    print(f"\r{sonuc.satir} satış satırı yazıldı: {sonuc.yol}")
+    print(f"SHA-256: {sonuc.sha256}")
+
+
+if __name__ == "__main__":
+    main()
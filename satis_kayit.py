@@ -0,0 +1,165 @@
+import stok
+import veresiye
+import veritabani
+
+
+def ensure_schema(cursor):
+    """Satış ve fiş tablolarını oluşturur, eski satislar tablosuna fis_id kolonunu ekler"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS satislar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_id INTEGER,
+            adet INTEGER,
+            fiyat REAL,
+            toplam_fiyat REAL,
+            odeme_turu TEXT,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (urun_id) REFERENCES urunler (id)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fisler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            odeme_turu TEXT NOT NULL,
+            toplam_tutar REAL NOT NULL,
+            satir_sayisi INTEGER NOT NULL,
+            kasa_no INTEGER NOT NULL DEFAULT 1,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("PRAGMA table_info(fisler)")
+    if "kasa_no" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE fisler ADD COLUMN kasa_no INTEGER NOT NULL DEFAULT 1")
+
+    cursor.execute("PRAGMA table_info(satislar)")
+    kolonlar = [row[1] for row in cursor.fetchall()]
+    if "fis_id" not in kolonlar:
+        cursor.execute("ALTER TABLE satislar ADD COLUMN fis_id INTEGER REFERENCES fisler (id)")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_fis_id ON satislar (fis_id)")
+
+    # Satış, stoğu aynı işlemde düştüğü için stok kolonları da hazır olmalı
+    stok.ensure_schema(cursor)
+    # Veresiye satışta borç satırları da aynı işlemde yazılır
+    veresiye.ensure_schema(cursor)
+
+
+def fis_kaydet(db, satirlar, odeme_turu, kasa_no=1, musteri_id=None):
+    """Fiş başlığını ve tüm satış satırlarını tek bir işlemde yazar.
+
+    `satirlar` her biri urun_id, adet ve fiyat taşıyan sepet satırlarıdır;
+    ürün id'leri sepette hazır olduğu için satır başına sorgu yapılmaz.
+    `musteri_id` verilirse (veresiye) satırlar müşterinin borcuna da işlenir.
+    Oluşan fişin id'sini döndürür.
+    """
+    cursor = db.cursor()
+    # Yazma kilidini baştan al; yarıda kalan fiş ya hep ya hiç yazılır
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        fis_id = fis_yaz(cursor, satirlar, odeme_turu, kasa_no, musteri_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return fis_id
+
+
+def fis_yaz(cursor, satirlar, odeme_turu, kasa_no=1, musteri_id=None):
+    """Fişi ve satırlarını açık olan işlemin içinde yazar (commit etmez)"""
+    satirlar = list(satirlar)
+    toplam_tutar = sum(satir.adet * satir.fiyat for satir in satirlar)
+
+    cursor.execute("""
+        INSERT INTO fisler (odeme_turu, toplam_tutar, satir_sayisi, kasa_no)
+        VALUES (?, ?, ?, ?)
+    """, (odeme_turu, toplam_tutar, len(satirlar), kasa_no))
+    fis_id = cursor.lastrowid
+
+    # Satırlar fişle aynı zaman damgasını taşısın
+    cursor.execute("SELECT tarih FROM fisler WHERE id = ?", (fis_id,))
+    tarih = cursor.fetchone()[0]
+
+    cursor.executemany("""
+        INSERT INTO satislar (fis_id, urun_id, adet, fiyat, toplam_fiyat, odeme_turu, tarih)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (fis_id, satir.urun_id, satir.adet, satir.fiyat, satir.adet * satir.fiyat, odeme_turu, tarih)
+        for satir in satirlar
+    ])
+
+    if musteri_id is not None:
+        veresiye.borc_yaz(cursor, fis_id, musteri_id, satirlar, tarih)
+
+    stok.stok_dus(cursor, fis_id)
+    return fis_id
+
+
+def fissiz_satislar_yaz(cursor, satirlar):
+    """Fişe bağlı olmayan (urun_id, adet, fiyat, toplam, ödeme türü, tarih) satırlarını yazar (commit etmez).
+
+    Demo verisi gibi kasadan geçmeyen satışlar içindir; özet tabloları
+    tetikleyicilerle yine güncellenir.
+    """
+    cursor.executemany("""
+        INSERT INTO satislar (urun_id, adet, fiyat, toplam_fiyat, odeme_turu, tarih)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, satirlar)
+
+
+# Rapor satırı: (id, gösterilecek tarih, ham tarih, ürün, adet, fiyat, toplam, ödeme türü).
+# Tarih SQL'de biçimlenir; GUI satır başına tarih ayrıştırmaz.
+_RAPOR_SATIRI = """
+    SELECT
+        s.id,
+        strftime('%d.%m.%Y %H:%M', s.tarih),
+        s.tarih,
+        u.urun_adi,
+        s.adet,
+        s.fiyat,
+        s.toplam_fiyat,
+        s.odeme_turu
+    FROM satislar s
+    JOIN urunler u ON s.urun_id = u.id
+"""
+
+
+def satis_sayfasi(cursor, baslangic, bitis, son=None, limit=500):
+    """[baslangic, bitis] aralığındaki satışların yeniden eskiye bir sayfasını rapor satırı olarak döndürür.
+
+    `son` önceki sayfanın son satırıdır; sayfa onun (tarih, id) değerinden
+    devam eder (OFFSET yok), böylece her sayfa tarih indeksinde kısa bir aralıktır.
+    """
+    sorgu = _RAPOR_SATIRI + " WHERE s.tarih BETWEEN ? AND ?"
+    parametreler = [baslangic, bitis]
+    if son is not None:
+        sorgu += " AND (s.tarih, s.id) < (?, ?)"
+        parametreler += [son[2], son[0]]
+    sorgu += " ORDER BY s.tarih DESC, s.id DESC LIMIT ?"
+    cursor.execute(sorgu, parametreler + [limit])
+    return cursor.fetchall()
+
+
+def fis_satislari(cursor, fis_idler, baslangic, bitis):
+    """Verilen fişlerin [baslangic, bitis] aralığındaki satışlarını satis_sayfasi ile aynı biçimde döndürür"""
+    satirlar = []
+    for parca in veritabani.parcalar(fis_idler):
+        cursor.execute(
+            _RAPOR_SATIRI + f"""
+            WHERE s.fis_id IN ({veritabani.yer_tutucular(parca)}) AND s.tarih BETWEEN ? AND ?
+        """, [*parca, baslangic, bitis])
+        satirlar += cursor.fetchall()
+    # (tarih, id) sırası parçalar birleştikten sonra kurulur
+    satirlar.sort(key=lambda satir: (satir[2], satir[0]), reverse=True)
+    return satirlar
+
+
+def fis_urunleri(cursor, fis_idler):
+    """Verilen fişlerde satılan ürünlerin id'lerini döndürür"""
+    urun_idler = {}
+    for parca in veritabani.parcalar(fis_idler):
+        cursor.execute(
+            f"SELECT DISTINCT urun_id FROM satislar WHERE fis_id IN ({veritabani.yer_tutucular(parca)})", parca)
+        urun_idler.update(dict.fromkeys(row[0] for row in cursor.fetchall()))
+    return list(urun_idler)
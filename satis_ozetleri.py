@@ -0,0 +1,191 @@
+import argparse
+
+import veritabani
+
+# Özet tablosu -> satış satırının düştüğü dönem ifadesi ({s} satır takma adıyla değiştirilir)
+OZETLER = {
+    "satis_ozet_gunluk": "date({s}.tarih)",
+    "satis_ozet_saatlik": "strftime('%Y-%m-%d %H:00', {s}.tarih)",
+}
+
+
+def _donem(tablo, satir):
+    # Tarihi çözülemeyen satır da özetlerde kaybolmasın, boş dönemde toplanır
+    return f"COALESCE({OZETLER[tablo].format(s=satir)}, '')"
+
+
+def _ekle(tablo, satir):
+    return f"""
+            INSERT INTO {tablo} (donem, odeme_turu, ciro, adet, satir_sayisi)
+            VALUES ({_donem(tablo, satir)}, COALESCE({satir}.odeme_turu, ''),
+                    COALESCE({satir}.toplam_fiyat, 0), COALESCE({satir}.adet, 0), 1)
+            ON CONFLICT (donem, odeme_turu) DO UPDATE SET
+                ciro = ciro + excluded.ciro,
+                adet = adet + excluded.adet,
+                satir_sayisi = satir_sayisi + 1;"""
+
+
+def _cikar(tablo, satir):
+    kosul = f"donem = {_donem(tablo, satir)} AND odeme_turu = COALESCE({satir}.odeme_turu, '')"
+    return f"""
+            UPDATE {tablo} SET
+                ciro = ciro - COALESCE({satir}.toplam_fiyat, 0),
+                adet = adet - COALESCE({satir}.adet, 0),
+                satir_sayisi = satir_sayisi - 1
+            WHERE {kosul};
+            DELETE FROM {tablo} WHERE {kosul} AND satir_sayisi <= 0;"""
+
+
+def ensure_schema(cursor):
+    """Günlük ve saatlik satış özet tablolarını ve onları güncel tutan tetikleyicileri oluşturur.
+
+    Her satış satırı aynı işlemde (dönem, ödeme türü) satırına eklenir;
+    raporlar ham satislar tablosunu gruplamak yerine bu birkaç yüz satırı okur.
+    """
+    for tablo in OZETLER:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {tablo} (
+                donem TEXT NOT NULL,
+                odeme_turu TEXT NOT NULL,
+                ciro REAL NOT NULL DEFAULT 0,
+                adet REAL NOT NULL DEFAULT 0,
+                satir_sayisi INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (donem, odeme_turu)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_ekle
+            AFTER INSERT ON satislar
+            BEGIN{_ekle(tablo, "new")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_sil
+            AFTER DELETE ON satislar
+            BEGIN{_cikar(tablo, "old")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_guncelle
+            AFTER UPDATE OF tarih, odeme_turu, toplam_fiyat, adet ON satislar
+            BEGIN{_cikar(tablo, "old")}{_ekle(tablo, "new")}
+            END
+        """)
+
+
+def doldur(cursor):
+    """Özet tablolarını ham satışlardan baştan hesaplar (commit etmez)"""
+    for tablo in OZETLER:
+        cursor.execute(f"DELETE FROM {tablo}")
+        cursor.execute(f"""
+            INSERT INTO {tablo} (donem, odeme_turu, ciro, adet, satir_sayisi)
+            SELECT {_donem(tablo, "s")}, COALESCE(s.odeme_turu, ''),
+                   TOTAL(s.toplam_fiyat), TOTAL(s.adet), COUNT(*)
+            FROM satislar s
+            GROUP BY 1, 2
+        """)
+
+
+def yeniden_olustur(db):
+    """Özet tablolarını tek bir işlemde baştan hesaplar"""
+    cursor = db.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        doldur(cursor)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def farklar(cursor):
+    """Özetleri ham satışlarla karşılaştırır; tutmayan (tablo, dönem, ödeme türü) listesini döndürür"""
+    sonuc = []
+    for tablo in OZETLER:
+        cursor.execute(f"""
+            WITH ham AS (
+                SELECT {_donem(tablo, "s")} AS donem, COALESCE(s.odeme_turu, '') AS odeme_turu,
+                       TOTAL(s.toplam_fiyat) AS ciro, COUNT(*) AS satir_sayisi
+                FROM satislar s
+                GROUP BY 1, 2
+            )
+            SELECT h.donem, h.odeme_turu FROM ham h
+            LEFT JOIN {tablo} o USING (donem, odeme_turu)
+            WHERE o.satir_sayisi IS NOT h.satir_sayisi OR ABS(o.ciro - h.ciro) > 0.005
+            UNION
+            SELECT o.donem, o.odeme_turu FROM {tablo} o
+            WHERE NOT EXISTS (SELECT 1 FROM ham h WHERE h.donem = o.donem AND h.odeme_turu = o.odeme_turu)
+        """)
+        sonuc += [(tablo, donem, odeme_turu) for donem, odeme_turu in cursor.fetchall()]
+    return sonuc
+
+
+def gunluk_ciro(cursor):
+    """Satış olan her günün (gün, ciro) çiftini eskiden yeniye döndürür"""
+    cursor.execute("""
+        SELECT donem AS gun, SUM(ciro) AS ciro
+        FROM satis_ozet_gunluk
+        WHERE donem <> ''
+        GROUP BY donem
+        ORDER BY donem
+    """)
+    return cursor.fetchall()
+
+
+def aralik_ozeti(cursor, baslangic, bitis):
+    """[baslangic, bitis) günlerindeki satışların ödeme türüne göre (ödeme türü, ciro, satır sayısı) toplamları"""
+    cursor.execute("""
+        SELECT odeme_turu, SUM(ciro), SUM(satir_sayisi)
+        FROM satis_ozet_gunluk
+        WHERE donem >= ? AND donem < ?
+        GROUP BY odeme_turu
+    """, (str(baslangic), str(bitis)))
+    return cursor.fetchall()
+
+
+def saatlik_ciro(cursor, gun):
+    """Günün saatlerine göre (saat, ciro, satır sayısı) dağılımını döndürür"""
+    cursor.execute("""
+        SELECT substr(donem, 12, 2) AS saat, SUM(ciro), SUM(satir_sayisi)
+        FROM satis_ozet_saatlik
+        WHERE donem >= ? AND donem < ?
+        GROUP BY donem
+        ORDER BY donem
+    """, (f"{gun} 00:00", f"{gun} 24:00"))
+    return cursor.fetchall()
+
+
+def satir_sayisi(cursor):
+    """Özetlere işlenmiş toplam satış satırı sayısı"""
+    cursor.execute("SELECT COALESCE(SUM(satir_sayisi), 0) FROM satis_ozet_gunluk")
+    return cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Satış özet tablolarını denetler ve yeniden oluşturur")
+    parser.add_argument("--db", default=veritabani.DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument("--yeniden-olustur", action="store_true", help="Özetleri ham satışlardan baştan hesapla")
+    parser.add_argument("--denetle", action="store_true", help="Özetleri ham satışlarla karşılaştır")
+    parser.add_argument("--gun", help="Günün saatlik dağılımını göster (YYYY-AA-GG)")
+    args = parser.parse_args()
+
+    db = veritabani.baglanti(args.db)
+    cursor = db.cursor()
+    if args.yeniden_olustur:
+        yeniden_olustur(db)
+        print(f"Özetler yeniden oluşturuldu: {satir_sayisi(cursor)} satış satırı")
+    if args.denetle:
+        hatali = farklar(cursor)
+        for tablo, donem, odeme_turu in hatali[:20]:
+            print(f"  {tablo}: {donem} {odeme_turu}")
+        print(f"{len(hatali)} özet satırı ham satışlarla tutmuyor" if hatali else "Özetler ham satışlarla tutarlı")
+    if args.gun:
+        for saat, ciro, sayi in saatlik_ciro(cursor, args.gun):
+            print(f"  {saat}:00  {ciro:>12.2f} TL  {sayi:>6} satır")
+    if not (args.yeniden_olustur or args.denetle or args.gun):
+        for gun, ciro in gunluk_ciro(cursor)[-7:]:
+            print(f"  {gun}  {ciro:>12.2f} TL")
+
+
+if __name__ == "__main__":
+    main()
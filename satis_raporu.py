@@ -2,17 +2,24 @@ import sys
 import sqlite3
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit,
-                            QTabWidget, QFrame, QGroupBox, QMessageBox)
+                            QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QDateEdit,
+                            QTabWidget, QFrame, QGroupBox, QMessageBox,
+                            QFileDialog, QProgressDialog)
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QFont, QColor
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
 from styles import Styles
+import veritabani
+import satis_kayit
+import satis_ozetleri
+from satis_tablosu import SatisTablosuModeli
+from satis_disa_aktarim import SatisDisaAktarici
+import degisiklik_yayini
 from market_ai import MarketAI
 
 class SatisRaporu(QMainWindow):
@@ -58,6 +65,10 @@ class SatisRaporu(QMainWindow):
         
         # İlk listeleme
         self.load_sales()
+        
+        # Kasalarda kesilen fişler listeye ve özete tablo baştan yüklenmeden eklenir
+        self.yayin = degisiklik_yayini.yayin()
+        self.yayin.fis_eklendi.connect(self.on_receipts_added)
 
     def setup_report_tab(self):
         layout = QVBoxLayout(self.tab_report)
@@ -88,6 +99,11 @@ class SatisRaporu(QMainWindow):
         date_layout.addWidget(bitis_label)
         date_layout.addWidget(self.bitis_date)
         date_layout.addWidget(self.listele_button)
+        
+        self.export_button = QPushButton("Dışa Aktar")
+        self.export_button.setObjectName("PrimaryButton")
+        self.export_button.clicked.connect(self.export_sales)
+        date_layout.addWidget(self.export_button)
         date_layout.addStretch()
         
         layout.addLayout(date_layout)
@@ -129,10 +145,13 @@ class SatisRaporu(QMainWindow):
 
         layout.addLayout(summary_layout)
         
-        # Satış tablosu
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Tarih", "Ürün", "Adet", "Fiyat", "Toplam", "Ödeme Türü"])
+        # Satış tablosu (satırlar arka planda, kaydırdıkça sayfa sayfa okunur)
+        self.satis_modeli = SatisTablosuModeli(parent=self)
+        self.satis_modeli.basarisiz.connect(
+            lambda hata: QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {hata}"))
+        self.table = QTableView()
+        self.table.setModel(self.satis_modeli)
+        self.table.verticalHeader().setVisible(False)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.table.setFont(QFont("Arial", 12))
         layout.addWidget(self.table)
@@ -245,72 +264,61 @@ class SatisRaporu(QMainWindow):
         self.canvas.draw()
 
     def connect_db(self):
-        self.db = sqlite3.connect('market_urunler.db')
+        self.db = veritabani.baglanti()
         self.cursor = self.db.cursor()
 
     def load_sales(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
+        # Tarih aralığını al
+        baslangic = self.baslangic_date.date().toPyDate()
+        bitis = self.bitis_date.date().toPyDate() + timedelta(days=1)  # Bitiş gününü de dahil et
+        self.aralik = (baslangic, bitis)
         
+        # Özet, detay satırlarından bağımsız olarak hemen gelir
+        self.update_summary(baslangic, bitis)
+        
+        # Detay satırları arka planda okunur; önceki aralığın okuması kesilir
+        self.satis_modeli.set_range(baslangic, bitis)
+
+    def on_receipts_added(self, fis_idler):
+        """Listelenen tarih aralığına düşen yeni fişlerin satırlarını listenin başına ekler"""
+        if not hasattr(self, 'aralik'):
+            return
+        baslangic, bitis = self.aralik
         try:
-            # Tarih aralığını al
-            baslangic = self.baslangic_date.date().toPyDate()
-            bitis = self.bitis_date.date().toPyDate() + timedelta(days=1)  # Bitiş gününü de dahil et
-            
-            # Satışları getir
-            self.cursor.execute("""
-                SELECT 
-                    s.tarih,
-                    u.urun_adi,
-                    s.adet,
-                    s.fiyat,
-                    s.toplam_fiyat,
-                    s.odeme_turu
-                FROM satislar s
-                JOIN urunler u ON s.urun_id = u.id
-                WHERE s.tarih BETWEEN ? AND ?
-                ORDER BY s.tarih DESC
-            """, (baslangic, bitis))
-            
-            sales = self.cursor.fetchall()
-            
-            # Tabloyu doldur
-            self.table.setRowCount(len(sales))
-            for row, sale in enumerate(sales):
-                # Tarih formatını düzenle
-                tarih = datetime.strptime(sale[0], "%Y-%m-%d %H:%M:%S").strftime("%d.%m.%Y %H:%M")
-                self.table.setItem(row, 0, QTableWidgetItem(tarih))
-                
-                # Diğer bilgiler
-                self.table.setItem(row, 1, QTableWidgetItem(sale[1]))  # Ürün adı
-                self.table.setItem(row, 2, QTableWidgetItem(str(sale[2])))  # Adet
-                self.table.setItem(row, 3, QTableWidgetItem(f"{sale[3]:.2f} TL"))  # Fiyat
-                self.table.setItem(row, 4, QTableWidgetItem(f"{sale[4]:.2f} TL"))  # Toplam
-                self.table.setItem(row, 5, QTableWidgetItem(sale[5]))  # Ödeme türü
-            
-            # Özet bilgileri hesapla ve güncelle
-            self.update_summary(sales, baslangic, bitis)
-            
+            yeni = satis_kayit.fis_satislari(self.cursor, fis_idler, baslangic, bitis)
+        except sqlite3.Error:
+            # Geçici hata: satırlar bir sonraki listelemede gelir
+            return
+        if not yeni:
+            return
+        # Liste yeniden eskiye sıralı; yeni fişler en üste gelir
+        self.satis_modeli.prepend(yeni)
+        self.update_summary(baslangic, bitis)
+
+    def update_summary(self, baslangic, bitis):
+        """Özeti detay tablosundan bağımsız, günlük satış özetinden tek sorguyla hesaplar"""
+        try:
+            odemeler = {
+                odeme_turu: (ciro, sayi)
+                for odeme_turu, ciro, sayi in satis_ozetleri.aralik_ozeti(self.cursor, baslangic, bitis)
+            }
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
-
-    def update_summary(self, sales, baslangic, bitis):
-        if not sales:
             return
         
         # Toplam satış bilgileri
-        total_amount = sum(sale[4] for sale in sales)  # toplam_fiyat
-        total_count = len(sales)
-        avg_sale = total_amount / total_count
+        total_amount = sum(ciro for ciro, _ in odemeler.values())
+        total_count = sum(sayi for _, sayi in odemeler.values())
+        avg_sale = total_amount / total_count if total_count else 0
         
         self.total_amount_label.setText(f"Toplam Tutar: {total_amount:.2f} TL")
         self.total_count_label.setText(f"Toplam Satış Adedi: {total_count}")
         self.avg_sale_label.setText(f"Ortalama Satış Tutarı: {avg_sale:.2f} TL")
         
         # Ödeme türü dağılımı
-        cash_sales = sum(sale[4] for sale in sales if sale[5] == "Nakit")
-        credit_sales = sum(sale[4] for sale in sales if sale[5] == "Kredi Kartı")
-        debt_sales = sum(sale[4] for sale in sales if sale[5] == "Borç")
+        cash_sales = odemeler.get("Nakit", (0, 0))[0]
+        credit_sales = odemeler.get("Kredi Kartı", (0, 0))[0]
+        debt_sales = odemeler.get("Borç", (0, 0))[0]
         
         cash_percent = (cash_sales / total_amount) * 100 if total_amount > 0 else 0
         credit_percent = (credit_sales / total_amount) * 100 if total_amount > 0 else 0
@@ -320,8 +328,65 @@ class SatisRaporu(QMainWindow):
         self.credit_label.setText(f"Kredi Kartı: %{credit_percent:.1f} ({credit_sales:.2f} TL)")
         self.debt_label.setText(f"Borç: %{debt_percent:.1f} ({debt_sales:.2f} TL)")
 
+    def export_sales(self):
+        """Seçili aralığın satış satırlarını muhasebe için CSV/XLSX dosyasına arka planda aktarır"""
+        baslangic = self.baslangic_date.date().toPyDate()
+        bitis = self.bitis_date.date().toPyDate() + timedelta(days=1)
+        default_name = f"satislar_{baslangic:%Y%m%d}_{self.bitis_date.date().toPyDate():%Y%m%d}.csv"
+        
+        file_path, secilen_filtre = QFileDialog.getSaveFileName(
+            self,
+            "Satışları Dışa Aktar",
+            default_name,
+            "CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if not file_path:
+            return
+        if "*.xlsx" in secilen_filtre and not file_path.lower().endswith(".xlsx"):
+            file_path += ".xlsx"
+        
+        self.disa_aktarici = SatisDisaAktarici(file_path, baslangic, bitis, parent=self)
+        self.disa_aktarim_ilerleme = QProgressDialog("Satışlar dışa aktarılıyor...", "İptal", 0, 100, self)
+        self.disa_aktarim_ilerleme.setWindowTitle("Dışa Aktar")
+        self.disa_aktarim_ilerleme.setWindowModality(Qt.WindowModality.WindowModal)
+        self.disa_aktarim_ilerleme.setMinimumDuration(500)
+        self.disa_aktarim_ilerleme.setAutoClose(False)
+        self.disa_aktarim_ilerleme.setAutoReset(False)
+        self.disa_aktarim_ilerleme.canceled.connect(self.disa_aktarici.cancel)
+        self.disa_aktarici.ilerledi.connect(self.disa_aktarim_ilerleme.setValue)
+        self.disa_aktarici.bitti.connect(self.export_finished)
+        self.disa_aktarici.basarisiz.connect(self.export_failed)
+        self.export_button.setEnabled(False)
+        self.disa_aktarici.start()
+    
+    def _export_closed(self):
+        self.disa_aktarim_ilerleme.close()
+        self.export_button.setEnabled(True)
+        self.disa_aktarici = None
+    
+    def export_finished(self, sonuc):
+        self._export_closed()
+        if sonuc.iptal:
+            QMessageBox.information(self, "Dışa Aktar", "Dışa aktarma iptal edildi, yarım dosya silindi.")
+            return
+        QMessageBox.information(
+            self,
+            "Başarılı",
+            f"{sonuc.satir} satış satırı dışa aktarıldı:\n{sonuc.yol}\n\n"
+            f"SHA-256: {sonuc.sha256}\n(özet {sonuc.yol}.sha256 dosyasında)"
+        )
+    
+    def export_failed(self, hata):
+        self._export_closed()
+        QMessageBox.critical(self, "Hata", f"Satışlar dışa aktarılırken bir hata oluştu: {hata}")
+
     def closeEvent(self, event):
-        self.db.close()
+        # Süren detay okuması kesilir, süren dışa aktarma yazdığı parçayı bitirip durur;
+        # ortak bağlantı diğer pencerelerle paylaşıldığı için kapatılmaz
+        self.satis_modeli.cancel()
+        if getattr(self, 'disa_aktarici', None) is not None:
+            self.disa_aktarici.cancel()
+            self.disa_aktarici.wait()
         event.accept()
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+import queue
+import sqlite3
+import threading
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, pyqtSignal
+
+import satis_kayit
+import veritabani
+
+KOLONLAR = ["Tarih", "Ürün", "Adet", "Fiyat", "Toplam", "Ödeme Türü"]
+
+_DUR = object()
+
+
+class SatisOkuyucu(QObject):
+    """Bir tarih aralığının satışlarını arka planda, kendi bağlantısıyla sayfa sayfa okur.
+
+    Her `request_page` bir sonraki sayfayı ister. `cancel` çalışan sorguyu
+    `interrupt` ile yarıda keser; aralık değiştiğinde eski okuyucu beklenmez.
+    Sinyaller okuyucunun kendisini de taşır ki model eski okuyucudan gelen
+    geç sayfaları ayırt edebilsin.
+    """
+
+    sayfa_geldi = pyqtSignal(object, list)   # okuyucu, rapor satırları
+    basarisiz = pyqtSignal(object, str)      # okuyucu, hata
+
+    def __init__(self, baslangic, bitis, sayfa_boyutu, db_path=veritabani.DB_PATH, parent=None):
+        super().__init__(parent)
+        self.baslangic = baslangic
+        self.bitis = bitis
+        self.sayfa_boyutu = sayfa_boyutu
+        self.db_path = db_path
+        self._istekler = queue.Queue()
+        self._iptal = threading.Event()
+        self._kilit = threading.Lock()
+        self._db = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="SatisOkuyucu", daemon=True)
+        self._thread.start()
+
+    def request_page(self):
+        self._istekler.put(True)
+
+    def cancel(self):
+        """Çalışan sorguyu keser ve iş parçacığını durdurur"""
+        self._iptal.set()
+        with self._kilit:
+            if self._db is not None:
+                self._db.interrupt()
+        self._istekler.put(_DUR)
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        db = veritabani.connect(self.db_path)
+        with self._kilit:
+            self._db = db
+        try:
+            son = None
+            while self._istekler.get() is not _DUR and not self._iptal.is_set():
+                try:
+                    satirlar = satis_kayit.satis_sayfasi(
+                        db.cursor(), self.baslangic, self.bitis, son, self.sayfa_boyutu)
+                except sqlite3.OperationalError:
+                    # interrupt ile kesilen sorgu hata değildir
+                    if self._iptal.is_set():
+                        break
+                    raise
+                if self._iptal.is_set():
+                    break
+                if satirlar:
+                    son = satirlar[-1]
+                self.sayfa_geldi.emit(self, satirlar)
+                if len(satirlar) < self.sayfa_boyutu:
+                    break
+        except Exception as e:
+            self.basarisiz.emit(self, str(e))
+        finally:
+            with self._kilit:
+                self._db = None
+            db.close()
+
+
+class SatisTablosuModeli(QAbstractTableModel):
+    """Satış raporu satırlarını görünüm kaydırdıkça sayfa sayfa gösteren model.
+
+    Sayfalar SatisOkuyucu ile arka planda okunur, GUI iş parçacığı sorgu
+    beklemez. Sayfalar (tarih, id) anahtarından devam ettiği için listenin
+    başına yeni fiş eklenmesi sonraki sayfaları kaydırmaz.
+    """
+
+    SAYFA_BOYUTU = 500
+
+    basarisiz = pyqtSignal(str)
+
+    def __init__(self, db_path=veritabani.DB_PATH, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self._satirlar = []
+        self._eklenenler = set()   # prepend ile gelen satış id'leri
+        self._okuyucu = None
+        self._bekleniyor = False
+        self._bitti = True
+
+    # Qt arayüzü
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(KOLONLAR)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return KOLONLAR[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        _, tarih, _, urun_adi, adet, fiyat, toplam, odeme_turu = self._satirlar[index.row()]
+        kolon = index.column()
+        if kolon == 0:
+            return tarih
+        if kolon == 1:
+            return urun_adi
+        if kolon == 2:
+            return str(adet)
+        if kolon == 3:
+            return f"{fiyat:.2f} TL"
+        if kolon == 4:
+            return f"{toplam:.2f} TL"
+        return odeme_turu
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._bitti
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._bitti or self._bekleniyor:
+            return
+        self._bekleniyor = True
+        self._okuyucu.request_page()
+
+    # Uygulama arayüzü
+
+    def set_range(self, baslangic, bitis):
+        """Tabloyu boşaltır ve aralığın ilk sayfasını arka planda okumaya başlar"""
+        self.cancel()
+        self.beginResetModel()
+        self._satirlar = []
+        self._eklenenler = set()
+        self._bitti = False
+        self._bekleniyor = False
+        self.endResetModel()
+        self._okuyucu = SatisOkuyucu(baslangic, bitis, self.SAYFA_BOYUTU, self.db_path)
+        self._okuyucu.sayfa_geldi.connect(self._sayfa_geldi)
+        self._okuyucu.basarisiz.connect(self._okuma_basarisiz)
+        self._okuyucu.start()
+        self.fetchMore()
+
+    def cancel(self):
+        """Süren okumayı keser (beklemez)"""
+        if self._okuyucu is not None:
+            self._okuyucu.cancel()
+            self._okuyucu = None
+        self._bitti = True
+        self._bekleniyor = False
+
+    def prepend(self, satirlar):
+        """Yeni satırları (yeniden eskiye) listenin başına ekler"""
+        if not satirlar:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(satirlar) - 1)
+        self._satirlar[:0] = satirlar
+        self.endInsertRows()
+        self._eklenenler.update(satir[0] for satir in satirlar)
+
+    def _sayfa_geldi(self, okuyucu, satirlar):
+        if okuyucu is not self._okuyucu:
+            return
+        self._bekleniyor = False
+        if len(satirlar) < self.SAYFA_BOYUTU:
+            self._bitti = True
+        if self._eklenenler:
+            # Okuma başladıktan sonra başa eklenen fiş bu sayfada da gelmiş olabilir
+            satirlar = [satir for satir in satirlar if satir[0] not in self._eklenenler]
+        if satirlar:
+            bas = len(self._satirlar)
+            self.beginInsertRows(QModelIndex(), bas, bas + len(satirlar) - 1)
+            self._satirlar.extend(satirlar)
+            self.endInsertRows()
+
+    def _okuma_basarisiz(self, okuyucu, hata):
+        if okuyucu is not self._okuyucu:
+            return
+        self._bitti = True
+        self._bekleniyor = False
+        self.basarisiz.emit(hata)
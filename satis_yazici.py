@@ -0,0 +1,126 @@
+import itertools
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import satis_kayit
+import veritabani
+
+# Kuyruğa giren satırların GUI'deki sepetten bağımsız kopyası
+SatisSatiri = namedtuple("SatisSatiri", ["urun_id", "adet", "fiyat"])
+
+_DUR = object()
+
+
+class SatisYazici(QObject):
+    """Tamamlanan satışları arka planda veritabanına yazan tek iş parçacığı.
+
+    Kasa `submit` ile satışı sınırlı kuyruğa bırakır ve hemen bir sonraki
+    müşteriye geçer. Kilitli/meşgul veritabanı hataları (bağlantı açılırken
+    dahil) artan beklemelerle yeniden denenir; yine de yazılamayan satışlar
+    `failed_sales` içinde saklanır ve `retry_failed` ile tekrar kuyruğa
+    alınabilir. Sinyaller GUI iş parçacığına kuyruklu bağlantıyla ulaşır.
+    """
+
+    kaydedildi = pyqtSignal(int, int)             # satis_no, fis_id
+    yeniden_deneniyor = pyqtSignal(int, int, str)  # satis_no, deneme, hata
+    kaydedilemedi = pyqtSignal(int, str)          # satis_no, hata
+
+    def __init__(self, db_path=veritabani.DB_PATH, kasa_no=1, kuyruk_boyutu=100,
+                 deneme_sayisi=veritabani.DENEME_SAYISI, bekleme=0.2, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.kasa_no = kasa_no
+        self.deneme_sayisi = deneme_sayisi
+        self.bekleme = bekleme
+        self._kuyruk = queue.Queue(maxsize=kuyruk_boyutu)
+        self._sayac = itertools.count(1)
+        self._basarisiz = {}
+        self._kilit = threading.Lock()
+        self._thread = None
+        self._db = None
+
+    def start(self):
+        """Yazıcı iş parçacığını başlatır (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="SatisYazici", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Kuyruktaki tüm satışları yazar ve iş parçacığını durdurur"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._kuyruk.put(_DUR)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, satirlar, odeme_turu, musteri_id=None):
+        """Satışı yazma kuyruğuna bırakır ve satış numarasını döndürür.
+
+        Kuyruk doluysa beklemek yerine queue.Full yükseltir; böylece kasa
+        donmaz ve sepet kaybolmaz. Veresiye satışta `musteri_id` verilir.
+        """
+        self.start()
+        satirlar = [SatisSatiri(s.urun_id, s.adet, s.fiyat) for s in satirlar]
+        satis_no = next(self._sayac)
+        self._kuyruk.put_nowait((satis_no, satirlar, odeme_turu, musteri_id))
+        return satis_no
+
+    def pending(self):
+        """Henüz yazılmamış satış sayısı"""
+        return self._kuyruk.qsize()
+
+    def failed_sales(self):
+        with self._kilit:
+            return sorted(self._basarisiz)
+
+    def retry_failed(self):
+        """Yazılamamış satışları yeniden kuyruğa alır"""
+        with self._kilit:
+            bekleyenler = sorted(self._basarisiz.items())
+            self._basarisiz.clear()
+        self.start()
+        for satis_no, (satirlar, odeme_turu, musteri_id) in bekleyenler:
+            self._kuyruk.put((satis_no, satirlar, odeme_turu, musteri_id))
+
+    def _run(self):
+        # Bağlantı ilk satışta açılır; sadece bu iş parçacığı kullanır
+        self._db = None
+        try:
+            while True:
+                kayit = self._kuyruk.get()
+                if kayit is _DUR:
+                    break
+                self._write(*kayit)
+        finally:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _write(self, satis_no, satirlar, odeme_turu, musteri_id):
+        for deneme in range(1, self.deneme_sayisi + 1):
+            try:
+                if self._db is None:
+                    # Bağlantı da kilide ya da diske takılabilir; satış kaybolmasın
+                    # diye açılış aynı denemelerden geçer, olmazsa sonraki satışta yeniden denenir
+                    self._db = veritabani.connect(self.db_path)
+                fis_id = satis_kayit.fis_kaydet(self._db, satirlar, odeme_turu, self.kasa_no, musteri_id)
+            except Exception as e:
+                # Veritabanı dışı hatalar (ör. bozuk satır verisi) da iş parçacığını
+                # bitirmesin; satış yazılamayanlara alınır, sıradakiler yazılmaya devam eder
+                hata = str(e)
+                # Sadece kilitli/meşgul veritabanı beklemeyle düzelebilir
+                if not veritabani.kilit_hatasi_mi(e) or deneme == self.deneme_sayisi:
+                    break
+                self.yeniden_deneniyor.emit(satis_no, deneme, hata)
+                time.sleep(self.bekleme * (2 ** (deneme - 1)))
+            else:
+                self.kaydedildi.emit(satis_no, fis_id)
+                return
+
+        with self._kilit:
+            self._basarisiz[satis_no] = (satirlar, odeme_turu, musteri_id)
+        self.kaydedilemedi.emit(satis_no, hata)
@@ -0,0 +1,584 @@
+import argparse
+import sys
+
+import satis_kayit
+import satis_ozetleri
+import urunler
+import veresiye
+import veritabani
+
+
+def _calistir(cursor, *ifadeler):
+    for ifade in ifadeler:
+        cursor.execute(ifade)
+
+
+def _kolonlar(cursor, tablo):
+    cursor.execute(f"PRAGMA table_info({tablo})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _tablo_var_mi(cursor, tablo):
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (tablo,))
+    return cursor.fetchone()[0] > 0
+
+
+def _temel_tablolar(cursor):
+    # Boş bir veritabanı da eski sürümlerden gelen bir veritabanı da
+    # sonraki göçlerin beklediği tablolarla başlasın
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS urunler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_adi TEXT NOT NULL,
+            fiyat REAL NOT NULL,
+            birim_fiyat TEXT,
+            marka TEXT,
+            barkod TEXT UNIQUE
+        )
+    """)
+    kolonlar = _kolonlar(cursor, "urunler")
+    if "stok" not in kolonlar:
+        cursor.execute("ALTER TABLE urunler ADD COLUMN stok REAL NOT NULL DEFAULT 0")
+    if "kritik_stok" not in kolonlar:
+        cursor.execute("ALTER TABLE urunler ADD COLUMN kritik_stok REAL NOT NULL DEFAULT 0")
+
+    if not _tablo_var_mi(cursor, "kritik_stoklar"):
+        _calistir(
+            cursor,
+            """
+            CREATE TABLE kritik_stoklar (
+                urun_id INTEGER PRIMARY KEY REFERENCES urunler (id)
+            )
+            """,
+            """
+            INSERT INTO kritik_stoklar (urun_id)
+            SELECT id FROM urunler WHERE kritik_stok > 0 AND stok <= kritik_stok
+            """,
+        )
+    _calistir(
+        cursor,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_ekle
+        AFTER INSERT ON urunler
+        WHEN new.kritik_stok > 0 AND new.stok <= new.kritik_stok
+        BEGIN
+            INSERT OR IGNORE INTO kritik_stoklar (urun_id) VALUES (new.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_dustu
+        AFTER UPDATE OF stok, kritik_stok ON urunler
+        WHEN new.kritik_stok > 0 AND new.stok <= new.kritik_stok
+        BEGIN
+            INSERT OR IGNORE INTO kritik_stoklar (urun_id) VALUES (new.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_cikti
+        AFTER UPDATE OF stok, kritik_stok ON urunler
+        WHEN NOT (new.kritik_stok > 0 AND new.stok <= new.kritik_stok)
+        BEGIN
+            DELETE FROM kritik_stoklar WHERE urun_id = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            DELETE FROM kritik_stoklar WHERE urun_id = old.id;
+        END
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS satislar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_id INTEGER,
+            adet INTEGER,
+            fiyat REAL,
+            toplam_fiyat REAL,
+            odeme_turu TEXT,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (urun_id) REFERENCES urunler (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS fisler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            odeme_turu TEXT NOT NULL,
+            toplam_tutar REAL NOT NULL,
+            satir_sayisi INTEGER NOT NULL,
+            kasa_no INTEGER NOT NULL DEFAULT 1,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    )
+    if "kasa_no" not in _kolonlar(cursor, "fisler"):
+        cursor.execute("ALTER TABLE fisler ADD COLUMN kasa_no INTEGER NOT NULL DEFAULT 1")
+    if "fis_id" not in _kolonlar(cursor, "satislar"):
+        cursor.execute("ALTER TABLE satislar ADD COLUMN fis_id INTEGER REFERENCES fisler (id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_fis_id ON satislar (fis_id)")
+
+    _calistir(
+        cursor,
+        """
+        CREATE TABLE IF NOT EXISTS musteriler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_adi TEXT NOT NULL,
+            telefon TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS borclar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_id INTEGER,
+            urun_id INTEGER,
+            alis_fiyati REAL NOT NULL,
+            odendi INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (musteri_id) REFERENCES musteriler (id),
+            FOREIGN KEY (urun_id) REFERENCES urunler (id)
+        )
+        """,
+    )
+    # Eski borç kayıtları birim başına bir satırdır (adet 1)
+    kolonlar = _kolonlar(cursor, "borclar")
+    if "adet" not in kolonlar:
+        cursor.execute("ALTER TABLE borclar ADD COLUMN adet REAL NOT NULL DEFAULT 1")
+    if "fis_id" not in kolonlar:
+        cursor.execute("ALTER TABLE borclar ADD COLUMN fis_id INTEGER REFERENCES fisler (id)")
+    _calistir(
+        cursor,
+        "CREATE INDEX IF NOT EXISTS idx_borclar_musteri_id ON borclar (musteri_id)",
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_ad ON musteriler (musteri_adi COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_telefon ON musteriler (telefon)",
+    )
+
+
+def _ikincil_indeksler(cursor):
+    # Tarih aralığı raporları, ürünün satışları ve müşteri defteri indeksten okunur
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_tarih ON satislar (tarih)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_urun_id ON satislar (urun_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borclar_musteri_id ON borclar (musteri_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borclar_urun_id ON borclar (urun_id)")
+
+
+def _barkod_tekil_mi(cursor):
+    cursor.execute("PRAGMA index_list(urunler)")
+    for _, ad, tekil, _, _ in cursor.fetchall():
+        if tekil:
+            kolonlar = [row[2] for row in cursor.execute(f"PRAGMA index_info('{ad}')").fetchall()]
+            if kolonlar == ["barkod"]:
+                return True
+    return False
+
+
+def _tekil_barkod(cursor):
+    """Çakışan barkodları ayıklar ve barkoda UNIQUE kısıt ekler.
+
+    Aynı barkodu taşıyan ürünlerden en yüksek id'li olan (kasanın zaten
+    bulduğu kayıt) barkodunu korur; diğerlerinin barkodu NULL yapılır ve
+    ne olduğu barkod_cakismalari tablosuna yazılır. Satış ve borç
+    satırları ürün id'sini gösterdiği için geçmiş bozulmaz.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS barkod_cakismalari (
+            urun_id INTEGER PRIMARY KEY REFERENCES urunler (id),
+            barkod TEXT NOT NULL,
+            korunan_urun_id INTEGER REFERENCES urunler (id),
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Boş barkod ürünün barkodu olmadığı anlamına gelir
+    cursor.execute("UPDATE urunler SET barkod = NULL WHERE TRIM(barkod) = ''")
+    cursor.execute("""
+        INSERT OR REPLACE INTO barkod_cakismalari (urun_id, barkod, korunan_urun_id)
+        SELECT u.id, u.barkod, k.korunan
+        FROM urunler u
+        JOIN (
+            SELECT barkod, MAX(id) AS korunan FROM urunler
+            WHERE barkod IS NOT NULL
+            GROUP BY barkod HAVING COUNT(*) > 1
+        ) k ON k.barkod = u.barkod
+        WHERE u.id <> k.korunan
+    """)
+    cursor.execute("""
+        UPDATE urunler SET barkod = NULL
+        WHERE id IN (SELECT urun_id FROM barkod_cakismalari)
+          AND barkod IN (SELECT barkod FROM barkod_cakismalari)
+    """)
+    if not _barkod_tekil_mi(cursor):
+        cursor.execute("CREATE UNIQUE INDEX idx_urunler_barkod_tekil ON urunler (barkod)")
+    # Tekil indeks aramaları da karşılar; eski tekil olmayan indeks gereksiz
+    cursor.execute("DROP INDEX IF EXISTS idx_urunler_barkod")
+
+
+def _degisiklik_olaylari(cursor):
+    # Ürün güncelleme tetikleyicisi fiyat değişikliğini ayrı işlemle yazacak şekilde yeniden kurulur
+    _calistir(
+        cursor,
+        "DROP TRIGGER IF EXISTS urunler_degisiklik_guncelle",
+        """
+        CREATE TABLE IF NOT EXISTS degisiklikler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tablo TEXT NOT NULL,
+            kayit_id INTEGER NOT NULL,
+            islem TEXT NOT NULL,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_ekle
+        AFTER INSERT ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('urunler', new.id, 'INSERT');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_guncelle
+        AFTER UPDATE OF barkod, urun_adi, fiyat ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem)
+            VALUES ('urunler', new.id, CASE WHEN old.fiyat IS NOT new.fiyat THEN 'FIYAT' ELSE 'UPDATE' END);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('urunler', old.id, 'DELETE');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS fisler_degisiklik_ekle
+        AFTER INSERT ON fisler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('fisler', new.id, 'INSERT');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS borclar_degisiklik_ekle
+        AFTER INSERT ON borclar
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('borclar', new.id, 'INSERT');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS borclar_degisiklik_odendi
+        AFTER UPDATE OF odendi ON borclar
+        WHEN new.odendi = 1 AND old.odendi IS NOT 1
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('borclar', new.id, 'ODENDI');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS musteriler_degisiklik_ekle
+        AFTER INSERT ON musteriler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('musteriler', new.id, 'INSERT');
+        END
+        """,
+    )
+
+
+# Göç 5'in özet tabloları -> satırın düştüğü dönem ifadesi ({s} satır takma adı)
+_OZET_DONEMLERI = {
+    "satis_ozet_gunluk": "COALESCE(date({s}.tarih), '')",
+    "satis_ozet_saatlik": "COALESCE(strftime('%Y-%m-%d %H:00', {s}.tarih), '')",
+}
+
+
+def _satis_ozetleri(cursor):
+    # Özetler mevcut satış geçmişinden bir kez hesaplanır, sonrasını tetikleyiciler sürdürür
+    for tablo, donem in _OZET_DONEMLERI.items():
+        ekle = f"""
+            INSERT INTO {tablo} (donem, odeme_turu, ciro, adet, satir_sayisi)
+            VALUES ({donem.format(s="new")}, COALESCE(new.odeme_turu, ''),
+                    COALESCE(new.toplam_fiyat, 0), COALESCE(new.adet, 0), 1)
+            ON CONFLICT (donem, odeme_turu) DO UPDATE SET
+                ciro = ciro + excluded.ciro,
+                adet = adet + excluded.adet,
+                satir_sayisi = satir_sayisi + 1;"""
+        kosul = f"donem = {donem.format(s='old')} AND odeme_turu = COALESCE(old.odeme_turu, '')"
+        cikar = f"""
+            UPDATE {tablo} SET
+                ciro = ciro - COALESCE(old.toplam_fiyat, 0),
+                adet = adet - COALESCE(old.adet, 0),
+                satir_sayisi = satir_sayisi - 1
+            WHERE {kosul};
+            DELETE FROM {tablo} WHERE {kosul} AND satir_sayisi <= 0;"""
+        _calistir(
+            cursor,
+            f"""
+            CREATE TABLE IF NOT EXISTS {tablo} (
+                donem TEXT NOT NULL,
+                odeme_turu TEXT NOT NULL,
+                ciro REAL NOT NULL DEFAULT 0,
+                adet REAL NOT NULL DEFAULT 0,
+                satir_sayisi INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (donem, odeme_turu)
+            ) WITHOUT ROWID
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_ekle
+            AFTER INSERT ON satislar
+            BEGIN{ekle}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_sil
+            AFTER DELETE ON satislar
+            BEGIN{cikar}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS satislar_{tablo}_guncelle
+            AFTER UPDATE OF tarih, odeme_turu, toplam_fiyat, adet ON satislar
+            BEGIN{cikar}{ekle}
+            END
+            """,
+            f"DELETE FROM {tablo}",
+            f"""
+            INSERT INTO {tablo} (donem, odeme_turu, ciro, adet, satir_sayisi)
+            SELECT {donem.format(s="s")}, COALESCE(s.odeme_turu, ''),
+                   TOTAL(s.toplam_fiyat), TOTAL(s.adet), COUNT(*)
+            FROM satislar s
+            GROUP BY 1, 2
+            """,
+        )
+
+
+def _fiyat_gecmisi(cursor):
+    # Borç defteri borç günündeki fiyatı okur; tablo sadece Ürün Yönetimi açılınca kurulmasın
+    if not _tablo_var_mi(cursor, "fiyat_gecmisi"):
+        cursor.execute("""
+            CREATE TABLE fiyat_gecmisi (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                urun_id INTEGER NOT NULL REFERENCES urunler (id),
+                fiyat REAL NOT NULL,
+                baslangic TEXT NOT NULL,
+                bitis TEXT
+            )
+        """)
+        # Geçmiş bilinmiyor; bugünkü fiyat ürünün eklendiği andan beri geçerli sayılır
+        eklenme = "tarih" if "tarih" in _kolonlar(cursor, "urunler") else "NULL"
+        cursor.execute(f"""
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            SELECT id, fiyat, COALESCE({eklenme}, '0001-01-01 00:00:00') FROM urunler
+            WHERE fiyat IS NOT NULL
+        """)
+    _calistir(
+        cursor,
+        """
+        CREATE INDEX IF NOT EXISTS idx_fiyat_gecmisi_urun_baslangic
+        ON fiyat_gecmisi (urun_id, baslangic)
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_ekle
+        AFTER INSERT ON urunler
+        WHEN new.fiyat IS NOT NULL
+        BEGIN
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            VALUES (new.id, new.fiyat, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_degisti
+        AFTER UPDATE OF fiyat ON urunler
+        WHEN old.fiyat IS NOT new.fiyat
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            WHERE urun_id = new.id AND bitis IS NULL;
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            VALUES (new.id, new.fiyat, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS urunler_fiyat_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            WHERE urun_id = old.id AND bitis IS NULL;
+        END
+        """,
+    )
+
+
+def _stok_indeksi(cursor):
+    # Ürün tablosunda stoğa göre sıralama da sayfa sayfa indeksten okunsun
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urunler_stok ON urunler (stok, id)")
+
+
+def _fiyat_gecmisi_saniye(cursor):
+    # Borç tarihleri saniyelik olduğundan fiyat aralıkları da saniyeye indirilir;
+    # aynı saniyedeki fiyat değişikliği ile veresiye satış yanlış aralığa düşmesin
+    _calistir(
+        cursor,
+        "DROP TRIGGER IF EXISTS urunler_fiyat_ekle",
+        "DROP TRIGGER IF EXISTS urunler_fiyat_degisti",
+        "DROP TRIGGER IF EXISTS urunler_fiyat_sil",
+        """
+        UPDATE fiyat_gecmisi
+        SET baslangic = substr(baslangic, 1, 19), bitis = substr(bitis, 1, 19)
+        WHERE length(baslangic) > 19 OR length(bitis) > 19
+        """,
+        """
+        CREATE TRIGGER urunler_fiyat_ekle
+        AFTER INSERT ON urunler
+        WHEN new.fiyat IS NOT NULL
+        BEGIN
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            VALUES (new.id, new.fiyat, CURRENT_TIMESTAMP);
+        END
+        """,
+        """
+        CREATE TRIGGER urunler_fiyat_degisti
+        AFTER UPDATE OF fiyat ON urunler
+        WHEN old.fiyat IS NOT new.fiyat
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = CURRENT_TIMESTAMP
+            WHERE urun_id = new.id AND bitis IS NULL;
+            INSERT INTO fiyat_gecmisi (urun_id, fiyat, baslangic)
+            VALUES (new.id, new.fiyat, CURRENT_TIMESTAMP);
+        END
+        """,
+        """
+        CREATE TRIGGER urunler_fiyat_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            UPDATE fiyat_gecmisi SET bitis = CURRENT_TIMESTAMP
+            WHERE urun_id = old.id AND bitis IS NULL;
+        END
+        """,
+    )
+
+
+# (sürüm, açıklama, göç). Sıra değişmez, yayınlanmış bir göç düzenlenmez;
+# yeni değişiklik listenin sonuna yeni sürümle eklenir. Her göç tekrar
+# çalıştırılsa da aynı sonucu verir. Göçler modüllerin ensure_schema
+# fonksiyonlarını çağırmaz, kendi sabit SQL'lerini çalıştırır; böylece bir
+# modül sonradan değişse de yayınlanmış göçün yaptığı değişmez.
+GOCLER = [
+    (1, "Temel tablolar", _temel_tablolar),
+    (2, "Satış, borç ve müşteri indeksleri", _ikincil_indeksler),
+    (3, "Tekil barkod", _tekil_barkod),
+    (4, "Fiş, borç ve müşteri değişiklik olayları", _degisiklik_olaylari),
+    (5, "Günlük ve saatlik satış özetleri", _satis_ozetleri),
+    (6, "Fiyat geçmişi", _fiyat_gecmisi),
+    (7, "Ürün stok indeksi", _stok_indeksi),
+    (8, "Saniyelik fiyat geçmişi", _fiyat_gecmisi_saniye),
+]
+
+SON_SURUM = GOCLER[-1][0]
+
+
+def surum(db):
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def uygula(db):
+    """Veritabanını `PRAGMA user_version`'dan sonraki göçlerle son sürüme getirir.
+
+    Her göç sürüm numarasıyla birlikte kendi işleminde yazılır; yarıda
+    kalan göç hiç uygulanmamış sayılır. Aynı anda açılan kasalar göçü
+    yazma kilidi altında yeniden kontrol ettiği için iki kez uygulamaz.
+    Uygulanan göçlerin sürümlerini döndürür.
+    """
+    uygulanan = []
+    if surum(db) >= SON_SURUM:
+        return uygulanan
+    cursor = db.cursor()
+    for numara, _, goc in GOCLER:
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if surum(db) < numara:
+                goc(cursor)
+                cursor.execute(f"PRAGMA user_version = {numara}")
+                uygulanan.append(numara)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return uygulanan
+
+
+# Sık çalışan sorgular: (ad, sorguyu çalıştıran fonksiyon, taranmasına izin verilen tablolar).
+# Sorgular elle kopyalanmaz; fonksiyon çalıştırılırken SQL'i yakalanır.
+SICAK_SORGULAR = [
+    ("Barkodla ürün", lambda c: urunler.urun_getir(c, "8690000000000"), ()),
+    ("Etiket bilgisi", lambda c: urunler.etiket_bilgisi(c, "8690000000000"), ()),
+    ("Tarih aralığı satışları",
+     lambda c: satis_kayit.satis_sayfasi(c, "2025-01-01", "2025-01-02"), ()),
+    ("Tarih aralığı satışları (sonraki sayfa)",
+     lambda c: satis_kayit.satis_sayfasi(c, "2025-01-01", "2025-01-02", (1, "", "2025-01-01 12:00:00")), ()),
+    ("Müşteri borçları", lambda c: veresiye.musteri_borclari(c, 1), ()),
+    ("Müşteri ödeme özeti", lambda c: veresiye.odeme_ozeti(c, 1), ()),
+    ("Müşteri arama", lambda c: veresiye.musteri_ara(c, "ah"), ()),
+    ("Ürün tablosu (stok sırası)",
+     lambda c: urunler.tablo_sayfasi(c, "stok", True, False, (5, 100), 200), ()),
+    ("Satış özeti", lambda c: satis_ozetleri.aralik_ozeti(c, "2025-01-01", "2025-02-01"), ()),
+    # Tüm müşteriler listelenir; borçlar yine indeksten toplanır
+    ("Müşteri listesi", lambda c: veresiye.musteri_ozetleri(c), ("m",)),
+]
+
+
+def _tarama_mi(satir, izinli):
+    # "SCAN tablo" indekssiz tam taramadır; "SCAN x USING ... INDEX" sıralı indeks okumasıdır
+    detay = satir[3]
+    if not detay.startswith("SCAN ") or " USING " in detay or "VIRTUAL TABLE" in detay:
+        return False
+    tablo = detay.split()[1]
+    return tablo not in izinli and not tablo.startswith("(")
+
+
+def plan_denetimi(db):
+    """Her sık sorgunun planını kontrol eder, indekssiz tarananların (ad, plan) listesini döndürür"""
+    hatalar = []
+    for ad, calistir, izinli in SICAK_SORGULAR:
+        sorgular = []
+        db.set_trace_callback(sorgular.append)
+        try:
+            calistir(db.cursor())
+        finally:
+            db.set_trace_callback(None)
+        for sorgu in sorgular:
+            plan = db.execute("EXPLAIN QUERY PLAN " + sorgu).fetchall()
+            if any(_tarama_mi(satir, izinli) for satir in plan):
+                hatalar.append((ad, [satir[3] for satir in plan]))
+    return hatalar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Şema göçlerini uygular ve sık sorguların planlarını denetler")
+    parser.add_argument("--db", default=veritabani.DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument("--sadece-denetle", action="store_true", help="Göç uygulamadan sadece planları denetle")
+    args = parser.parse_args()
+
+    db = veritabani.connect(args.db)
+    if not args.sadece_denetle:
+        for numara in uygula(db):
+            print(f"Göç {numara} uygulandı")
+    print(f"Şema sürümü: {surum(db)}")
+
+    cakismalar = []
+    if surum(db) >= 3:
+        cakismalar = db.execute("""
+            SELECT urun_id, barkod, korunan_urun_id FROM barkod_cakismalari ORDER BY barkod
+        """).fetchall()
+    if cakismalar:
+        print(f"{len(cakismalar)} ürünün barkodu başka bir ürünle çakıştığı için kaldırıldı:")
+        for urun_id, barkod, korunan in cakismalar:
+            print(f"  ürün {urun_id}: {barkod} (barkodu koruyan ürün {korunan})")
+
+    hatalar = plan_denetimi(db)
+    for ad, plan in hatalar:
+        print(f"İNDEKS KULLANILMIYOR: {ad}")
+        for satir in plan:
+            print(f"    {satir}")
+    db.close()
+    if hatalar:
+        sys.exit(1)
+    print("Tüm sık sorgular indeks kullanıyor.")
+
+
+if __name__ == "__main__":
+    main()
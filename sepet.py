@@ -0,0 +1,142 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+def adet_metni(adet):
+    """Tam adetleri olduğu gibi, tartılı miktarları en çok 3 ondalıkla yazar"""
+    if float(adet).is_integer():
+        return str(int(adet))
+    return f"{adet:.3f}".rstrip("0").rstrip(".")
+
+
+class SepetSatiri:
+    """Sepetteki tek bir ürün satırı"""
+    __slots__ = ("barkod", "urun_id", "urun_adi", "fiyat", "adet", "row")
+
+    def __init__(self, barkod, urun_id, urun_adi, fiyat, adet, row):
+        self.barkod = barkod
+        self.urun_id = urun_id
+        self.urun_adi = urun_adi
+        self.fiyat = fiyat
+        self.adet = adet
+        self.row = row  # Son bilinen satır numarası (bkz. SepetModeli._row_of)
+
+    @property
+    def toplam(self):
+        return self.adet * self.fiyat
+
+
+class SepetModeli(QAbstractTableModel):
+    """POS sepeti: sıralı satırlar, barkod -> satır eşlemesi ve anlık toplam.
+
+    Ekleme ve adet güncelleme sabit zamanlıdır; silme satırı doğrudan
+    indeksinden bulur, kayan satır numaraları ise ancak ihtiyaç olduğunda
+    toplu olarak yeniden hesaplanır. Değişikliklerde sadece etkilenen
+    satırlar yeniden çizilir.
+    """
+
+    BASLIKLAR = ["ÜRÜN ADI", "BİRİM", "ADET", "TOPLAM"]
+    KOLON_ADET = 2
+    KOLON_TOPLAM = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._satirlar = []
+        self._barkodlar = {}
+        # Bu indeksten önceki satırların `row` değeri kesin doğrudur
+        self._gecerli_sira = 0
+        self.toplam = 0.0
+
+    # --- Qt model arayüzü ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.BASLIKLAR)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.BASLIKLAR[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        satir = self._satirlar[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return satir.urun_adi
+            if col == 1:
+                return f"{satir.fiyat:.2f}"
+            if col == 2:
+                return adet_metni(satir.adet)
+            return f"{satir.toplam:.2f}"
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            # Sayıları sağa yasla
+            if col == 2:
+                return Qt.AlignmentFlag.AlignCenter
+            if col != 0:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.UserRole:
+            return satir.barkod
+        return None
+
+    # --- Sepet işlemleri ---
+
+    def add_product(self, urun, adet=1):
+        """Ürünü sepete ekler (varsa adedini artırır), satır numarasını döndürür"""
+        satir = self._barkodlar.get(urun.barkod)
+        if satir is not None:
+            row = self._row_of(satir)
+            satir.adet += adet
+            self.dataChanged.emit(self.index(row, self.KOLON_ADET), self.index(row, self.KOLON_TOPLAM))
+        else:
+            row = len(self._satirlar)
+            self.beginInsertRows(QModelIndex(), row, row)
+            satir = SepetSatiri(urun.barkod, urun.urun_id, urun.urun_adi, urun.fiyat, adet, row)
+            self._satirlar.append(satir)
+            self._barkodlar[urun.barkod] = satir
+            if self._gecerli_sira == row:
+                self._gecerli_sira += 1
+            self.endInsertRows()
+
+        self.toplam += urun.fiyat * adet
+        return row
+
+    def remove_row(self, row):
+        """Verilen satırı sepetten çıkarır ve çıkarılan satırı döndürür"""
+        if not 0 <= row < len(self._satirlar):
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        satir = self._satirlar.pop(row)
+        del self._barkodlar[satir.barkod]
+        self._gecerli_sira = min(self._gecerli_sira, row)
+        self.endRemoveRows()
+
+        self.toplam -= satir.toplam
+        if not self._satirlar:
+            # Kayan nokta artıklarını temizle
+            self.toplam = 0.0
+        return satir
+
+    def clear(self):
+        self.beginResetModel()
+        self._satirlar.clear()
+        self._barkodlar.clear()
+        self._gecerli_sira = 0
+        self.toplam = 0.0
+        self.endResetModel()
+
+    def lines(self):
+        """Sepet satırlarını ekleniş sırasıyla döndürür"""
+        return list(self._satirlar)
+
+    def _row_of(self, satir):
+        if satir.row >= self._gecerli_sira:
+            # Silmeden sonra kayan satırları tek geçişte yeniden numaralandır
+            for i in range(self._gecerli_sira, len(self._satirlar)):
+                self._satirlar[i].row = i
+            self._gecerli_sira = len(self._satirlar)
+        return satir.row
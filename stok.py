@@ -0,0 +1,79 @@
+def ensure_schema(cursor):
+    """Stok kolonlarını, kritik stok listesini ve onu güncel tutan tetikleyicileri oluşturur"""
+    cursor.execute("PRAGMA table_info(urunler)")
+    kolonlar = [row[1] for row in cursor.fetchall()]
+    if "stok" not in kolonlar:
+        cursor.execute("ALTER TABLE urunler ADD COLUMN stok REAL NOT NULL DEFAULT 0")
+    if "kritik_stok" not in kolonlar:
+        cursor.execute("ALTER TABLE urunler ADD COLUMN kritik_stok REAL NOT NULL DEFAULT 0")
+
+    # Sadece kritik seviyedeki ürünlerin id'leri; liste tam katalog taranmadan okunur
+    cursor.execute("""
+        SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'kritik_stoklar'
+    """)
+    yeni_tablo = cursor.fetchone()[0] == 0
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS kritik_stoklar (
+            urun_id INTEGER PRIMARY KEY REFERENCES urunler (id)
+        )
+    """)
+    if yeni_tablo:
+        cursor.execute("""
+            INSERT INTO kritik_stoklar (urun_id)
+            SELECT id FROM urunler WHERE kritik_stok > 0 AND stok <= kritik_stok
+        """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_ekle
+        AFTER INSERT ON urunler
+        WHEN new.kritik_stok > 0 AND new.stok <= new.kritik_stok
+        BEGIN
+            INSERT OR IGNORE INTO kritik_stoklar (urun_id) VALUES (new.id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_dustu
+        AFTER UPDATE OF stok, kritik_stok ON urunler
+        WHEN new.kritik_stok > 0 AND new.stok <= new.kritik_stok
+        BEGIN
+            INSERT OR IGNORE INTO kritik_stoklar (urun_id) VALUES (new.id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_cikti
+        AFTER UPDATE OF stok, kritik_stok ON urunler
+        WHEN NOT (new.kritik_stok > 0 AND new.stok <= new.kritik_stok)
+        BEGIN
+            DELETE FROM kritik_stoklar WHERE urun_id = new.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_kritik_stok_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            DELETE FROM kritik_stoklar WHERE urun_id = old.id;
+        END
+    """)
+
+
+def stok_dus(cursor, fis_id):
+    """Fişteki ürünlerin stoklarını tek bir UPDATE ile düşer (açık işlemin içinde çağrılır)"""
+    cursor.execute("""
+        UPDATE urunler
+        SET stok = stok - (
+            SELECT SUM(s.adet) FROM satislar s
+            WHERE s.fis_id = ? AND s.urun_id = urunler.id
+        )
+        WHERE id IN (SELECT urun_id FROM satislar WHERE fis_id = ?)
+    """, (fis_id, fis_id))
+
+
+def kritik_stoklar(cursor):
+    """Kritik seviyedeki ürünleri (barkod, ad, stok, kritik seviye) en acil olandan başlayarak döndürür"""
+    cursor.execute("""
+        SELECT u.barkod, u.urun_adi, u.stok, u.kritik_stok
+        FROM kritik_stoklar k
+        JOIN urunler u ON u.id = k.urun_id
+        ORDER BY u.stok - u.kritik_stok, u.urun_adi
+    """)
+    return cursor.fetchall()
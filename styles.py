@@ -132,7 +132,7 @@ class Styles:
     }}
 
     /* Tables */
-    QTableWidget {{
+    QTableView {{
         background-color: {COLOR_SURFACE};
         gridline-color: {COLOR_SECONDARY};
         border: none;
@@ -141,12 +141,12 @@ class Styles:
         font-size: 16px;
     }}
     
-    QTableWidget::item {{
+    QTableView::item {{
         padding: 10px;
         border-bottom: 1px solid {COLOR_SECONDARY};
     }}
     
-    QTableWidget::item:selected {{
+    QTableView::item:selected {{
         background-color: {COLOR_HIGHLIGHT};
         color: {COLOR_TEXT};
     }}
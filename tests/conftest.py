@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Modüller depo kökünde düz duruyor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def db_yolu(tmp_path):
+    """Her test için boş bir veritabanı dosyası yolu"""
+    return str(tmp_path / "market.db")
+
+
+@pytest.fixture
+def db(db_yolu):
+    """Göçleri uygulanmış, bu iş parçacığının ortak bağlantısı"""
+    import veritabani
+    return veritabani.baglanti(db_yolu)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
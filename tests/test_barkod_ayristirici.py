@@ -0,0 +1,59 @@
+import pytest
+
+from barkod_ayristirici import GecersizBarkod, ayristir, gecerli_mi, kontrol_hanesi
+
+
+@pytest.mark.parametrize("kod", [
+    "4006381333931",   # EAN-13
+    "96385074",        # EAN-8
+    "036000291452",    # UPC-A
+    "10012345678902",  # GTIN-14
+])
+def test_gecerli_gtin_kodlari(kod):
+    assert kontrol_hanesi(kod[:-1]) == kod[-1]
+    assert gecerli_mi(kod)
+
+
+def test_hatali_kontrol_hanesi_reddedilir():
+    assert not gecerli_mi("4006381333932")
+    with pytest.raises(GecersizBarkod):
+        ayristir("4006381333932")
+
+
+@pytest.mark.parametrize("kod", ["ABC123", "12345", "  "])
+def test_gtin_olmayan_ic_kodlar_oldugu_gibi_doner(kod):
+    assert gecerli_mi(kod)
+    assert ayristir(kod).tur == "standart"
+
+
+def _etiket(onek, urun, deger):
+    govde = f"{onek}{urun}{deger:05d}"
+    return govde + kontrol_hanesi(govde)
+
+
+@pytest.mark.parametrize("onek", ["24", "25", "26"])
+def test_fiyat_gomulu_etiket(onek):
+    okunan = ayristir(_etiket(onek, "12345", 1249))
+    assert okunan.tur == "fiyat"
+    assert okunan.deger == pytest.approx(12.49)
+    govde = f"{onek}1234500000"
+    assert okunan.barkod == govde + kontrol_hanesi(govde)
+
+
+@pytest.mark.parametrize("onek", ["27", "28", "29"])
+def test_agirlik_gomulu_etiket(onek):
+    okunan = ayristir(_etiket(onek, "00042", 1375))
+    assert okunan.tur == "agirlik"
+    assert okunan.deger == pytest.approx(1.375)
+    assert okunan.barkod.startswith(f"{onek}00042")
+    assert gecerli_mi(okunan.barkod)
+
+
+def test_ayni_urunun_farkli_etiketleri_ayni_koda_cozulur():
+    assert ayristir(_etiket("27", "00042", 500)).barkod == ayristir(_etiket("27", "00042", 2500)).barkod
+
+
+def test_20_23_onekleri_standart_kalir():
+    okunan = ayristir(_etiket("23", "12345", 1249))
+    assert okunan.tur == "standart"
+    assert okunan.deger is None
@@ -0,0 +1,86 @@
+import pytest
+
+import degisiklik_yayini
+import satis_kayit
+import urunler
+from satis_yazici import SatisSatiri
+
+
+@pytest.fixture
+def yayin(qapp, db, db_yolu):
+    yayin = degisiklik_yayini.DegisiklikYayini(db_yolu)
+    yayin.timer.stop()
+    yayin.budama_timer.stop()
+    sinyaller = {}
+    for ad in ("urun_degisti", "fiyat_degisti", "fis_eklendi", "borc_degisti", "musteri_eklendi"):
+        sinyaller[ad] = []
+        getattr(yayin, ad).connect(sinyaller[ad].append)
+    yayin.sinyaller = sinyaller
+    return yayin
+
+
+def test_yeni_veritabaninda_acilir(qapp, db_yolu):
+    yayin = degisiklik_yayini.DegisiklikYayini(db_yolu)
+    yayin.timer.stop()
+    assert yayin.son_id == 0
+
+
+def _gunluk(db, *satirlar):
+    db.executemany("""
+        INSERT INTO degisiklikler (tablo, kayit_id, islem, tarih)
+        VALUES ('urunler', ?, 'UPDATE', datetime('now', ?))
+    """, satirlar)
+    db.commit()
+
+
+def test_eski_satirlar_budanir(db):
+    _gunluk(db, (1, "-10 days"), (2, "-8 days"), (3, "-1 days"), (4, "-0 days"))
+    assert degisiklik_yayini.eski_degisiklikleri_sil(db) == 2
+    kalan = [d.kayit_id for d in degisiklik_yayini.degisiklikler_sonra(db.cursor(), 0)]
+    assert kalan == [3, 4]
+
+
+def test_okunmamis_satirlar_budanmaz(db):
+    _gunluk(db, (1, "-10 days"), (2, "-9 days"))
+    son = db.execute("SELECT MIN(id) FROM degisiklikler").fetchone()[0]
+    assert degisiklik_yayini.eski_degisiklikleri_sil(db, en_son_id=son) == 1
+    # Silinen id'ler yeniden verilmez
+    _gunluk(db, (3, "-0 days"))
+    idler = [d.id for d in degisiklik_yayini.degisiklikler_sonra(db.cursor(), 0)]
+    assert idler == [son + 1, son + 2]
+
+
+def test_kontrol_et_olaylari_turlerine_gore_toplar(yayin, db):
+    cursor = db.cursor()
+    urunler.urun_kaydet(cursor, "8690000000005", "Süt", 20.0, "A", 10, 0)
+    urunler.urun_kaydet(cursor, "8690000000012", "Ekmek", 7.5, "A", 10, 0)
+    cursor.execute("INSERT INTO musteriler (musteri_adi) VALUES ('Ayşe')")
+    musteri_id = cursor.lastrowid
+    db.commit()
+    sut = urunler.urun_kimligi(cursor, "8690000000005")[0]
+    ekmek = urunler.urun_kimligi(cursor, "8690000000012")[0]
+
+    # Aynı ürün bir yoklamada birkaç kez değişse de bir kez bildirilir
+    cursor.execute("UPDATE urunler SET fiyat = 22 WHERE id = ?", (sut,))
+    cursor.execute("UPDATE urunler SET urun_adi = 'Tam Süt' WHERE id = ?", (sut,))
+    cursor.execute("UPDATE urunler SET urun_adi = 'Köy Ekmeği' WHERE id = ?", (ekmek,))
+    # Sadece stok değişikliği günlüğe düşmez
+    cursor.execute("UPDATE urunler SET stok = 3 WHERE id = ?", (ekmek,))
+    db.commit()
+    fis_id = satis_kayit.fis_kaydet(db, [SatisSatiri(sut, 1, 22.0)], "Veresiye", musteri_id=musteri_id)
+    borc_id = cursor.execute("SELECT id FROM borclar").fetchone()[0]
+    cursor.execute("UPDATE borclar SET odendi = 1 WHERE id = ?", (borc_id,))
+    db.commit()
+
+    # 2 ürün + müşteri + 3 ürün güncellemesi + fiş + borç + ödeme
+    assert yayin.kontrol_et() == 9
+    s = yayin.sinyaller
+    assert s["urun_degisti"] == [[sut, ekmek]]
+    assert s["fiyat_degisti"] == [[sut]]
+    assert s["fis_eklendi"] == [[fis_id]]
+    assert s["borc_degisti"] == [[borc_id]]
+    assert s["musteri_eklendi"] == [[musteri_id]]
+
+    # Yeni değişiklik yoksa sinyal de yok
+    assert yayin.kontrol_et() == 0
+    assert s["fis_eklendi"] == [[fis_id]]
@@ -0,0 +1,30 @@
+import pytest
+
+import katalog_aktarim
+
+BASLIK = "Barkod;Ürün Adı;Marka;Fiyat\n"
+# Geçerli kontrol haneli barkodlar
+SATIRLAR = "8690000000005;Şeker 1 kg;Öz;42,50\n8690000000012;Çay 500 g;Ağa;89,90\n"
+
+
+def _dosya(tmp_path, icerik, kodlama):
+    yol = tmp_path / "liste.csv"
+    yol.write_bytes(icerik.encode(kodlama))
+    return str(yol)
+
+
+@pytest.mark.parametrize("kodlama", ["utf-8-sig", "utf-8", "cp1254"])
+def test_turkce_kodlamalar_okunur(db, tmp_path, kodlama):
+    sonuc = katalog_aktarim.aktar(db, _dosya(tmp_path, BASLIK + SATIRLAR, kodlama))
+    assert (sonuc.eklenen, sonuc.reddedilen) == (2, 0)
+    adlar = [row[0] for row in db.execute("SELECT urun_adi FROM urunler ORDER BY barkod")]
+    assert adlar == ["Şeker 1 kg", "Çay 500 g"]
+
+
+def test_tanimsiz_kodlama_hicbir_sey_yazmadan_reddedilir(db, tmp_path):
+    yol = tmp_path / "liste.csv"
+    # 0x81 ne geçerli UTF-8 ne de cp1254'te tanımlı
+    yol.write_bytes((BASLIK + SATIRLAR).encode("utf-8") + b"8690000000029;Bozuk \x81;X;1\n")
+    with pytest.raises(katalog_aktarim.AktarimHatasi):
+        katalog_aktarim.aktar(db, str(yol))
+    assert db.execute("SELECT COUNT(*) FROM urunler").fetchone()[0] == 0
@@ -0,0 +1,55 @@
+import satis_kayit
+import urunler
+
+
+def _satislar(db, adet=57):
+    cursor = db.cursor()
+    urunler.urun_kaydet(cursor, "8690000000005", "Süt", 20.0, "A", 1000, 0)
+    urun_id = urunler.urun_kimligi(cursor, "8690000000005")[0]
+    # Aynı saniyeye birden fazla satış düşsün ki sıralama id ile ayrılsın
+    satis_kayit.fissiz_satislar_yaz(cursor, [
+        (urun_id, 1, 20.0, 20.0, "Nakit", f"2025-01-{1 + i // 20:02d} 10:00:{i % 4:02d}")
+        for i in range(adet)
+    ])
+    db.commit()
+
+
+def _tum_sayfalar(cursor, baslangic, bitis, limit):
+    sayfalar, son = [], None
+    while True:
+        sayfa = satis_kayit.satis_sayfasi(cursor, baslangic, bitis, son, limit)
+        if not sayfa:
+            return sayfalar
+        sayfalar.append(sayfa)
+        son = sayfa[-1]
+
+
+def test_sayfalar_tek_sorguyla_ayni_sirayi_verir(db):
+    _satislar(db)
+    cursor = db.cursor()
+    sayfalar = _tum_sayfalar(cursor, "2025-01-01", "2025-12-31", 10)
+    assert [len(s) for s in sayfalar] == [10, 10, 10, 10, 10, 7]
+    satirlar = [satir for sayfa in sayfalar for satir in sayfa]
+    assert satirlar == satis_kayit.satis_sayfasi(cursor, "2025-01-01", "2025-12-31", limit=1000)
+    anahtarlar = [(satir[2], satir[0]) for satir in satirlar]
+    assert anahtarlar == sorted(anahtarlar, reverse=True)
+    assert len({satir[0] for satir in satirlar}) == 57
+
+
+def test_aralik_disindaki_satislar_gelmez(db):
+    _satislar(db)
+    satirlar = [s for sayfa in _tum_sayfalar(db.cursor(), "2025-01-02", "2025-01-02 23:59:59", 7) for s in sayfa]
+    assert len(satirlar) == 20
+    assert {s[1][:10] for s in satirlar} == {"02.01.2025"}
+
+
+def test_fis_satislari_tarih_ve_id_sirasiyla_doner(db):
+    _satislar(db, adet=5)
+    db.execute("UPDATE satislar SET fis_id = id")
+    db.commit()
+    cursor = db.cursor()
+    # Tekrarlanan fiş bir kez okunur; 1 ve 5 aynı saniyededir
+    satirlar = satis_kayit.fis_satislari(cursor, [5, 1, 3, 3, 2], "2025-01-01", "2025-12-31")
+    assert [s[0] for s in satirlar] == [3, 2, 5, 1]
+    urun_id = cursor.execute("SELECT id FROM urunler").fetchone()[0]
+    assert satis_kayit.fis_urunleri(cursor, [1, 2, 3, 4, 5]) == [urun_id]
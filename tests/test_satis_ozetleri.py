@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+import satis_kayit
+import satis_ozetleri
+
+
+def _ozetler(db):
+    return {
+        tablo: db.execute(f"SELECT * FROM {tablo} ORDER BY donem, odeme_turu").fetchall()
+        for tablo in satis_ozetleri.OZETLER
+    }
+
+
+@pytest.fixture
+def satislar(db):
+    rng = random.Random(7)
+    satirlar = []
+    for _ in range(300):
+        adet = rng.randint(1, 4)
+        fiyat = rng.choice([7.5, 20.0, 89.95])
+        tarih = f"2025-01-{rng.randint(1, 5):02d} {rng.randint(8, 21):02d}:{rng.randint(0, 59):02d}:00"
+        satirlar.append((1, adet, fiyat, adet * fiyat, rng.choice(["Nakit", "Kart"]), tarih))
+    satis_kayit.fissiz_satislar_yaz(db.cursor(), satirlar)
+    db.commit()
+    return db
+
+
+def test_tetikleyiciler_eklemeyi_ozetler(satislar):
+    assert satis_ozetleri.farklar(satislar.cursor()) == []
+    assert satis_ozetleri.satir_sayisi(satislar.cursor()) == 300
+
+
+def test_guncelleme_ve_silme_sonrasi_ozetler_tutarli(satislar):
+    db = satislar
+    db.execute("UPDATE satislar SET odeme_turu = 'Veresiye' WHERE id % 5 = 0")
+    db.execute("UPDATE satislar SET tarih = datetime(tarih, '+3 hours') WHERE id % 7 = 0")
+    db.execute("UPDATE satislar SET adet = adet + 1, toplam_fiyat = toplam_fiyat + fiyat WHERE id % 11 = 0")
+    db.execute("DELETE FROM satislar WHERE id % 3 = 0")
+    db.commit()
+    assert satis_ozetleri.farklar(db.cursor()) == []
+
+    # Tetikleyicilerin sürdürdüğü özet, baştan hesaplananla aynı
+    once = _ozetler(db)
+    satis_ozetleri.yeniden_olustur(db)
+    sonra = _ozetler(db)
+    for tablo in once:
+        assert [r[:2] + r[4:] for r in once[tablo]] == [r[:2] + r[4:] for r in sonra[tablo]]
+        for a, b in zip(once[tablo], sonra[tablo]):
+            assert a[2:4] == pytest.approx(b[2:4])
+
+
+def test_tum_satislar_silinince_ozet_bosalir(satislar):
+    satislar.execute("DELETE FROM satislar")
+    satislar.commit()
+    assert _ozetler(satislar) == {tablo: [] for tablo in satis_ozetleri.OZETLER}
+
+
+def test_bozulan_ozet_denetimde_gorunur_ve_onarilir(satislar):
+    satislar.execute("UPDATE satis_ozet_gunluk SET ciro = ciro + 1 WHERE donem = '2025-01-02'")
+    satislar.commit()
+    assert {donem for _, donem, _ in satis_ozetleri.farklar(satislar.cursor())} == {"2025-01-02"}
+    satis_ozetleri.yeniden_olustur(satislar)
+    assert satis_ozetleri.farklar(satislar.cursor()) == []
+
+
+def test_aralik_ozeti_ham_satislarla_ayni(satislar):
+    ozet = {tur: (ciro, sayi) for tur, ciro, sayi in
+            satis_ozetleri.aralik_ozeti(satislar.cursor(), "2025-01-02", "2025-01-04")}
+    ham = {tur: (ciro, sayi) for tur, ciro, sayi in satislar.execute("""
+        SELECT odeme_turu, SUM(toplam_fiyat), COUNT(*) FROM satislar
+        WHERE tarih >= '2025-01-02' AND tarih < '2025-01-04' GROUP BY odeme_turu
+    """)}
+    assert ozet.keys() == ham.keys()
+    for tur in ham:
+        assert ozet[tur] == pytest.approx(ham[tur])
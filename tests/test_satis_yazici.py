@@ -0,0 +1,37 @@
+import satis_kayit
+import urunler
+from satis_yazici import SatisSatiri, SatisYazici
+
+
+def _urun(db):
+    cursor = db.cursor()
+    urunler.urun_kaydet(cursor, "8690000000001", "Süt", 20.0, "Marka", 10, 0)
+    db.commit()
+    return urunler.urun_kimligi(cursor, "8690000000001")[0]
+
+
+def test_baglanti_acilamazsa_satis_kaybolmaz(qapp, db, db_yolu, tmp_path):
+    urun_id = _urun(db)
+    yazici = SatisYazici(db_path=str(tmp_path / "yok" / "market.db"), bekleme=0)
+    birinci = yazici.submit([SatisSatiri(urun_id, 1, 20.0)], "Nakit")
+    ikinci = yazici.submit([SatisSatiri(urun_id, 2, 20.0)], "Nakit")
+    yazici.stop()
+    assert yazici.failed_sales() == [birinci, ikinci]
+
+    # Veritabanı ulaşılır olunca bekleyen satışlar yazılır
+    yazici.db_path = db_yolu
+    yazici.retry_failed()
+    yazici.stop()
+    assert yazici.failed_sales() == []
+    assert db.execute("SELECT COUNT(*) FROM fisler").fetchone()[0] == 2
+
+
+def test_bozuk_satir_sonrakileri_durdurmaz(qapp, db, db_yolu):
+    urun_id = _urun(db)
+    yazici = SatisYazici(db_path=db_yolu, bekleme=0)
+    bozuk = yazici.submit([SatisSatiri(urun_id, "iki", 20.0)], "Nakit")
+    yazici.submit([SatisSatiri(urun_id, 1, 20.0)], "Nakit")
+    yazici.stop()
+    assert yazici.failed_sales() == [bozuk]
+    fis_id = db.execute("SELECT MAX(id) FROM fisler").fetchone()[0]
+    assert satis_kayit.fis_urunleri(db.cursor(), [fis_id]) == [urun_id]
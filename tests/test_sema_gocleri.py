@@ -0,0 +1,71 @@
+import sqlite3
+
+import sema_gocleri
+import veritabani
+
+
+def _sema(db):
+    return sorted(db.execute("SELECT type, name, sql FROM sqlite_master"))
+
+
+def test_bos_veritabani_son_surume_gelir(db):
+    assert sema_gocleri.surum(db) == sema_gocleri.SON_SURUM
+    assert sema_gocleri.plan_denetimi(db) == []
+
+
+def test_goc_tekrar_uygulanmaz(db):
+    once = _sema(db)
+    assert sema_gocleri.uygula(db) == []
+    assert _sema(db) == once
+
+
+def test_her_goc_tekrar_calistirilsa_da_ayni_sonucu_verir(db):
+    once = _sema(db)
+    cursor = db.cursor()
+    for _, _, goc in sema_gocleri.GOCLER:
+        goc(cursor)
+    db.commit()
+    assert _sema(db) == once
+
+
+def _eski_veritabani(yol):
+    # Barkodu tekil olmayan, stok kolonları olmayan eski sürüm
+    eski = sqlite3.connect(yol)
+    eski.executescript("""
+        CREATE TABLE urunler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_adi TEXT NOT NULL,
+            fiyat REAL NOT NULL,
+            marka TEXT,
+            barkod TEXT
+        );
+        INSERT INTO urunler (urun_adi, fiyat, barkod) VALUES
+            ('Süt eski', 18, '8690000000005'),
+            ('Ekmek', 7.5, '8690000000012'),
+            ('Süt', 20, '8690000000005'),
+            ('Barkodsuz', 5, '  ');
+        CREATE TABLE satislar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_id INTEGER, adet INTEGER, fiyat REAL, toplam_fiyat REAL,
+            odeme_turu TEXT, tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO satislar (urun_id, adet, fiyat, toplam_fiyat, odeme_turu, tarih)
+        VALUES (1, 2, 18, 36, 'Nakit', '2025-01-01 10:00:00');
+    """)
+    eski.close()
+
+
+def test_yinelenen_barkodlarda_en_yeni_urun_barkodu_korur(db_yolu):
+    _eski_veritabani(db_yolu)
+    db = veritabani.baglanti(db_yolu)
+    assert sema_gocleri.surum(db) == sema_gocleri.SON_SURUM
+
+    barkodlar = dict(db.execute("SELECT id, barkod FROM urunler"))
+    assert barkodlar == {1: None, 2: "8690000000012", 3: "8690000000005", 4: None}
+    assert db.execute("SELECT urun_id, barkod, korunan_urun_id FROM barkod_cakismalari").fetchall() == [
+        (1, "8690000000005", 3)]
+    assert sema_gocleri._barkod_tekil_mi(db.cursor())
+
+    # Eski satış özetlere ve stok kolonları ürünlere eklenmiş olmalı
+    assert db.execute("SELECT ciro, satir_sayisi FROM satis_ozet_gunluk").fetchall() == [(36.0, 1)]
+    assert db.execute("SELECT stok, kritik_stok FROM urunler WHERE id = 2").fetchone() == (0, 0)
@@ -0,0 +1,63 @@
+import pytest
+
+from sepet import SepetModeli, adet_metni
+from urun_indeksi import Urun
+
+SUT = Urun("8690000000005", 1, "Süt", 20.0)
+EKMEK = Urun("8690000000012", 2, "Ekmek", 7.5)
+PEYNIR = Urun("2700042000000", 3, "Peynir", 240.0)
+
+
+def test_ayni_urun_satiri_buyutur_ve_toplami_tutar(qapp):
+    sepet = SepetModeli()
+    assert sepet.add_product(SUT) == 0
+    assert sepet.add_product(EKMEK, 2) == 1
+    assert sepet.add_product(SUT) == 0
+    assert sepet.rowCount() == 2
+    assert [s.adet for s in sepet.lines()] == [2, 2]
+    assert sepet.toplam == pytest.approx(55.0)
+
+
+def test_tartili_urun_tutari(qapp):
+    sepet = SepetModeli()
+    sepet.add_product(PEYNIR, 0.375)
+    assert sepet.toplam == pytest.approx(90.0)
+    assert sepet.data(sepet.index(0, SepetModeli.KOLON_ADET)) == "0.375"
+    assert sepet.data(sepet.index(0, SepetModeli.KOLON_TOPLAM)) == "90.00"
+
+
+def test_silmeden_sonra_satirlar_yeniden_numaralanir(qapp):
+    sepet = SepetModeli()
+    for urun in (SUT, EKMEK, PEYNIR):
+        sepet.add_product(urun)
+    silinen = sepet.remove_row(0)
+    assert silinen.urun_id == SUT.urun_id
+    assert sepet.toplam == pytest.approx(247.5)
+    # Kalan satırlar kaymış numaralarıyla bulunur
+    assert sepet.add_product(PEYNIR) == 1
+    assert sepet.add_product(EKMEK) == 0
+    assert [s.row for s in sepet.lines()] == [0, 1]
+    assert sepet.data(sepet.index(1, 0)) == "Peynir"
+
+
+def test_son_satir_silinince_toplam_sifirlanir(qapp):
+    sepet = SepetModeli()
+    sepet.add_product(Urun("1", 9, "X", 0.1), 3)
+    sepet.remove_row(0)
+    assert sepet.toplam == 0.0
+    assert sepet.remove_row(5) is None
+
+
+def test_temizle(qapp):
+    sepet = SepetModeli()
+    sepet.add_product(SUT)
+    sepet.clear()
+    assert sepet.rowCount() == 0
+    assert sepet.toplam == 0.0
+    # Temizlenen ürün yeni satır olarak eklenir
+    assert sepet.add_product(SUT) == 0
+
+
+@pytest.mark.parametrize("adet, metin", [(3, "3"), (2.0, "2"), (0.5, "0.5"), (1.2346, "1.235")])
+def test_adet_metni(adet, metin):
+    assert adet_metni(adet) == metin
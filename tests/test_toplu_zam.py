@@ -0,0 +1,58 @@
+import pytest
+
+import toplu_zam
+import urunler
+
+
+@pytest.fixture
+def katalog(db):
+    cursor = db.cursor()
+    toplu_zam.ensure_schema(cursor)
+    for barkod, ad, fiyat, marka in [
+        ("1", "Süt", 20.00, "A"),
+        ("2", "Ekmek", 7.50, "A"),
+        ("3", "Çay", 89.95, "B"),
+    ]:
+        urunler.urun_kaydet(cursor, barkod, ad, fiyat, marka, 10, 0)
+    db.commit()
+    return db
+
+
+def _fiyatlar(db):
+    return dict(db.execute("SELECT barkod, fiyat FROM urunler"))
+
+
+@pytest.mark.parametrize("yuvarlama, beklenen", [
+    ("kurus", {"1": 22.0, "2": 8.25, "3": 98.95}),
+    ("90", {"1": 22.9, "2": 8.9, "3": 99.9}),   # 98.95, .90 geçildi
+    ("99", {"1": 22.99, "2": 8.99, "3": 98.99}),
+    ("tam", {"1": 22.0, "2": 9.0, "3": 99.0}),
+])
+def test_yuzde_zam_ve_yuvarlama(katalog, yuvarlama, beklenen):
+    onizleme = toplu_zam.onizle(katalog.cursor(), toplu_zam.tum_urunler(), True, 10, yuvarlama)
+    parti_id, sayi = toplu_zam.uygula(katalog, toplu_zam.tum_urunler(), True, 10, yuvarlama)
+    assert sayi == onizleme.urun_sayisi == 3
+    assert _fiyatlar(katalog) == pytest.approx(beklenen)
+    assert onizleme.yeni_toplam == pytest.approx(sum(beklenen.values()))
+
+
+def test_marka_kapsami_sadece_o_markayi_degistirir(katalog):
+    toplu_zam.uygula(katalog, toplu_zam.markaya_gore("B"), False, 5, "kurus")
+    assert _fiyatlar(katalog) == pytest.approx({"1": 20.0, "2": 7.5, "3": 94.95})
+
+
+def test_geri_al_eski_fiyatlari_dondurur(katalog):
+    once = _fiyatlar(katalog)
+    parti_id, _ = toplu_zam.uygula(katalog, toplu_zam.tum_urunler(), True, 25, "kurus")
+    assert toplu_zam.son_parti(katalog.cursor())[0] == parti_id
+    assert toplu_zam.geri_al(katalog, parti_id) == (3, 0)
+    assert _fiyatlar(katalog) == once
+    assert toplu_zam.son_parti(katalog.cursor()) is None
+
+
+def test_geri_al_zamdan_sonra_elle_degisen_fiyati_ezmez(katalog):
+    parti_id, _ = toplu_zam.uygula(katalog, toplu_zam.tum_urunler(), True, 10, "kurus")
+    katalog.execute("UPDATE urunler SET fiyat = 30 WHERE barkod = '1'")
+    katalog.commit()
+    assert toplu_zam.geri_al(katalog, parti_id) == (2, 1)
+    assert _fiyatlar(katalog) == pytest.approx({"1": 30.0, "2": 7.5, "3": 89.95})
@@ -0,0 +1,37 @@
+import satis_kayit
+import urunler
+import veresiye
+from satis_yazici import SatisSatiri
+
+
+def _musteri_ve_urun(db, fiyat=10.0):
+    cursor = db.cursor()
+    urunler.urun_kaydet(cursor, "8690000000001", "Süt", fiyat, "Marka", 10, 0)
+    cursor.execute("INSERT INTO musteriler (musteri_adi) VALUES ('Ayşe')")
+    db.commit()
+    return cursor.lastrowid, urunler.urun_kimligi(cursor, "8690000000001")[0]
+
+
+def test_ayni_saniyedeki_zamdan_sonraki_borc_yeni_fiyati_gorur(db):
+    musteri_id, urun_id = _musteri_ve_urun(db)
+    db.execute("UPDATE urunler SET fiyat = 12 WHERE id = ?", (urun_id,))
+    db.commit()
+    satis_kayit.fis_kaydet(db, [SatisSatiri(urun_id, 1, 12.0)], "Veresiye", musteri_id=musteri_id)
+
+    (borc,) = veresiye.musteri_borclari(db.cursor(), musteri_id)
+    assert borc[7] == 12.0   # o günkü fiyat
+    assert borc[8] == 12.0   # bugünkü fiyatlarla tutar
+
+
+def test_sonraki_zam_borcun_guncel_tutarina_yansir(db):
+    musteri_id, urun_id = _musteri_ve_urun(db)
+    satis_kayit.fis_kaydet(db, [SatisSatiri(urun_id, 2, 10.0)], "Veresiye", musteri_id=musteri_id)
+    # Borç bir gün önce yazılmış gibi; zam ondan sonra gelir
+    db.execute("UPDATE borclar SET created_at = datetime(created_at, '-1 day')")
+    db.execute("UPDATE fiyat_gecmisi SET baslangic = datetime(baslangic, '-2 days')")
+    db.execute("UPDATE urunler SET fiyat = 15 WHERE id = ?", (urun_id,))
+    db.commit()
+
+    (borc,) = veresiye.musteri_borclari(db.cursor(), musteri_id)
+    assert borc[7] == 10.0
+    assert borc[8] == 30.0
@@ -0,0 +1,43 @@
+import threading
+
+import veritabani
+
+
+def _zaman_asimiyla(hedef, sure=20):
+    hata = []
+
+    def calistir():
+        try:
+            hedef()
+        except Exception as e:
+            hata.append(e)
+
+    t = threading.Thread(target=calistir, daemon=True)
+    t.start()
+    t.join(sure)
+    assert not t.is_alive(), "kilitlendi"
+    if hata:
+        raise hata[0]
+
+
+def test_sema_hazirla_ilk_acilista_kilitlenmez(db_yolu):
+    cagrilar = []
+    _zaman_asimiyla(lambda: veritabani.sema_hazirla(cagrilar.append, db_yolu))
+    assert len(cagrilar) == 1
+
+
+def test_sema_hazirla_bir_kez_calisir(db_yolu):
+    cagrilar = []
+
+    def kurulum(cursor):
+        cagrilar.append(cursor)
+
+    veritabani.sema_hazirla(kurulum, db_yolu)
+    veritabani.sema_hazirla(kurulum, db_yolu)
+    assert len(cagrilar) == 1
+
+
+def test_parcalar_tekrarlari_atar_ve_boler():
+    parcalar = list(veritabani.parcalar([1, 2, 2, 3, 4, 5, 1], boyut=2))
+    assert parcalar == [[1, 2], [3, 4], [5]]
+    assert veritabani.yer_tutucular([7, 8, 9]) == "?,?,?"
@@ -0,0 +1,178 @@
+from collections import namedtuple
+
+import urun_arama
+
+# Zamlı fiyatın yuvarlanma biçimleri: görünen ad -> kuralın anahtarı
+YUVARLAMALAR = {
+    "Kuruşa": "kurus",
+    "Yukarı .90": "90",
+    "Yukarı .99": "99",
+    "Yukarı tam TL": "tam",
+}
+
+# kosul: urunler üzerinde WHERE ifadesi, aciklama: partiye yazılan kapsam
+Kapsam = namedtuple("Kapsam", ["kosul", "parametreler", "aciklama"])
+
+Onizleme = namedtuple("Onizleme", ["urun_sayisi", "eski_toplam", "yeni_toplam", "ornekler"])
+
+
+def ensure_schema(cursor):
+    """Zam partilerini ve her partinin ürün bazında eski/yeni fiyatlarını tutan tabloları oluşturur"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS zam_partileri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kapsam TEXT NOT NULL,
+            yuzde_mi INTEGER NOT NULL,
+            miktar REAL NOT NULL,
+            yuvarlama TEXT NOT NULL,
+            urun_sayisi INTEGER NOT NULL DEFAULT 0,
+            geri_alindi INTEGER NOT NULL DEFAULT 0,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS zam_degisiklikleri (
+            parti_id INTEGER NOT NULL REFERENCES zam_partileri (id),
+            urun_id INTEGER NOT NULL REFERENCES urunler (id),
+            eski_fiyat REAL NOT NULL,
+            yeni_fiyat REAL NOT NULL,
+            PRIMARY KEY (parti_id, urun_id)
+        ) WITHOUT ROWID
+    """)
+
+
+def tum_urunler():
+    return Kapsam("1", (), "Tüm ürünler")
+
+
+def markaya_gore(marka):
+    return Kapsam("marka = ?", (marka,), f"Marka: {marka}")
+
+
+def aramaya_gore(metin):
+    """Arama kutusundaki metinle eşleşen tüm ürünler (tam metin indeksinden)"""
+    return Kapsam(
+        "id IN (SELECT rowid FROM urun_ara WHERE urun_ara MATCH ?)",
+        (urun_arama.eslesme_ifadesi(metin),),
+        f"Arama: {metin}",
+    )
+
+
+def yeni_fiyat_ifadesi(yuzde_mi, yuvarlama):
+    """Zamlı fiyatı hesaplayan SQL ifadesi; içindeki her parametre zam miktarıdır"""
+    # Kayan nokta artıklarını yuvarlama kuralından önce kuruşta kes
+    ham = "ROUND(fiyat * (1 + ? / 100.0), 2)" if yuzde_mi else "ROUND(fiyat + ?, 2)"
+    if yuvarlama == "kurus":
+        return ham
+    if yuvarlama == "tam":
+        # Zaten tam ise olduğu gibi, değilse bir üst TL
+        return f"(CASE WHEN {ham} = CAST({ham} AS INTEGER) THEN {ham} ELSE CAST({ham} AS INTEGER) + 1 END)"
+    kusur = {"90": "0.90", "99": "0.99"}[yuvarlama]
+    # Aynı TL içindeki .90/.99'a, geçildiyse bir sonraki TL'nin .90/.99'una
+    return (f"ROUND(CASE WHEN {ham} <= CAST({ham} AS INTEGER) + {kusur} "
+            f"THEN CAST({ham} AS INTEGER) + {kusur} "
+            f"ELSE CAST({ham} AS INTEGER) + 1 + {kusur} END, 2)")
+
+
+def _ifade_parametreleri(ifade, miktar):
+    # Ham ifade yuvarlama kuralında birkaç kez geçer, her biri aynı miktarı alır
+    return (miktar,) * ifade.count("?")
+
+
+def _secim(kapsam):
+    # Fiyatı girilmemiş ürüne zam yapılamaz; önizleme ve uygulama aynı ürünleri seçer
+    return f"fiyat IS NOT NULL AND ({kapsam.kosul})"
+
+
+def onizle(cursor, kapsam, yuzde_mi, miktar, yuvarlama, ornek_sayisi=10):
+    """Zammı uygulamadan etkilenecek ürün sayısını, toplamları ve örnek satırları döndürür"""
+    ifade = yeni_fiyat_ifadesi(yuzde_mi, yuvarlama)
+    parametreler = _ifade_parametreleri(ifade, miktar)
+    cursor.execute(f"""
+        SELECT COUNT(*), COALESCE(SUM(fiyat), 0), COALESCE(SUM({ifade}), 0)
+        FROM urunler WHERE {_secim(kapsam)}
+    """, parametreler + tuple(kapsam.parametreler))
+    urun_sayisi, eski_toplam, yeni_toplam = cursor.fetchone()
+    cursor.execute(f"""
+        SELECT barkod, urun_adi, fiyat, {ifade}
+        FROM urunler WHERE {_secim(kapsam)}
+        ORDER BY id LIMIT ?
+    """, parametreler + tuple(kapsam.parametreler) + (ornek_sayisi,))
+    return Onizleme(urun_sayisi, eski_toplam, yeni_toplam, cursor.fetchall())
+
+
+def uygula(db, kapsam, yuzde_mi, miktar, yuvarlama):
+    """Zammı tek işlemde uygular, (parti_id, ürün sayısı) döndürür.
+
+    Önce partinin eski/yeni fiyatları tek bir INSERT ... SELECT ile
+    kaydedilir, ardından urunler bu kayıttan tek bir UPDATE ile güncellenir.
+    """
+    ifade = yeni_fiyat_ifadesi(yuzde_mi, yuvarlama)
+    cursor = db.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("""
+            INSERT INTO zam_partileri (kapsam, yuzde_mi, miktar, yuvarlama)
+            VALUES (?, ?, ?, ?)
+        """, (kapsam.aciklama, int(yuzde_mi), miktar, yuvarlama))
+        parti_id = cursor.lastrowid
+        cursor.execute(f"""
+            INSERT INTO zam_degisiklikleri (parti_id, urun_id, eski_fiyat, yeni_fiyat)
+            SELECT ?, id, fiyat, {ifade} FROM urunler WHERE {_secim(kapsam)}
+        """, (parti_id,) + _ifade_parametreleri(ifade, miktar) + tuple(kapsam.parametreler))
+        urun_sayisi = cursor.rowcount
+        cursor.execute("""
+            UPDATE urunler
+            SET fiyat = (
+                SELECT z.yeni_fiyat FROM zam_degisiklikleri z
+                WHERE z.parti_id = ? AND z.urun_id = urunler.id
+            )
+            WHERE id IN (SELECT urun_id FROM zam_degisiklikleri WHERE parti_id = ?)
+        """, (parti_id, parti_id))
+        cursor.execute("UPDATE zam_partileri SET urun_sayisi = ? WHERE id = ?", (urun_sayisi, parti_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return parti_id, urun_sayisi
+
+
+def son_parti(cursor):
+    """Geri alınmamış en son zam partisini (id, kapsam, miktar, yüzde mi, ürün sayısı, tarih) döndürür"""
+    cursor.execute("""
+        SELECT id, kapsam, miktar, yuzde_mi, urun_sayisi, tarih
+        FROM zam_partileri WHERE geri_alindi = 0
+        ORDER BY id DESC LIMIT 1
+    """)
+    return cursor.fetchone()
+
+
+def geri_al(db, parti_id):
+    """Partideki fiyatları tek bir UPDATE ile eski haline döndürür, (geri alınan, atlanan) döndürür.
+
+    Zamdan sonra elle değiştirilmiş fiyatlar ezilmez, atlanır.
+    """
+    cursor = db.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("""
+            UPDATE urunler
+            SET fiyat = (
+                SELECT z.eski_fiyat FROM zam_degisiklikleri z
+                WHERE z.parti_id = ? AND z.urun_id = urunler.id
+            )
+            WHERE id IN (SELECT urun_id FROM zam_degisiklikleri WHERE parti_id = ?)
+              AND fiyat = (
+                SELECT z.yeni_fiyat FROM zam_degisiklikleri z
+                WHERE z.parti_id = ? AND z.urun_id = urunler.id
+            )
+        """, (parti_id, parti_id, parti_id))
+        geri_alinan = cursor.rowcount
+        cursor.execute("UPDATE zam_partileri SET geri_alindi = 1 WHERE id = ?", (parti_id,))
+        cursor.execute("SELECT urun_sayisi FROM zam_partileri WHERE id = ?", (parti_id,))
+        urun_sayisi = cursor.fetchone()[0]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return geri_alinan, urun_sayisi - geri_alinan
@@ -0,0 +1,93 @@
+import re
+
+# Ad, marka ve barkod üzerinde tam metin indeksi. unicode61 büyük/küçük harfi
+# Unicode'a göre katlar ve aksanları atar (Ç->c, Ş->s, Ğ->g, Ö->o, Ü->u,
+# İ->i); geriye kalan Türkçe farkı noktasız ı'dır, o da metin indekse
+# girmeden ve sorguda i'ye çevrilir. Böylece "ILIK", "ılık" ve "ilik" aynı
+# kelimeye düşer.
+_KATLA_SQL = "replace({kolon}, 'ı', 'i')"
+
+VARSAYILAN_LIMIT = 200
+
+
+def tr_katla(metin):
+    """Sorgu metnini indeksteki biçime getirir"""
+    return metin.replace("ı", "i")
+
+
+def _katla(kolon):
+    return _KATLA_SQL.format(kolon=kolon)
+
+
+def ensure_schema(cursor):
+    """Arama indeksini ve onu urunler ile eş tutan tetikleyicileri oluşturur"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'urun_ara'
+    """)
+    yeni_tablo = cursor.fetchone()[0] == 0
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS urun_ara
+        USING fts5(urun_adi, marka, barkod, tokenize = 'unicode61 remove_diacritics 2')
+    """)
+    if yeni_tablo:
+        cursor.execute(f"""
+            INSERT INTO urun_ara (rowid, urun_adi, marka, barkod)
+            SELECT id, {_katla('urun_adi')}, {_katla('marka')}, barkod FROM urunler
+        """)
+
+    # Tetikleyiciler sadece yerleşik SQL kullanır; hangi araçla yazılırsa yazılsın çalışır
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS urunler_arama_ekle
+        AFTER INSERT ON urunler
+        BEGIN
+            INSERT INTO urun_ara (rowid, urun_adi, marka, barkod)
+            VALUES (new.id, {_katla('new.urun_adi')}, {_katla('new.marka')}, new.barkod);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS urunler_arama_guncelle
+        AFTER UPDATE OF urun_adi, marka, barkod ON urunler
+        BEGIN
+            UPDATE urun_ara
+            SET urun_adi = {_katla('new.urun_adi')}, marka = {_katla('new.marka')}, barkod = new.barkod
+            WHERE rowid = new.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_arama_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            DELETE FROM urun_ara WHERE rowid = old.id;
+        END
+    """)
+
+
+def eslesme_ifadesi(metin):
+    """Kullanıcı metnini FTS5 sorgusuna çevirir: her kelime önek olarak, hepsi birlikte"""
+    kelimeler = re.findall(r"\w+", tr_katla(metin))
+    return " ".join(f'"{kelime}"*' for kelime in kelimeler)
+
+
+def ara(cursor, metin, limit=VARSAYILAN_LIMIT, sira_kolonu=None, azalan=False):
+    """Metne en uygun ürünleri (id, barkod, ad, marka, fiyat, stok, kritik stok) döndürür.
+
+    Sonuçlar ada ağırlık veren bm25 sırasıyla gelir; sadece ilk `limit`
+    kayıt okunur. `sira_kolonu` (urunler kolonu) verilirse bu ilk sonuçlar
+    o kolona göre sıralanır.
+    """
+    ifade = eslesme_ifadesi(metin)
+    if not ifade:
+        return []
+    sorgu = """
+        SELECT u.id, u.barkod, u.urun_adi, u.marka, u.fiyat, u.stok, u.kritik_stok
+        FROM urun_ara
+        JOIN urunler u ON u.id = urun_ara.rowid
+        WHERE urun_ara MATCH ?
+        ORDER BY bm25(urun_ara, 10.0, 3.0, 1.0)
+        LIMIT ?
+    """
+    if sira_kolonu is not None:
+        yon = "DESC" if azalan else "ASC"
+        sorgu = f"SELECT * FROM ({sorgu}) ORDER BY {sira_kolonu} {yon}, id {yon}"
+    cursor.execute(sorgu, (ifade, limit))
+    return cursor.fetchall()
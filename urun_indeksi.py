@@ -0,0 +1,100 @@
+from collections import namedtuple
+
+import urunler
+
+# İndekste tutulan ürün kaydı
+Urun = namedtuple("Urun", ["barkod", "urun_id", "urun_adi", "fiyat"])
+
+
+def ensure_schema(cursor):
+    """Ürün değişikliklerini kaydeden günlük tablosunu ve tetikleyicileri oluşturur"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS degisiklikler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tablo TEXT NOT NULL,
+            kayit_id INTEGER NOT NULL,
+            islem TEXT NOT NULL,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_ekle
+        AFTER INSERT ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('urunler', new.id, 'INSERT');
+        END
+    """)
+    # Sadece indeksi ilgilendiren kolonlar değiştiğinde kayıt düş; fiyat
+    # değişikliği ayrı işlemle yazılır ki açık pencereler ona göre davranabilsin
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_guncelle
+        AFTER UPDATE OF barkod, urun_adi, fiyat ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem)
+            VALUES ('urunler', new.id, CASE WHEN old.fiyat IS NOT new.fiyat THEN 'FIYAT' ELSE 'UPDATE' END);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS urunler_degisiklik_sil
+        AFTER DELETE ON urunler
+        BEGIN
+            INSERT INTO degisiklikler (tablo, kayit_id, islem) VALUES ('urunler', old.id, 'DELETE');
+        END
+    """)
+
+
+class BarkodIndeksi:
+    """Barkod -> ürün eşlemesini bellekte tutar.
+
+    Katalog bir kez yüklenir; sonrasında değişiklik yayınının bildirdiği
+    ürünler `apply_changes` ile tek tek yeniden okunur. `lookup` hiçbir SQL
+    çalıştırmaz.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._barkodlar = {}      # barkod -> Urun
+        self._id_barkod = {}      # urun_id -> barkod
+
+    def __len__(self):
+        return len(self._barkodlar)
+
+    def load(self):
+        """Tüm kataloğu okuyup indeksi sıfırdan kurar"""
+        self._barkodlar.clear()
+        self._id_barkod.clear()
+        # Aynı barkoda sahip birden fazla ürün varsa en yüksek id'li kazanır
+        for urun_id, barkod, urun_adi, fiyat in urunler.indeks_kayitlari(self.db.cursor()):
+            self._put(urun_id, barkod, urun_adi, fiyat)
+
+    def lookup(self, barkod):
+        """Barkoda karşılık gelen ürünü döndürür, yoksa None"""
+        return self._barkodlar.get(barkod)
+
+    def apply_changes(self, degisen_idler):
+        """Verilen ürünleri veritabanından yeniden okuyup indekste günceller"""
+        cursor = self.db.cursor()
+        bosalan_barkodlar = set()
+        for urun_id in degisen_idler:
+            eski_barkod = self._id_barkod.pop(urun_id, None)
+            if eski_barkod is not None:
+                urun = self._barkodlar.get(eski_barkod)
+                if urun is not None and urun.urun_id == urun_id:
+                    del self._barkodlar[eski_barkod]
+                    bosalan_barkodlar.add(eski_barkod)
+
+        for urun_id, barkod, urun_adi, fiyat in urunler.indeks_kayitlari(cursor, degisen_idler):
+            self._put(urun_id, barkod, urun_adi, fiyat)
+            bosalan_barkodlar.discard(barkod)
+
+        # Silinen/barkodu değişen ürünün yerine aynı barkodlu başka ürün varsa onu geri getir
+        for barkod in bosalan_barkodlar:
+            row = urunler.barkodun_urunu(cursor, barkod)
+            if row:
+                self._put(*row)
+
+    def _put(self, urun_id, barkod, urun_adi, fiyat):
+        if not barkod:
+            return
+        self._barkodlar[barkod] = Urun(barkod, urun_id, urun_adi, fiyat)
+        self._id_barkod[urun_id] = barkod
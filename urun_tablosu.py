@@ -0,0 +1,186 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+import urun_arama
+import urunler
+from styles import Styles
+
+# Görünen kolon -> (SQL kolonu, NULL olabilir mi)
+KOLONLAR = [
+    ("Barkod", "barkod", True),
+    ("Ürün Adı", "urun_adi", False),
+    ("Marka", "marka", True),
+    ("Fiyat", "fiyat", False),
+    ("Stok", "stok", False),
+]
+
+def ensure_schema(cursor):
+    """Tabloda SQL'de sıralanan kolonların indekslerini oluşturur.
+
+    Barkod ve stok, şema göçlerindeki indeksleri kullanır.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urunler_urun_adi ON urunler (urun_adi)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urunler_marka ON urunler (marka)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urunler_fiyat ON urunler (fiyat)")
+
+
+class UrunTablosuModeli(QAbstractTableModel):
+    """Ürünleri sayfa sayfa, anahtar kümesiyle (keyset) okuyan tablo modeli.
+
+    Görünüm kaydırdıkça `fetchMore` bir sonraki sayfayı son satırın
+    (sıralama değeri, id) çiftinden devam ederek okur; OFFSET kullanılmaz,
+    bu yüzden her sayfa katalog büyüklüğünden bağımsız bir indeks aralığıdır.
+    Sıralama SQL'de yapılır. Arama metni verildiğinde tam metin indeksinden
+    en uygun ilk sonuçlar gösterilir.
+    """
+
+    SAYFA_BOYUTU = 200
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._satirlar = []
+        self._arama = ""
+        self._arama_sirali = False
+        self._sira_kolonu = 1
+        self._azalan = False
+        self._bolgeler = []
+        self._son = None
+
+    # Qt arayüzü
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(KOLONLAR)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return KOLONLAR[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        _, barkod, urun_adi, marka, fiyat, stok_miktari, kritik_stok = self._satirlar[index.row()]
+        kolon = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Barkodu kaldırılmış (çakışan/onarılan) ürünlerde boş hücre gösterilir
+            if kolon == 0:
+                return "" if barkod is None else str(barkod)
+            if kolon == 1:
+                return str(urun_adi)
+            if kolon == 2:
+                return "" if marka is None else str(marka)
+            if kolon == 3:
+                return f"{float(fiyat):.2f} TL"
+            return f"{stok_miktari:g}"
+        if role == Qt.ItemDataRole.ForegroundRole and kolon == 4:
+            if kritik_stok > 0 and stok_miktari <= kritik_stok:
+                return QColor(Styles.COLOR_ERROR)
+        if role == Qt.ItemDataRole.UserRole and kolon == 4:
+            # Kritik seviye forma taşınmak için
+            return kritik_stok
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and bool(self._bolgeler)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        yeni = []
+        while self._bolgeler and len(yeni) < self.SAYFA_BOYUTU:
+            istenen = self.SAYFA_BOYUTU - len(yeni)
+            parti = self._bolge_oku(self._bolgeler[0], istenen)
+            yeni.extend(parti)
+            if len(parti) < istenen:
+                # Bölge bitti, sıradakine (ör. NULL değerlilere) geç
+                self._bolgeler.pop(0)
+                self._son = None
+            else:
+                self._son = parti[-1]
+        if not yeni:
+            return
+        bas = len(self._satirlar)
+        self.beginInsertRows(QModelIndex(), bas, bas + len(yeni) - 1)
+        self._satirlar.extend(yeni)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sira_kolonu = column
+        self._azalan = order == Qt.SortOrder.DescendingOrder
+        self._arama_sirali = True
+        self.refresh()
+
+    # Uygulama arayüzü
+
+    def set_search(self, metin):
+        # Yeni arama sonuçları, başlığa tıklanana kadar uygunluk sırasıyla gelir
+        self._arama = metin.strip()
+        self._arama_sirali = False
+        self.refresh()
+
+    def refresh(self):
+        """Aynı arama ve sıralamayla ilk sayfadan yeniden başlar"""
+        self.beginResetModel()
+        self._satirlar = []
+        self._son = None
+        if self._arama:
+            self._bolgeler = []
+            self._satirlar = self._arama_sonuclari()
+        else:
+            self._bolgeler = self._bolge_sirasi()
+        self.endResetModel()
+        if self._bolgeler:
+            self.fetchMore()
+
+    def update_products(self, urun_idler):
+        """Yüklü satırlardan verilen ürünleri yeniden okur; silinenleri tablodan çıkarır.
+
+        Yeni eklenen ürünler sıralamadaki yerleri bilinmediği için eklenmez,
+        bir sonraki yenilemede görünür. Güncellenen satır sayısını döndürür.
+        """
+        satir_no = {satir[0]: i for i, satir in enumerate(self._satirlar)}
+        yuklu = [urun_id for urun_id in urun_idler if urun_id in satir_no]
+        if not yuklu:
+            return 0
+        guncel = {satir[0]: satir for satir in urunler.tablo_satirlari(self.db.cursor(), yuklu)}
+        for urun_id in yuklu:
+            if urun_id in guncel:
+                i = satir_no[urun_id]
+                self._satirlar[i] = guncel[urun_id]
+                self.dataChanged.emit(self.index(i, 0), self.index(i, len(KOLONLAR) - 1))
+        # Silinenler sondan başa çıkarılır ki satır numaraları kaymasın
+        for i in sorted((satir_no[u] for u in yuklu if u not in guncel), reverse=True):
+            self.beginRemoveRows(QModelIndex(), i, i)
+            del self._satirlar[i]
+            self.endRemoveRows()
+        return len(yuklu)
+
+    def product_at(self, row):
+        """Satırdaki ürünü (id, barkod, ad, marka, fiyat, stok, kritik stok) döndürür"""
+        return self._satirlar[row]
+
+    # Sorgular
+
+    def _bolge_sirasi(self):
+        # SQLite'ta NULL en küçük değerdir: artan sırada başta, azalan sırada sonda
+        _, kolon, bos_olabilir = KOLONLAR[self._sira_kolonu]
+        if not bos_olabilir:
+            return ["dolu"]
+        return ["dolu", "bos"] if self._azalan else ["bos", "dolu"]
+
+    def _bolge_oku(self, bolge, limit):
+        _, kolon, _ = KOLONLAR[self._sira_kolonu]
+        son = None
+        if self._son is not None:
+            # Satır demetinde id'den sonra kolonlar tablo sırasıyla gelir
+            son = (self._son[1 + self._sira_kolonu], self._son[0])
+        return urunler.tablo_sayfasi(self.db.cursor(), kolon, self._azalan, bolge == "bos", son, limit)
+
+    def _arama_sonuclari(self):
+        # Başlığa tıklandıysa en uygun ilk sonuçlar seçilen kolona göre sıralanır
+        sira_kolonu = KOLONLAR[self._sira_kolonu][1] if self._arama_sirali else None
+        return urun_arama.ara(self.db.cursor(), self._arama, sira_kolonu=sira_kolonu, azalan=self._azalan)
@@ -1,15 +1,28 @@
 import sys
 import sqlite3
-import shutil
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                             QComboBox, QMessageBox, QTableWidget, QTableWidgetItem,
-                            QHeaderView, QGroupBox, QRadioButton, QFileDialog)
-from PyQt6.QtCore import Qt
+                            QHeaderView, QGroupBox, QRadioButton, QFileDialog, QDialog,
+                            QTableView, QProgressDialog, QCheckBox)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QDoubleValidator
 
 from styles import Styles
+import veritabani
+import stok
+import urunler
+import urun_arama
+import urun_tablosu
+import toplu_zam
+import fiyat_gecmisi
+import yedekleme
+import katalog_denetim
+from katalog_aktarim import KatalogAktarici
+from urun_tablosu import UrunTablosuModeli
+import degisiklik_yayini
+import satis_kayit
 
 class UrunYonetimi(QMainWindow):
     def __init__(self):
@@ -80,6 +93,25 @@ class UrunYonetimi(QMainWindow):
         fiyat_layout.addWidget(fiyat_label)
         fiyat_layout.addWidget(self.fiyat_input)
         
+        # Stok ve kritik stok seviyesi
+        stok_layout = QHBoxLayout()
+        stok_label = QLabel("Stok:")
+        stok_label.setFont(QFont("Arial", 12))
+        self.stok_input = QLineEdit()
+        self.stok_input.setFont(QFont("Arial", 12))
+        self.stok_input.setFixedHeight(40)
+        self.stok_input.setValidator(QDoubleValidator(-999999.999, 999999.999, 3))
+        kritik_stok_label = QLabel("Kritik Seviye:")
+        kritik_stok_label.setFont(QFont("Arial", 12))
+        self.kritik_stok_input = QLineEdit()
+        self.kritik_stok_input.setFont(QFont("Arial", 12))
+        self.kritik_stok_input.setFixedHeight(40)
+        self.kritik_stok_input.setValidator(QDoubleValidator(0.0, 999999.999, 3))
+        stok_layout.addWidget(stok_label)
+        stok_layout.addWidget(self.stok_input)
+        stok_layout.addWidget(kritik_stok_label)
+        stok_layout.addWidget(self.kritik_stok_input)
+        
         # Butonlar
         button_layout = QHBoxLayout()
         
@@ -91,10 +123,10 @@ class UrunYonetimi(QMainWindow):
         self.temizle_button.setObjectName("NeutralButton")
         self.temizle_button.clicked.connect(self.clear_form)
         
-        # Veritabanı import/export butonları
-        self.import_button = QPushButton("Veritabanı İçe Aktar")
+        # Fiyat listesi içe aktarma, veritabanı yedeği dışa aktarma
+        self.import_button = QPushButton("Fiyat Listesi İçe Aktar")
         self.import_button.setObjectName("NeutralButton")
-        self.import_button.clicked.connect(self.import_database)
+        self.import_button.clicked.connect(self.import_catalog)
         
         self.export_button = QPushButton("Veritabanı Dışa Aktar")
         self.export_button.setObjectName("NeutralButton")
@@ -112,25 +144,41 @@ class UrunYonetimi(QMainWindow):
         self.search_input = QLineEdit()
         self.search_input.setFont(QFont("Arial", 12))
         self.search_input.setFixedHeight(40)
-        self.search_input.setPlaceholderText("Ürün adına göre ara...")
-        self.search_input.textChanged.connect(self.search_products)
+        self.search_input.setPlaceholderText("Ürün adı, marka veya barkod ara...")
+        # Her tuşta değil, yazma duraksayınca ara
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.search_products)
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         left_layout.addLayout(search_layout)
         
-        # Ürün tablosu
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Barkod", "Ürün Adı", "Marka", "Fiyat"])
+        # Ürün tablosu (satırlar kaydırdıkça sayfa sayfa okunur)
+        self.urun_modeli = UrunTablosuModeli(self.db, self)
+        self.table = QTableView()
+        self.table.setModel(self.urun_modeli)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSortIndicator(1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table.setFont(QFont("Arial", 12))
-        self.table.itemClicked.connect(self.load_product_to_form)
+        self.table.clicked.connect(self.load_product_to_form)
+        
+        # Başka pencerelerde ve kasalarda değişen ürünler ile satılan ürünlerin
+        # stoğu tabloyu baştan yüklemeden yerinde güncellenir
+        self.yayin = degisiklik_yayini.yayin()
+        self.yayin.urun_degisti.connect(self.on_products_changed)
+        self.yayin.fis_eklendi.connect(self.on_receipts_added)
         
         # Layout'ları ana layout'a ekle
         form_layout.addLayout(barkod_layout)
         form_layout.addLayout(urun_adi_layout)
         form_layout.addLayout(marka_layout)
         form_layout.addLayout(fiyat_layout)
+        form_layout.addLayout(stok_layout)
         form_layout.addLayout(button_layout)
         
         left_layout.addLayout(form_layout)
@@ -152,10 +200,12 @@ class UrunYonetimi(QMainWindow):
         
         self.tum_urunler_radio = QRadioButton("Tüm Ürünler")
         self.marka_bazli_radio = QRadioButton("Markaya Göre")
+        self.arama_bazli_radio = QRadioButton("Aramayla Eşleşenler")
         self.tum_urunler_radio.setChecked(True)
         
         zam_alan_layout.addWidget(self.tum_urunler_radio)
         zam_alan_layout.addWidget(self.marka_bazli_radio)
+        zam_alan_layout.addWidget(self.arama_bazli_radio)
         zam_alan_group.setLayout(zam_alan_layout)
         right_layout.addWidget(zam_alan_group)
         
@@ -189,11 +239,51 @@ class UrunYonetimi(QMainWindow):
         zam_miktar_layout.addWidget(self.zam_miktar_input)
         right_layout.addLayout(zam_miktar_layout)
         
-        # Zam Uygula Butonu
+        # Yuvarlama
+        yuvarlama_layout = QHBoxLayout()
+        self.yuvarlama_combo = QComboBox()
+        self.yuvarlama_combo.setFont(QFont("Arial", 12))
+        self.yuvarlama_combo.setFixedHeight(40)
+        self.yuvarlama_combo.addItems(list(toplu_zam.YUVARLAMALAR))
+        yuvarlama_layout.addWidget(QLabel("Yuvarlama:"))
+        yuvarlama_layout.addWidget(self.yuvarlama_combo)
+        right_layout.addLayout(yuvarlama_layout)
+        
+        # Önizleme ve Zam Uygula Butonları
+        zam_buton_layout = QHBoxLayout()
+        self.zam_onizle_button = QPushButton("Önizle")
+        self.zam_onizle_button.setObjectName("NeutralButton")
+        self.zam_onizle_button.clicked.connect(self.preview_price_increase)
         self.zam_button = QPushButton("Zam Uygula")
         self.zam_button.setObjectName("SuccessButton")
         self.zam_button.clicked.connect(self.apply_price_increase)
-        right_layout.addWidget(self.zam_button)
+        zam_buton_layout.addWidget(self.zam_onizle_button)
+        zam_buton_layout.addWidget(self.zam_button)
+        right_layout.addLayout(zam_buton_layout)
+        
+        # Son zammı geri al
+        self.zam_geri_al_button = QPushButton("Son Zammı Geri Al")
+        self.zam_geri_al_button.setObjectName("DeleteButton")
+        self.zam_geri_al_button.clicked.connect(self.undo_price_increase)
+        right_layout.addWidget(self.zam_geri_al_button)
+        
+        # Formdaki ürünün fiyat geçmişi
+        self.fiyat_gecmisi_button = QPushButton("Fiyat Geçmişi")
+        self.fiyat_gecmisi_button.setObjectName("NeutralButton")
+        self.fiyat_gecmisi_button.clicked.connect(self.show_price_history)
+        right_layout.addWidget(self.fiyat_gecmisi_button)
+        
+        # Kritik stok listesi
+        self.kritik_stok_button = QPushButton("Kritik Stoklar")
+        self.kritik_stok_button.setObjectName("NeutralButton")
+        self.kritik_stok_button.clicked.connect(self.show_critical_stock)
+        right_layout.addWidget(self.kritik_stok_button)
+        
+        # Katalog denetimi ve toplu onarım
+        self.denetim_button = QPushButton("Katalog Denetimi")
+        self.denetim_button.setObjectName("NeutralButton")
+        self.denetim_button.clicked.connect(self.show_catalog_audit)
+        right_layout.addWidget(self.denetim_button)
         
         # Boşluk ekle
         right_layout.addStretch()
@@ -213,48 +303,37 @@ class UrunYonetimi(QMainWindow):
         self.load_products()
 
     def connect_db(self):
-        """Veritabanı bağlantısını oluşturur"""
-        self.db = sqlite3.connect('market_urunler.db')
+        """Ortak bağlantıyı alır; tablolar süreç başına bir kez oluşturulur"""
+        self.db = veritabani.baglanti()
         self.cursor = self.db.cursor()
         
-        # Ana tabloyu oluştur
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS urunler (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                urun_adi TEXT NOT NULL,
-                fiyat REAL NOT NULL,
-                birim_fiyat TEXT,
-                marka TEXT,
-                barkod TEXT UNIQUE
-            )
-        """)
-        self.db.commit()
+        veritabani.sema_hazirla(urunler.ensure_schema)
+        veritabani.sema_hazirla(urun_arama.ensure_schema)
+        veritabani.sema_hazirla(urun_tablosu.ensure_schema)
+        veritabani.sema_hazirla(toplu_zam.ensure_schema)
+        veritabani.sema_hazirla(fiyat_gecmisi.ensure_schema)
+        veritabani.sema_hazirla(katalog_denetim.ensure_schema)
 
     def check_existing_product(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         barkod = self.barkod_input.text().strip()
         if not barkod:
             return
             
-        self.cursor.execute("SELECT * FROM urunler WHERE barkod = ?", (barkod,))
-        product = self.cursor.fetchone()
+        product = urunler.urun_getir(self.cursor, barkod)
         
         if product:
             # Ürün bulundu, formu doldur
-            self.urun_adi_input.setText(product[1])
-            self.fiyat_input.setText(str(product[2]))
-            self.marka_input.setText(product[4] if product[4] != "Belirtilmemiş" else "")
+            self.urun_adi_input.setText(product[0])
+            self.fiyat_input.setText(str(product[1]))
+            self.marka_input.setText(product[2] if product[2] != "Belirtilmemiş" else "")
+            self.stok_input.setText(f"{product[3]:g}")
+            self.kritik_stok_input.setText(f"{product[4]:g}")
             
             QMessageBox.information(self, "Bilgi", "Ürün bulundu! Bilgileri düzenleyebilirsiniz.")
         else:
             QMessageBox.information(self, "Bilgi", "Yeni ürün ekleyebilirsiniz.")
 
     def save_product(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         # Form verilerini al
         barkod = self.barkod_input.text().strip()
         urun_adi = self.urun_adi_input.text().strip()
@@ -271,27 +350,20 @@ class UrunYonetimi(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Uyarı", "Geçersiz fiyat!")
             return
-            
+        
         try:
-            # Ürün var mı kontrol et
-            self.cursor.execute("SELECT barkod FROM urunler WHERE barkod = ?", (barkod,))
-            existing_product = self.cursor.fetchone()
+            stok_miktari = float(self.stok_input.text().replace(",", ".") or 0)
+            kritik_stok = float(self.kritik_stok_input.text().replace(",", ".") or 0)
+        except ValueError:
+            QMessageBox.warning(self, "Uyarı", "Geçersiz stok miktarı!")
+            return
             
-            if existing_product:
-                # Güncelle
-                self.cursor.execute("""
-                    UPDATE urunler 
-                    SET urun_adi = ?, fiyat = ?, marka = ?
-                    WHERE barkod = ?
-                """, (urun_adi, fiyat, marka, barkod))
-                message = "Ürün başarıyla güncellendi!"
-            else:
-                # Yeni ekle
-                self.cursor.execute("""
-                    INSERT INTO urunler (barkod, urun_adi, fiyat, marka)
-                    VALUES (?, ?, ?, ?)
-                """, (barkod, urun_adi, fiyat, marka))
+        try:
+            # Varsa güncelle, yoksa ekle
+            if urunler.urun_kaydet(self.cursor, barkod, urun_adi, fiyat, marka, stok_miktari, kritik_stok):
                 message = "Ürün başarıyla eklendi!"
+            else:
+                message = "Ürün başarıyla güncellendi!"
             
             self.db.commit()
             QMessageBox.information(self, "Başarılı", message)
@@ -301,115 +373,233 @@ class UrunYonetimi(QMainWindow):
             self.load_products()
             
         except sqlite3.Error as e:
+            # Ortak bağlantıda yarım işlem diğer pencerelere taşınmasın
+            self.db.rollback()
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Beklenmeyen hata: {str(e)}")
 
     def search_products(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
-        search_text = self.search_input.text().strip().lower()
-        
         try:
-            if search_text:
-                # Arama kriterine göre ürünleri getir
-                self.cursor.execute("""
-                    SELECT barkod, urun_adi, marka, fiyat 
-                    FROM urunler 
-                    WHERE LOWER(urun_adi) LIKE ?
-                    ORDER BY urun_adi
-                """, (f"%{search_text}%",))
-            else:
-                # Tüm ürünleri getir
-                self.cursor.execute("""
-                    SELECT barkod, urun_adi, marka, fiyat 
-                    FROM urunler 
-                    ORDER BY urun_adi
-                """)
-            
-            products = self.cursor.fetchall()
-            
-            self.table.setRowCount(len(products))
-            for row, product in enumerate(products):
-                for col, value in enumerate(product):
-                    item = QTableWidgetItem(str(value))
-                    if col == 3:  # Fiyat kolonuysa
-                        item = QTableWidgetItem(f"{float(value):.2f} TL")
-                    self.table.setItem(row, col, item)
-                    
+            self.urun_modeli.set_search(self.search_input.text())
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
 
     def load_products(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
-        # Arama kutusunu temizle
+        # Arama kutusunu temizle (bekleyen aramayı da iptal et)
         if hasattr(self, 'search_input'):
+            self.search_input.blockSignals(True)
             self.search_input.clear()
+            self.search_input.blockSignals(False)
+            self.search_timer.stop()
         
         try:
-            # Tüm ürünleri getir
-            self.cursor.execute("""
-                SELECT barkod, urun_adi, marka, fiyat 
-                FROM urunler 
-                ORDER BY urun_adi
-            """)
-            products = self.cursor.fetchall()
-            
-            self.table.setRowCount(len(products))
-            for row, product in enumerate(products):
-                for col, value in enumerate(product):
-                    item = QTableWidgetItem(str(value))
-                    if col == 3:  # Fiyat kolonuysa
-                        item = QTableWidgetItem(f"{float(value):.2f} TL")
-                    self.table.setItem(row, col, item)
-                    
+            # Sadece ilk sayfa okunur, gerisi kaydırdıkça gelir
+            self.urun_modeli.set_search("")
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
 
-    def load_product_to_form(self, item):
-        row = item.row()
-        self.barkod_input.setText(self.table.item(row, 0).text())
-        self.urun_adi_input.setText(self.table.item(row, 1).text())
-        self.marka_input.setText(self.table.item(row, 2).text())
-        fiyat = self.table.item(row, 3).text().replace(" TL", "")
-        self.fiyat_input.setText(fiyat)
+    def on_products_changed(self, urun_idler):
+        try:
+            self.urun_modeli.update_products(urun_idler)
+        except sqlite3.Error:
+            # Kilit vb. geçici hata: satırlar bir sonraki yenilemede düzelir
+            pass
+
+    def on_receipts_added(self, fis_idler):
+        # Satış stoğu düşürür; stok değişikliği ürün günlüğüne yazılmadığı için fişten bulunur
+        try:
+            self.urun_modeli.update_products(satis_kayit.fis_urunleri(self.cursor, fis_idler))
+        except sqlite3.Error:
+            pass
+
+    def load_product_to_form(self, index):
+        _, barkod, urun_adi, marka, fiyat, stok_miktari, kritik_stok = self.urun_modeli.product_at(index.row())
+        self.barkod_input.setText(str(barkod))
+        self.urun_adi_input.setText(str(urun_adi))
+        self.marka_input.setText(str(marka))
+        self.fiyat_input.setText(f"{float(fiyat):.2f}")
+        self.stok_input.setText(f"{stok_miktari:g}")
+        self.kritik_stok_input.setText(f"{kritik_stok:g}")
 
     def clear_form(self):
         self.barkod_input.clear()
         self.urun_adi_input.clear()
         self.marka_input.clear()
         self.fiyat_input.clear()
+        self.stok_input.clear()
+        self.kritik_stok_input.clear()
         self.barkod_input.setFocus()
 
+    def show_critical_stock(self):
+        """Kritik seviyenin altına düşmüş ürünleri listeler"""
+        try:
+            kritikler = stok.kritik_stoklar(self.cursor)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Kritik Stoklar")
+        dialog.resize(700, 500)
+        layout = QVBoxLayout(dialog)
+        
+        table = QTableWidget(len(kritikler), 4)
+        table.setHorizontalHeaderLabels(["Barkod", "Ürün Adı", "Stok", "Kritik Seviye"])
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        table.setFont(QFont("Arial", 12))
+        for row, (barkod, urun_adi, stok_miktari, kritik_stok) in enumerate(kritikler):
+            table.setItem(row, 0, QTableWidgetItem(str(barkod)))
+            table.setItem(row, 1, QTableWidgetItem(urun_adi))
+            table.setItem(row, 2, QTableWidgetItem(f"{stok_miktari:g}"))
+            table.setItem(row, 3, QTableWidgetItem(f"{kritik_stok:g}"))
+        layout.addWidget(table)
+        
+        if not kritikler:
+            layout.addWidget(QLabel("Kritik seviyede ürün yok."))
+        
+        dialog.exec()
+
+    def show_catalog_audit(self):
+        """Katalogdaki sorunlu ürünleri listeler, seçilen onarımları tek işlemde uygular"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Katalog Denetimi")
+        dialog.resize(1000, 700)
+        layout = QVBoxLayout(dialog)
+        
+        ozet_label = QLabel()
+        ozet_label.setFont(QFont("Arial", 12))
+        layout.addWidget(ozet_label)
+        
+        table = QTableWidget(0, 5)
+        table.setHorizontalHeaderLabels(["Barkod", "Ürün Adı", "Marka", "Fiyat", "Sorunlar"])
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        table.setFont(QFont("Arial", 11))
+        layout.addWidget(table)
+        
+        onarim_group = QGroupBox("Toplu Onarım")
+        onarim_layout = QVBoxLayout()
+        kutular = {}
+        for kod, aciklama in katalog_denetim.ONARIM_ACIKLAMALARI.items():
+            kutular[kod] = QCheckBox(aciklama)
+            onarim_layout.addWidget(kutular[kod])
+        onarim_group.setLayout(onarim_layout)
+        layout.addWidget(onarim_group)
+        
+        onar_button = QPushButton("Seçilenleri Onar")
+        onar_button.setObjectName("SuccessButton")
+        layout.addWidget(onar_button)
+        
+        def yenile():
+            try:
+                satirlar = katalog_denetim.denetle(self.db)
+                sayilar = katalog_denetim.onarim_sayilari(self.db)
+            except sqlite3.Error as e:
+                QMessageBox.critical(dialog, "Hata", f"Veritabanı hatası: {str(e)}")
+                return
+            ozet = katalog_denetim.ozet(satirlar)
+            ozet_label.setText(f"{len(satirlar)} üründe sorun var  |  " + "  |  ".join(
+                f"{katalog_denetim.SORUNLAR[kod]}: {sayi}" for kod, sayi in ozet.items()
+            ))
+            # Büyük kataloglarda ilk satırlar yeterli; sayılar özette
+            gosterilen = satirlar[:1000]
+            table.setRowCount(len(gosterilen))
+            for row, satir in enumerate(gosterilen):
+                table.setItem(row, 0, QTableWidgetItem(str(satir.barkod or "")))
+                table.setItem(row, 1, QTableWidgetItem(satir.urun_adi))
+                table.setItem(row, 2, QTableWidgetItem(str(satir.marka or "")))
+                table.setItem(row, 3, QTableWidgetItem(f"{satir.fiyat or 0:.2f} TL"))
+                table.setItem(row, 4, QTableWidgetItem(
+                    ", ".join(katalog_denetim.SORUNLAR[kod] for kod in satir.sorunlar)
+                ))
+            for kod, kutu in kutular.items():
+                kutu.setText(f"{katalog_denetim.ONARIM_ACIKLAMALARI[kod]} ({sayilar[kod]} ürün)")
+                kutu.setEnabled(sayilar[kod] > 0)
+                kutu.setChecked(False)
+        
+        def onar():
+            secilenler = [kod for kod, kutu in kutular.items() if kutu.isChecked()]
+            if not secilenler:
+                QMessageBox.warning(dialog, "Uyarı", "Lütfen en az bir onarım seçin!")
+                return
+            reply = QMessageBox.question(
+                dialog,
+                "Onay",
+                "Seçilen onarımlar tek işlemde uygulanacak. Eski değerler onarım günlüğüne yazılır.\n"
+                "Devam edilsin mi?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            try:
+                sonuc = katalog_denetim.onar(self.db, secilenler)
+            except sqlite3.Error as e:
+                QMessageBox.critical(dialog, "Hata", f"Veritabanı hatası: {str(e)}")
+                return
+            QMessageBox.information(dialog, "Başarılı", "\n".join(
+                f"{katalog_denetim.ONARIM_ACIKLAMALARI[kod]}: {sayi} ürün" for kod, sayi in sonuc.items()
+            ))
+            yenile()
+            self.load_products()
+        
+        onar_button.clicked.connect(onar)
+        yenile()
+        dialog.exec()
+
+    def show_price_history(self):
+        """Formdaki barkodun fiyat aralıklarını listeler"""
+        barkod = self.barkod_input.text().strip()
+        if not barkod:
+            QMessageBox.warning(self, "Uyarı", "Lütfen bir ürün seçin veya barkod girin!")
+            return
+        
+        try:
+            urun = urunler.urun_kimligi(self.cursor, barkod)
+            if urun is None:
+                QMessageBox.warning(self, "Uyarı", "Ürün bulunamadı!")
+                return
+            araliklar = fiyat_gecmisi.gecmis(self.cursor, urun[0])
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Hata", f"Veritabanı hatası: {str(e)}")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Fiyat Geçmişi - {urun[1]}")
+        dialog.resize(600, 400)
+        layout = QVBoxLayout(dialog)
+        
+        table = QTableWidget(len(araliklar), 3)
+        table.setHorizontalHeaderLabels(["Fiyat", "Başlangıç", "Bitiş"])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setFont(QFont("Arial", 12))
+        for row, (fiyat, baslangic, bitis) in enumerate(araliklar):
+            table.setItem(row, 0, QTableWidgetItem(f"{fiyat:.2f} TL"))
+            table.setItem(row, 1, QTableWidgetItem(baslangic[:19]))
+            table.setItem(row, 2, QTableWidgetItem(bitis[:19] if bitis else "Güncel"))
+        layout.addWidget(table)
+        
+        dialog.exec()
+
     def closeEvent(self, event):
-        self.db.close()
+        # Süren aktarım yazdığı partiyi bitirip dursun
+        if getattr(self, 'aktarici', None) is not None:
+            self.aktarici.cancel()
+            self.aktarici.wait()
+        if getattr(self, 'yedekleyici', None) is not None:
+            self.yedekleyici.wait()
+        # Ortak bağlantı diğer pencerelerle paylaşıldığı için kapatılmaz
         event.accept()
 
     def update_marka_combo(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
         self.marka_combo.setEnabled(self.marka_bazli_radio.isChecked())
         if self.marka_bazli_radio.isChecked():
             try:
                 # Mevcut seçili markayı kaydet
                 current_marka = self.marka_combo.currentText()
                 
-                # Markaları getir
-                self.cursor.execute("""
-                    SELECT DISTINCT marka 
-                    FROM urunler 
-                    WHERE marka != 'Belirtilmemiş'
-                    ORDER BY marka
-                """)
-                markalar = [row[0] for row in self.cursor.fetchall()]
-                
                 # Combo box'ı güncelle
                 self.marka_combo.clear()
-                self.marka_combo.addItems(markalar)
+                self.marka_combo.addItems(urunler.markalar(self.cursor))
                 
                 # Önceki seçili markayı tekrar seç
                 index = self.marka_combo.findText(current_marka)
@@ -419,147 +609,238 @@ class UrunYonetimi(QMainWindow):
             except sqlite3.Error as e:
                 QMessageBox.critical(self, "Hata", f"Markalar yüklenirken hata oluştu: {str(e)}")
 
-    def apply_price_increase(self):
-        # Veritabanı bağlantısını yenile
-        self.connect_db()
-        
-        # Seçimleri al
+    def get_price_increase_params(self):
+        """Zam panelindeki seçimleri (kapsam, yüzde mi, miktar, yuvarlama) olarak döndürür, hatada None"""
         miktar_text = self.zam_miktar_input.text().replace(",", ".")
         
         # Validasyon
         if not miktar_text:
             QMessageBox.warning(self, "Uyarı", "Lütfen zam miktarını girin!")
-            return
+            return None
             
         try:
             miktar = float(miktar_text)
         except ValueError:
             QMessageBox.warning(self, "Uyarı", "Geçersiz zam miktarı!")
-            return
+            return None
             
         # Marka bazlı zam için validasyon
-        if self.marka_bazli_radio.isChecked() and not self.marka_combo.currentText():
-            QMessageBox.warning(self, "Uyarı", "Lütfen bir marka seçin!")
-            return
-            
-        # Onay mesajı
-        zam_turu = "yüzde" if self.yuzde_radio.isChecked() else "TL"
         if self.marka_bazli_radio.isChecked():
-            marka = self.marka_combo.currentText()
-            msg = f"{marka} markalı ürünlere {miktar} {zam_turu} zam yapılacak. Onaylıyor musunuz?"
+            if not self.marka_combo.currentText():
+                QMessageBox.warning(self, "Uyarı", "Lütfen bir marka seçin!")
+                return None
+            kapsam = toplu_zam.markaya_gore(self.marka_combo.currentText())
+        elif self.arama_bazli_radio.isChecked():
+            arama = self.search_input.text().strip()
+            if not urun_arama.eslesme_ifadesi(arama):
+                QMessageBox.warning(self, "Uyarı", "Lütfen önce arama kutusuna bir ürün araması yazın!")
+                return None
+            kapsam = toplu_zam.aramaya_gore(arama)
         else:
-            msg = f"Tüm ürünlere {miktar} {zam_turu} zam yapılacak. Onaylıyor musunuz?"
+            kapsam = toplu_zam.tum_urunler()
+        
+        yuvarlama = toplu_zam.YUVARLAMALAR[self.yuvarlama_combo.currentText()]
+        return kapsam, self.yuzde_radio.isChecked(), miktar, yuvarlama
+
+    def price_increase_summary(self, kapsam, yuzde_mi, miktar):
+        """Zamın önizleme metnini hazırlar, etkilenecek ürün yoksa None döndürür"""
+        zam_turu = "%" if yuzde_mi else "TL"
+        yuvarlama = self.yuvarlama_combo.currentText()
+        onizleme = toplu_zam.onizle(self.cursor, kapsam, yuzde_mi, miktar,
+                                    toplu_zam.YUVARLAMALAR[yuvarlama])
+        if not onizleme.urun_sayisi:
+            return None
+        
+        satirlar = [
+            f"{kapsam.aciklama} - {miktar:g} {zam_turu} zam, yuvarlama: {yuvarlama}",
+            f"Etkilenecek ürün: {onizleme.urun_sayisi}",
+            f"Fiyat toplamı: {onizleme.eski_toplam:.2f} TL -> {onizleme.yeni_toplam:.2f} TL",
+            "",
+            "Örnekler:",
+        ]
+        for barkod, urun_adi, eski, yeni in onizleme.ornekler:
+            satirlar.append(f"{urun_adi}: {eski:.2f} -> {yeni:.2f} TL")
+        return "\n".join(satirlar)
+
+    def preview_price_increase(self):
+        params = self.get_price_increase_params()
+        if params is None:
+            return
+        kapsam, yuzde_mi, miktar, yuvarlama = params
+        try:
+            ozet = self.price_increase_summary(kapsam, yuzde_mi, miktar)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Hata", f"Önizleme hazırlanırken hata oluştu: {str(e)}")
+            return
+        if ozet is None:
+            QMessageBox.warning(self, "Uyarı", "Seçilen kriterlere uygun ürün bulunamadı!")
+            return
+        QMessageBox.information(self, "Zam Önizleme", ozet)
+
+    def apply_price_increase(self):
+        params = self.get_price_increase_params()
+        if params is None:
+            return
+        kapsam, yuzde_mi, miktar, yuvarlama = params
         
-        reply = QMessageBox.question(self, "Onay", msg, 
+        try:
+            ozet = self.price_increase_summary(kapsam, yuzde_mi, miktar)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Hata", f"Önizleme hazırlanırken hata oluştu: {str(e)}")
+            return
+        if ozet is None:
+            QMessageBox.warning(self, "Uyarı", "Seçilen kriterlere uygun ürün bulunamadı!")
+            return
+        
+        # Onay mesajı
+        reply = QMessageBox.question(self, "Onay", f"{ozet}\n\nZam uygulansın mı?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # SQL sorgusunu hazırla
-                if self.marka_bazli_radio.isChecked():
-                    self.cursor.execute("SELECT id, fiyat FROM urunler WHERE marka = ?", 
-                                      (self.marka_combo.currentText(),))
-                else:
-                    self.cursor.execute("SELECT id, fiyat FROM urunler")
-                
-                products = self.cursor.fetchall()
-                
-                if not products:
-                    QMessageBox.warning(self, "Uyarı", "Seçilen kriterlere uygun ürün bulunamadı!")
-                    return
-                
-                # Her ürüne zam uygula
-                for product_id, current_price in products:
-                    if self.yuzde_radio.isChecked():
-                        # Yüzdelik zam
-                        new_price = current_price * (1 + miktar / 100)
-                    else:
-                        # Sabit zam
-                        new_price = current_price + miktar
-                    
-                    # Fiyatı güncelle
-                    self.cursor.execute("""
-                        UPDATE urunler 
-                        SET fiyat = ? 
-                        WHERE id = ?
-                    """, (new_price, product_id))
-                
-                self.db.commit()
+                # Tüm fiyatlar tek UPDATE ile değişir, eski fiyatlar parti altında saklanır
+                parti_id, urun_sayisi = toplu_zam.uygula(self.db, kapsam, yuzde_mi, miktar, yuvarlama)
                 
                 # Başarı mesajı
                 QMessageBox.information(self, "Başarılı", 
-                    f"{len(products)} ürüne zam uygulandı!")
+                    f"{urun_sayisi} ürüne zam uygulandı! (Zam no: {parti_id})")
                 
                 # Tabloyu güncelle
                 self.load_products()
                 
             except sqlite3.Error as e:
                 QMessageBox.critical(self, "Hata", f"Zam uygulanırken hata oluştu: {str(e)}")
-                self.db.rollback()
 
-    def import_database(self):
+    def undo_price_increase(self):
+        parti = toplu_zam.son_parti(self.cursor)
+        if parti is None:
+            QMessageBox.information(self, "Bilgi", "Geri alınacak zam yok.")
+            return
+        parti_id, kapsam, miktar, yuzde_mi, urun_sayisi, tarih = parti
+        zam_turu = "%" if yuzde_mi else "TL"
+        
+        reply = QMessageBox.question(
+            self, "Zammı Geri Al",
+            f"{tarih} tarihli zam geri alınacak:\n{kapsam} - {miktar:g} {zam_turu}, {urun_sayisi} ürün.\n\n"
+            "Onaylıyor musunuz?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
         try:
-            file_path, _ = QFileDialog.getOpenFileName(
-                self,
-                "Veritabanı Dosyası Seç",
-                "",
-                "SQLite Veritabanı (*.db)"
-            )
-            
-            if file_path:
-                # Mevcut veritabanı bağlantısını kapat
-                self.db.close()
-                
-                # Yeni veritabanını kopyala
-                shutil.copy2(file_path, 'market_urunler.db')
-                
-                # Veritabanı bağlantısını yeniden aç
-                self.db = sqlite3.connect('market_urunler.db')
-                self.cursor = self.db.cursor()
-                
-                # Tabloyu yeniden yükle
-                self.load_products()
-                
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    "Veritabanı başarıyla içe aktarıldı!"
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Hata",
-                f"Veritabanı içe aktarılırken bir hata oluştu: {str(e)}"
-            )
+            geri_alinan, atlanan = toplu_zam.geri_al(self.db, parti_id)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Hata", f"Zam geri alınırken hata oluştu: {str(e)}")
+            return
+        
+        mesaj = f"{geri_alinan} ürünün fiyatı eski haline döndü."
+        if atlanan:
+            mesaj += f"\n{atlanan} ürünün fiyatı zamdan sonra değiştirildiği için dokunulmadı."
+        QMessageBox.information(self, "Başarılı", mesaj)
+        self.load_products()
+
+    def import_catalog(self):
+        """Tedarikçi fiyat listesini (CSV/XLSX) arka planda barkoda göre içe aktarır"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Fiyat Listesi Seç",
+            "",
+            "Fiyat Listesi (*.csv *.txt *.xlsx)"
+        )
+        if not file_path:
+            return
+        
+        self.aktarici = KatalogAktarici(file_path, parent=self)
+        self.aktarim_ilerleme = QProgressDialog("Fiyat listesi içe aktarılıyor...", "İptal", 0, 100, self)
+        self.aktarim_ilerleme.setWindowTitle("İçe Aktar")
+        self.aktarim_ilerleme.setWindowModality(Qt.WindowModality.WindowModal)
+        self.aktarim_ilerleme.setMinimumDuration(0)
+        self.aktarim_ilerleme.setAutoClose(False)
+        self.aktarim_ilerleme.setAutoReset(False)
+        self.aktarim_ilerleme.canceled.connect(self.aktarici.cancel)
+        self.aktarici.ilerledi.connect(self.aktarim_ilerleme.setValue)
+        self.aktarici.bitti.connect(self.import_finished)
+        self.aktarici.basarisiz.connect(self.import_failed)
+        self.import_button.setEnabled(False)
+        self.aktarici.start()
+    
+    def _import_closed(self):
+        self.aktarim_ilerleme.close()
+        self.import_button.setEnabled(True)
+        self.aktarici = None
+    
+    def import_finished(self, sonuc):
+        self._import_closed()
+        mesaj = (f"Eklenen: {sonuc.eklenen}\n"
+                 f"Güncellenen: {sonuc.guncellenen}\n"
+                 f"Değişmeyen: {sonuc.degismeyen}\n"
+                 f"Reddedilen: {sonuc.reddedilen}")
+        if sonuc.iptal:
+            mesaj = "Aktarım iptal edildi, o ana kadar okunan satırlar kaydedildi.\n\n" + mesaj
+        if sonuc.hatalar:
+            mesaj += "\n\nReddedilen satırlardan bazıları:\n"
+            mesaj += "\n".join(f"Satır {satir_no}: {sebep}" for satir_no, sebep in sonuc.hatalar[:10])
+        QMessageBox.information(self, "İçe Aktarma Tamamlandı", mesaj)
+        self.update_marka_combo()
+        self.load_products()
+    
+    def import_failed(self, hata):
+        self._import_closed()
+        QMessageBox.critical(
+            self,
+            "Hata",
+            f"Fiyat listesi içe aktarılırken bir hata oluştu: {hata}"
+        )
+        self.load_products()
     
     def export_database(self):
-        try:
-            # Tarih ve saat bilgisini al
-            current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_name = f"market_urunler_yedek_{current_time}.db"
-            
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Veritabanını Kaydet",
-                default_name,
-                "SQLite Veritabanı (*.db)"
-            )
-            
-            if file_path:
-                # Veritabanını kopyala
-                shutil.copy2('market_urunler.db', file_path)
-                
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    "Veritabanı başarıyla dışa aktarıldı!"
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Hata",
-                f"Veritabanı dışa aktarılırken bir hata oluştu: {str(e)}"
-            )
+        """Canlı veritabanını kasaları durdurmadan arka planda yedekler"""
+        # Tarih ve saat bilgisini al
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        default_name = f"{yedekleme.YEDEK_ONEKI}{current_time}.db.gz"
+        
+        file_path, secilen_filtre = QFileDialog.getSaveFileName(
+            self,
+            "Veritabanını Kaydet",
+            default_name,
+            "Sıkıştırılmış Yedek (*.db.gz);;SQLite Veritabanı (*.db)"
+        )
+        if not file_path:
+            return
+        if "*.db.gz" in secilen_filtre and not file_path.endswith(".gz"):
+            file_path += ".gz" if file_path.endswith(".db") else ".db.gz"
+        
+        self.yedekleyici = yedekleme.Yedekleyici(file_path, parent=self)
+        self.yedek_ilerleme = QProgressDialog("Veritabanı yedekleniyor...", None, 0, 100, self)
+        self.yedek_ilerleme.setWindowTitle("Dışa Aktar")
+        self.yedek_ilerleme.setMinimumDuration(500)
+        self.yedek_ilerleme.setAutoClose(False)
+        self.yedek_ilerleme.setAutoReset(False)
+        self.yedekleyici.ilerledi.connect(self.yedek_ilerleme.setValue)
+        self.yedekleyici.bitti.connect(self.export_finished)
+        self.yedekleyici.basarisiz.connect(self.export_failed)
+        self.export_button.setEnabled(False)
+        self.yedekleyici.start()
+    
+    def _export_closed(self):
+        self.yedek_ilerleme.close()
+        self.export_button.setEnabled(True)
+        self.yedekleyici = None
+    
+    def export_finished(self, yol, silinen):
+        self._export_closed()
+        mesaj = f"Veritabanı başarıyla dışa aktarıldı ve doğrulandı!\n{yol}"
+        if silinen:
+            mesaj += f"\n\n{len(silinen)} eski yedek silindi (son {yedekleme.TUTULACAK_YEDEK} yedek tutulur)."
+        QMessageBox.information(self, "Başarılı", mesaj)
+    
+    def export_failed(self, hata):
+        self._export_closed()
+        QMessageBox.critical(
+            self,
+            "Hata",
+            f"Veritabanı dışa aktarılırken bir hata oluştu: {hata}"
+        )
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
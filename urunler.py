@@ -0,0 +1,135 @@
+import stok
+import veritabani
+
+
+def ensure_schema(cursor):
+    """Ürün tablosunu ve stok kolonlarını oluşturur"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS urunler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            urun_adi TEXT NOT NULL,
+            fiyat REAL NOT NULL,
+            birim_fiyat TEXT,
+            marka TEXT,
+            barkod TEXT UNIQUE
+        )
+    """)
+    stok.ensure_schema(cursor)
+
+
+def urun_getir(cursor, barkod):
+    """Barkodlu ürünün (ad, fiyat, marka, stok, kritik stok) bilgisini döndürür, yoksa None"""
+    cursor.execute("""
+        SELECT urun_adi, fiyat, marka, stok, kritik_stok
+        FROM urunler WHERE barkod = ?
+    """, (barkod,))
+    return cursor.fetchone()
+
+
+def urun_kimligi(cursor, barkod):
+    """Barkodlu ürünün (id, ad) çiftini döndürür, yoksa None"""
+    cursor.execute("SELECT id, urun_adi FROM urunler WHERE barkod = ? ORDER BY id DESC", (barkod,))
+    return cursor.fetchone()
+
+
+def etiket_bilgisi(cursor, barkod):
+    """Etikete basılacak (ad, fiyat) çiftini döndürür, yoksa None"""
+    cursor.execute("SELECT urun_adi, fiyat FROM urunler WHERE barkod = ?", (barkod,))
+    return cursor.fetchone()
+
+
+def urun_kaydet(cursor, barkod, urun_adi, fiyat, marka, stok_miktari, kritik_stok):
+    """Ürünü barkoda göre günceller ya da ekler (commit etmez), yeni eklendiyse True döndürür"""
+    cursor.execute("""
+        UPDATE urunler
+        SET urun_adi = ?, fiyat = ?, marka = ?, stok = ?, kritik_stok = ?
+        WHERE barkod = ?
+    """, (urun_adi, fiyat, marka, stok_miktari, kritik_stok, barkod))
+    if cursor.rowcount:
+        return False
+    cursor.execute("""
+        INSERT INTO urunler (barkod, urun_adi, fiyat, marka, stok, kritik_stok)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (barkod, urun_adi, fiyat, marka, stok_miktari, kritik_stok))
+    return True
+
+
+def markalar(cursor):
+    """Ürünlerde geçen markaları alfabetik sırayla döndürür"""
+    cursor.execute("""
+        SELECT DISTINCT marka
+        FROM urunler
+        WHERE marka != 'Belirtilmemiş'
+        ORDER BY marka
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def fiyat_listesi(cursor):
+    """Tüm ürünlerin (id, fiyat) çiftlerini döndürür"""
+    cursor.execute("SELECT id, fiyat FROM urunler")
+    return cursor.fetchall()
+
+
+# Barkod indeksinin tuttuğu kayıt: (id, barkod, ad, fiyat)
+_INDEKS_KAYDI = "SELECT id, barkod, urun_adi, fiyat FROM urunler"
+
+
+def indeks_kayitlari(cursor, urun_idler=None):
+    """Barkod indeksi için (id, barkod, ad, fiyat) kayıtlarını üretir.
+
+    `urun_idler` verilmezse tüm katalog id sırasıyla imleçten akar,
+    verilirse sadece o ürünler parça parça okunur.
+    """
+    if urun_idler is None:
+        cursor.execute(_INDEKS_KAYDI + " ORDER BY id")
+        yield from cursor
+        return
+    for parca in veritabani.parcalar(urun_idler):
+        cursor.execute(_INDEKS_KAYDI + f" WHERE id IN ({veritabani.yer_tutucular(parca)})", parca)
+        yield from cursor.fetchall()
+
+
+def barkodun_urunu(cursor, barkod):
+    """Barkodu taşıyan en yeni ürünün (id, barkod, ad, fiyat) kaydını döndürür, yoksa None"""
+    cursor.execute(_INDEKS_KAYDI + " WHERE barkod = ? ORDER BY id DESC LIMIT 1", (barkod,))
+    return cursor.fetchone()
+
+
+# Ürün tablosu satırı: (id, barkod, ad, marka, fiyat, stok, kritik stok)
+_TABLO_SATIRI = "SELECT id, barkod, urun_adi, marka, fiyat, stok, kritik_stok FROM urunler"
+
+
+def tablo_satirlari(cursor, urun_idler):
+    """Verilen ürünlerin tablo satırlarını parça parça okur (silinenler gelmez)"""
+    satirlar = []
+    for parca in veritabani.parcalar(urun_idler):
+        cursor.execute(_TABLO_SATIRI + f" WHERE id IN ({veritabani.yer_tutucular(parca)})", parca)
+        satirlar += cursor.fetchall()
+    return satirlar
+
+
+def tablo_sayfasi(cursor, kolon, azalan, bos, son, limit):
+    """`kolon`a göre sıralı ürün tablosunun bir sayfasını döndürür.
+
+    `bos` True ise kolonu NULL olan ürünler id sırasıyla okunur. `son`
+    önceki sayfanın son satırının (kolon değeri, id) çiftidir; sayfa oradan
+    devam eder (OFFSET yok). `kolon` çağıranın sabit kolon listesinden gelir.
+    """
+    yon = "DESC" if azalan else "ASC"
+    karsilastirma = "<" if azalan else ">"
+    parametreler = []
+    if bos:
+        sorgu = f"{_TABLO_SATIRI} WHERE {kolon} IS NULL"
+        if son is not None:
+            sorgu += f" AND id {karsilastirma} ?"
+            parametreler.append(son[1])
+        sorgu += f" ORDER BY id {yon} LIMIT ?"
+    else:
+        sorgu = f"{_TABLO_SATIRI} WHERE {kolon} IS NOT NULL"
+        if son is not None:
+            sorgu += f" AND ({kolon}, id) {karsilastirma} (?, ?)"
+            parametreler += list(son)
+        sorgu += f" ORDER BY {kolon} {yon}, id {yon} LIMIT ?"
+    cursor.execute(sorgu, parametreler + [limit])
+    return cursor.fetchall()
@@ -0,0 +1,194 @@
+import fiyat_gecmisi
+import veritabani
+
+
+def ensure_schema(cursor):
+    """Müşteri ve borç tablolarını, kasadan veresiye için gereken kolon ve indeksleri oluşturur"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS musteriler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_adi TEXT NOT NULL,
+            telefon TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS borclar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_id INTEGER,
+            urun_id INTEGER,
+            alis_fiyati REAL NOT NULL,
+            odendi INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (musteri_id) REFERENCES musteriler (id),
+            FOREIGN KEY (urun_id) REFERENCES urunler (id)
+        )
+    """)
+
+    # Eski kayıtlar birim başına bir satırdır (adet 1); kasadan gelen satırlar
+    # sepet satırının adedini ve fişini taşır
+    cursor.execute("PRAGMA table_info(borclar)")
+    kolonlar = [row[1] for row in cursor.fetchall()]
+    if "adet" not in kolonlar:
+        cursor.execute("ALTER TABLE borclar ADD COLUMN adet REAL NOT NULL DEFAULT 1")
+    if "fis_id" not in kolonlar:
+        cursor.execute("ALTER TABLE borclar ADD COLUMN fis_id INTEGER REFERENCES fisler (id)")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borclar_musteri_id ON borclar (musteri_id)")
+    # Kasadaki müşteri seçici ad ve telefon başından arar
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_musteriler_ad ON musteriler (musteri_adi COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_musteriler_telefon ON musteriler (telefon)")
+
+
+def musteri_ara(cursor, metin, limit=20):
+    """Adı ya da telefonu verilen metinle başlayan müşterileri (id, ad, telefon) döndürür.
+
+    İki arama da indeksten aralık taraması olarak çalışır; tüm tablo taranmaz.
+    """
+    metin = metin.strip()
+    if not metin:
+        cursor.execute("""
+            SELECT id, musteri_adi, telefon FROM musteriler
+            ORDER BY musteri_adi COLLATE NOCASE LIMIT ?
+        """, (limit,))
+        return cursor.fetchall()
+
+    # Aralığın üst sınırı: metinle başlayan her şeyden büyük ilk değer
+    ust = metin + "\U0010ffff"
+    cursor.execute("""
+        SELECT id, musteri_adi, telefon FROM (
+            SELECT id, musteri_adi, telefon FROM musteriler
+            WHERE musteri_adi COLLATE NOCASE >= ? AND musteri_adi COLLATE NOCASE < ?
+            UNION
+            SELECT id, musteri_adi, telefon FROM musteriler
+            WHERE telefon >= ? AND telefon < ?
+        )
+        ORDER BY musteri_adi COLLATE NOCASE
+        LIMIT ?
+    """, (metin, ust, metin, ust, limit))
+    return cursor.fetchall()
+
+
+def borc_yaz(cursor, fis_id, musteri_id, satirlar, tarih):
+    """Fişin satırlarını müşterinin borcuna tek bir executemany ile işler (commit etmez)"""
+    cursor.executemany("""
+        INSERT INTO borclar (musteri_id, urun_id, alis_fiyati, adet, fis_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [
+        (musteri_id, satir.urun_id, satir.fiyat, satir.adet, fis_id, tarih)
+        for satir in satirlar
+    ])
+
+
+def musteri_ekle(cursor, musteri_adi, telefon):
+    """Yeni müşteri ekler (commit etmez), id'sini döndürür"""
+    cursor.execute("""
+        INSERT INTO musteriler (musteri_adi, telefon)
+        VALUES (?, ?)
+    """, (musteri_adi, telefon))
+    return cursor.lastrowid
+
+
+def musteri_ozetleri(cursor, musteri_idler=None):
+    """Müşterileri (id, ad, telefon, ödenmemiş toplam borç) ada göre döndürür.
+
+    `musteri_idler` verilirse sadece o müşteriler, parça parça okunur.
+    """
+    sorgu = """
+        SELECT
+            m.id,
+            m.musteri_adi,
+            m.telefon,
+            COALESCE(SUM(CASE WHEN b.odendi = 0 THEN b.alis_fiyati * b.adet ELSE 0 END), 0) as toplam_borc
+        FROM musteriler m
+        LEFT JOIN borclar b ON m.id = b.musteri_id
+        {kosul}
+        GROUP BY m.id
+        ORDER BY m.musteri_adi
+    """
+    if musteri_idler is None:
+        cursor.execute(sorgu.format(kosul=""))
+        return cursor.fetchall()
+    sonuc = []
+    for parca in veritabani.parcalar(musteri_idler):
+        cursor.execute(sorgu.format(kosul=f"WHERE m.id IN ({veritabani.yer_tutucular(parca)})"), parca)
+        sonuc += cursor.fetchall()
+    # Parçalar kendi içinde sıralı gelir; SQLite'ın ikili sıralamasıyla aynı sıraya getir
+    sonuc.sort(key=lambda satir: satir[1])
+    return sonuc
+
+
+def musteri_borclari(cursor, musteri_id):
+    """Müşterinin borç satırlarını yeniden eskiye döndürür.
+
+    Satır: (tarih, ürün, alış fiyatı, güncel fiyat, ödendi, id, adet,
+    borç günündeki fiyat, güncel tutar). Güncel tutar borcun ürün fiyatının
+    borç gününden bugüne değişimiyle yeniden fiyatlanmış halidir; indirimli
+    satılan satırın indirimi korunur. Borç günündeki fiyat fiyat geçmişinden
+    indeksle okunur, satışlar taranmaz.
+    """
+    cursor.execute(f"""
+        SELECT tarih, urun_adi, alis_fiyati, guncel_fiyat, odendi, id, adet, o_gunku_fiyat,
+               alis_fiyati * adet * COALESCE(guncel_fiyat / NULLIF(o_gunku_fiyat, 0), 1)
+        FROM (
+            SELECT
+                b.created_at AS tarih,
+                u.urun_adi,
+                b.alis_fiyati,
+                u.fiyat AS guncel_fiyat,
+                b.odendi,
+                b.id,
+                b.adet,
+                {fiyat_gecmisi.tarihteki_fiyat("b.urun_id", "b.created_at")} AS o_gunku_fiyat
+            FROM borclar b
+            JOIN urunler u ON b.urun_id = u.id
+            WHERE b.musteri_id = ?
+        )
+        ORDER BY tarih DESC
+    """, (musteri_id,))
+    return cursor.fetchall()
+
+
+def borc_musterileri(cursor, borc_idler):
+    """Verilen borç satırlarının müşteri id'lerini döndürür"""
+    musteri_idler = {}
+    for parca in veritabani.parcalar(borc_idler):
+        cursor.execute(
+            f"SELECT DISTINCT musteri_id FROM borclar WHERE id IN ({veritabani.yer_tutucular(parca)})", parca)
+        musteri_idler.update(dict.fromkeys(row[0] for row in cursor.fetchall()))
+    return list(musteri_idler)
+
+
+def urunlerden_borcu_var_mi(cursor, musteri_id, urun_idler):
+    """Müşterinin verilen ürünlerden herhangi birine borç satırı var mı?"""
+    for parca in veritabani.parcalar(urun_idler):
+        cursor.execute(f"""
+            SELECT 1 FROM borclar
+            WHERE musteri_id = ? AND urun_id IN ({veritabani.yer_tutucular(parca)})
+            LIMIT 1
+        """, [musteri_id, *parca])
+        if cursor.fetchone() is not None:
+            return True
+    return False
+
+
+def borc_ode(cursor, borc_id):
+    """Borç satırını ödendi olarak işaretler (commit etmez)"""
+    cursor.execute("""
+        UPDATE borclar
+        SET odendi = 1
+        WHERE id = ?
+    """, (borc_id,))
+
+
+def odeme_ozeti(cursor, musteri_id):
+    """Müşterinin (toplam borç, ödenen) tutarlarını döndürür; hiç borcu yoksa toplam None"""
+    cursor.execute("""
+        SELECT
+            SUM(alis_fiyati * adet) as toplam_borc,
+            SUM(CASE WHEN odendi = 1 THEN alis_fiyati * adet ELSE 0 END) as odenen
+        FROM borclar
+        WHERE musteri_id = ?
+    """, (musteri_id,))
+    return cursor.fetchone()
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+
+DB_PATH = 'market_urunler.db'
+
+# Kilitli veritabanında hata vermeden önce beklenecek süre
+BUSY_TIMEOUT = 5.0
+
+# Meşgul/kilitli hatalarında yeniden deneme politikası
+DENEME_SAYISI = 5
+BEKLEME = 0.05
+
+# IN (...) listelerine bir sorguda verilen en fazla id; SQLite'ın
+# parametre sınırı (eski sürümlerde 999) aşılmasın
+IN_PARCA_BOYUTU = 500
+
+# Bağlantı başına saklanan hazır (derlenmiş) ifade sayısı; pencerelerin
+# tekrar tekrar çalıştırdığı sorgular yeniden derlenmez
+IFADE_ONBELLEGI = 256
+
+_yerel = threading.local()
+_gocu_yapilanlar = set()
+_hazir_semalar = set()
+_sema_kilidi = threading.Lock()
+
+
+def connect(db_path=DB_PATH, timeout=BUSY_TIMEOUT):
+    """Tüm pencerelerin kullandığı ortak ayarlarla bağlantı açar.
+
+    WAL günlüğü sayesinde okuyucular yazanı beklemez ve aynı veritabanını
+    paylaşan kasalar birbirini sadece yazma anında sıraya sokar. busy
+    timeout süresince kilit açılması beklenir.
+    """
+    db = sqlite3.connect(db_path, timeout=timeout, cached_statements=IFADE_ONBELLEGI)
+    try:
+        db.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+        db.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.Error:
+        # Yarım kalan bağlantı açık bırakılmasın
+        db.close()
+        raise
+    return db
+
+
+def parcalar(idler, boyut=IN_PARCA_BOYUTU):
+    """Id listesini IN (...) sorgularına verilecek parçalara böler (tekrarlanan id bir kez)"""
+    idler = list(dict.fromkeys(idler))
+    for i in range(0, len(idler), boyut):
+        yield idler[i:i + boyut]
+
+
+def yer_tutucular(parca):
+    """Parça için "?,?,?" dizisi"""
+    return ",".join("?" * len(parca))
+
+
+def kilit_hatasi_mi(hata):
+    """Hata, yeniden denendiğinde geçebilecek bir kilit/meşguliyet hatası mı?"""
+    if not isinstance(hata, sqlite3.OperationalError):
+        return False
+    mesaj = str(hata).lower()
+    return "locked" in mesaj or "busy" in mesaj
+
+
+def baglanti(db_path=DB_PATH):
+    """Bu iş parçacığının ortak bağlantısını döndürür, yoksa açar.
+
+    Aynı iş parçacığındaki tüm pencereler tek bağlantıyı (ve onun ifade
+    önbelleğini) paylaşır; bu yüzden pencereler bağlantıyı kapatmaz.
+    sqlite3 bağlantıları iş parçacıkları arasında paylaşılamadığı için her
+    iş parçacığı kendi bağlantısını alır. Arka plan işçileri bunun yerine
+    `connect` ile kendi bağlantılarını açar ve bitince kapatır.
+    """
+    anahtar = os.path.abspath(db_path)
+    baglantilar = getattr(_yerel, "baglantilar", None)
+    if baglantilar is None:
+        baglantilar = _yerel.baglantilar = {}
+    db = baglantilar.get(anahtar)
+    if db is None:
+        db = baglantilar[anahtar] = connect(db_path)
+        if anahtar not in _gocu_yapilanlar:
+            # Süreçte ilk açılışta şemayı son sürüme getir (döngüsel içe aktarma olmasın diye burada)
+            import sema_gocleri
+            with _sema_kilidi:
+                if anahtar not in _gocu_yapilanlar:
+                    sema_gocleri.uygula(db)
+                    _gocu_yapilanlar.add(anahtar)
+    return db
+
+
+def sema_hazirla(kurulum, db_path=DB_PATH):
+    """`kurulum(cursor)` şema fonksiyonunu bu veritabanı için süreç başına bir kez çalıştırır.
+
+    CREATE ... IF NOT EXISTS ve PRAGMA table_info kontrolleri her
+    tıklamada yeniden çalışmaz; ilk çağrıdan sonra bu fonksiyon hiçbir
+    sorgu yapmaz.
+    """
+    anahtar = (os.path.abspath(db_path), kurulum)
+    if anahtar in _hazir_semalar:
+        return
+    # Bağlantı kilitten önce alınır: ilk açılışta baglanti() göçler için aynı kilidi ister
+    db = baglanti(db_path)
+    with _sema_kilidi:
+        if anahtar in _hazir_semalar:
+            return
+        kurulum(db.cursor())
+        db.commit()
+        _hazir_semalar.add(anahtar)
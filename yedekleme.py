@@ -0,0 +1,120 @@
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import veritabani
+
+# Her adımda kopyalanan sayfa sayısı; adımlar arasında kilit bırakılır,
+# kasalar yedek sürerken yazmaya devam eder
+ADIM_SAYFA = 256
+
+# Aynı klasörde tutulacak en yeni yedek sayısı
+TUTULACAK_YEDEK = 10
+
+YEDEK_ONEKI = "market_urunler_yedek_"
+
+
+class YedekHatasi(Exception):
+    """Yedek dosyası bütünlük kontrolünden geçmedi"""
+
+
+def yedek_al(hedef_yol, db_path=veritabani.DB_PATH, adim_sayfa=ADIM_SAYFA, ilerleme=None):
+    """Canlı veritabanının tutarlı bir kopyasını SQLite yedekleme API'siyle alır.
+
+    Kopya önce geçici dosyaya yazılır, `PRAGMA integrity_check` ile
+    doğrulanır, sonra hedefe taşınır; hedef `.gz` ile bitiyorsa
+    sıkıştırılarak yazılır. `ilerleme(oran)` her adımdan sonra çağrılır.
+    """
+    gecici_yol = hedef_yol + ".tmp"
+    kaynak = veritabani.connect(db_path)
+    hedef = sqlite3.connect(gecici_yol)
+    try:
+        def adim(durum, kalan, toplam):
+            if ilerleme is not None and toplam:
+                ilerleme((toplam - kalan) / toplam)
+
+        # Okuma işlemi açık tutulur: WAL'da okuyucu yazanı bekletmez, kasalar
+        # satışa devam ederken tüm adımlar aynı commit anının görüntüsünü kopyalar
+        # (başka bağlantının yazması yedeği baştan başlatmaz)
+        kaynak.execute("BEGIN")
+        kaynak.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        kaynak.backup(hedef, pages=adim_sayfa, progress=adim)
+        kaynak.rollback()
+
+        sonuc = hedef.execute("PRAGMA integrity_check").fetchall()
+        if sonuc != [("ok",)]:
+            raise YedekHatasi("Bütünlük kontrolü başarısız: " + "; ".join(r[0] for r in sonuc[:5]))
+        # Yedek tek dosya olsun, yanında -wal beklemesin
+        hedef.execute("PRAGMA journal_mode = DELETE")
+    except Exception:
+        hedef.close()
+        kaynak.close()
+        os.remove(gecici_yol)
+        raise
+    hedef.close()
+    kaynak.close()
+
+    if hedef_yol.endswith(".gz"):
+        with open(gecici_yol, "rb") as giris, gzip.open(hedef_yol, "wb", compresslevel=6) as cikis:
+            shutil.copyfileobj(giris, cikis, 1024 * 1024)
+        os.remove(gecici_yol)
+    else:
+        os.replace(gecici_yol, hedef_yol)
+    return hedef_yol
+
+
+def eski_yedekleri_sil(klasor, tutulacak=TUTULACAK_YEDEK):
+    """Klasördeki otomatik adlı yedeklerden en yeni `tutulacak` tanesi dışındakileri siler.
+
+    Sadece YEDEK_ONEKI ile başlayan dosyalara dokunulur. Silinen yolları döndürür.
+    """
+    yedekler = glob.glob(os.path.join(glob.escape(klasor), YEDEK_ONEKI + "*.db"))
+    yedekler += glob.glob(os.path.join(glob.escape(klasor), YEDEK_ONEKI + "*.db.gz"))
+    # Ad tarih damgası taşıdığı için ada göre sıralamak yaşa göre sıralamaktır
+    yedekler.sort(reverse=True)
+    silinen = yedekler[tutulacak:]
+    for yol in silinen:
+        os.remove(yol)
+    return silinen
+
+
+class Yedekleyici(QObject):
+    """Yedeği arka planda alır; GUI sadece sinyalleri dinler"""
+
+    ilerledi = pyqtSignal(int)       # yüzde
+    bitti = pyqtSignal(str, list)    # yedek yolu, silinen eski yedekler
+    basarisiz = pyqtSignal(str)      # hata
+
+    def __init__(self, hedef_yol, db_path=veritabani.DB_PATH, tutulacak=TUTULACAK_YEDEK, parent=None):
+        super().__init__(parent)
+        self.hedef_yol = hedef_yol
+        self.db_path = db_path
+        self.tutulacak = tutulacak
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="Yedekleyici", daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            yol = yedek_al(
+                self.hedef_yol, self.db_path,
+                ilerleme=lambda oran: self.ilerledi.emit(int(oran * 100)),
+            )
+            silinen = []
+            if os.path.basename(yol).startswith(YEDEK_ONEKI):
+                silinen = eski_yedekleri_sil(os.path.dirname(yol) or ".", self.tutulacak)
+        except Exception as e:
+            self.basarisiz.emit(str(e))
+        else:
+            self.bitti.emit(yol, silinen)